@@ -0,0 +1,19 @@
+"""Shared helpers for the Netflix dataset analysis scripts."""
+
+from . import profiling
+from .loader import CSV_DTYPES, find_dataset_path, load_dataset, load_multivalue_index
+from .multivalue import MULTI_VALUED_COLUMNS, MultiValueIndex
+from .plotting import plots_enabled
+
+__all__ = [
+    'CSV_DTYPES',
+    'MULTI_VALUED_COLUMNS',
+    'MultiValueIndex',
+    'find_dataset_path',
+    'load_dataset',
+    'load_multivalue_index',
+    'plots_enabled',
+]
+
+# NETFLIX_PROFILE=report.json profiles any script that uses this package
+profiling.enable_from_env()
@@ -0,0 +1,766 @@
+"""Single-pass aggregation engine for the question aggregates.
+
+``q1.py`` used to run ``value_counts``, ``crosstab``, ``groupby`` and
+``describe`` separately for every question, each one a full pass over the
+frame.  Here every question *declares* its aggregates (:class:`Count`,
+:class:`Crosstab`, :class:`Mean`, :class:`Describe`, ...) and
+:func:`run_aggregates` answers all of them from one scan:
+
+1. The union of the dimensions the aggregates touch is grouped in a single
+   ``groupby(...).size()`` over the rows, producing a
+   :class:`PartialAggregates` table of distinct dimension combinations and
+   their row counts.
+2. Every aggregate is evaluated against that (small) table.  Numeric
+   measures such as ``duration_min`` are dimensions too, so means,
+   quantiles and histograms are weighted by the group counts and remain
+   exact.
+
+Values of comma-separated columns (directors, cast, ...) are counted from
+their :class:`~netflix_analysis.multivalue.MultiValueIndex` instead of the
+row scan.  Partial aggregates of disjoint row sets can be combined with
+:meth:`PartialAggregates.merge`; :class:`AggregateState` keeps one partial
+per distinct dimension set instead of one over their union, so its size
+depends on the cardinality of each aggregate's own columns rather than on
+the number of rows, which is what streaming ingestion needs.
+
+Approximate variants (:class:`ApproxTopValues`, :class:`ApproxDistinct`,
+:class:`ApproxDescribe`, :class:`ApproxDistribution`) are answered from
+mergeable summaries of :mod:`netflix_analysis.sketches` instead of exact
+value counts; :func:`approximate` swaps them in for an approximate run.
+"""
+
+from __future__ import annotations
+
+import operator
+from dataclasses import dataclass
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .multivalue import MULTI_VALUED_COLUMNS, MultiValueIndex
+from .sketches import (
+    DEFAULT_EPSILON,
+    DEFAULT_PRECISION,
+    DEFAULT_QUANTILE_K,
+    KLL,
+    Approximation,
+    HeavyHitters,
+    HyperLogLog,
+    capacity_for,
+)
+
+COUNT = 'count'
+
+# Conditions are (column, op, value) triples, e.g. ('type', '==', 'Movie').
+Condition = Tuple[str, str, object]
+
+_OPERATORS: Dict[str, Callable] = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda col, values: col.isin(values),
+    'not in': lambda col, values: ~col.isin(values),
+}
+
+
+# ============================================
+# Columns derived from the grouped table
+# ============================================
+# These only depend on other dimensions, so they are computed on the grouped
+# table instead of on every row.
+
+def _period_field(field: str) -> Callable[[pd.DataFrame], pd.Series]:
+    def derive(groups: pd.DataFrame) -> pd.Series:
+        months = groups['month_added']
+        # Period fields of NaT come back as -1 rather than NaN
+        return getattr(months.dt, field).astype('float64').where(months.notna())
+    return derive
+
+
+TABLE_COLUMNS: Dict[str, Tuple[Tuple[str, ...], Callable[[pd.DataFrame], pd.Series]]] = {
+    'year_added': (('month_added',), _period_field('year')),
+    'month_number': (('month_added',), _period_field('month')),
+    'year_gap': (('month_added', 'release_year'),
+                 lambda g: _period_field('year')(g) - g['release_year']),
+}
+
+
+def row_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """``name`` computed on row-level data, deriving table columns if needed."""
+    return df[name] if name in df else TABLE_COLUMNS[name][1](df)
+
+
+def base_dimensions(columns: Iterable[str]) -> List[str]:
+    """Row-level columns needed to produce ``columns`` on the grouped table."""
+    dims: List[str] = []
+    for name in columns:
+        sources = TABLE_COLUMNS[name][0] if name in TABLE_COLUMNS else (name,)
+        for source in sources:
+            if source not in dims:
+                dims.append(source)
+    return dims
+
+
+# ============================================
+# Partial aggregates
+# ============================================
+
+class PartialAggregates:
+    """Row counts per distinct combination of dimension values.
+
+    ``groups`` has one column per dimension plus ``count``; missing values
+    are kept as their own group so that filters and ``dropna`` semantics
+    can be applied later.  ``value_counts`` holds exploded counts of
+    comma-separated columns, in order of first appearance, and ``sketches``
+    the summaries of approximate aggregates keyed by their sketch spec.
+    """
+
+    def __init__(self, groups: pd.DataFrame, value_counts: Optional[Dict[str, pd.Series]] = None,
+                 sketches: Optional[Dict[Hashable, object]] = None):
+        self.groups = groups
+        self.value_counts = dict(value_counts or {})
+        self.sketches = dict(sketches or {})
+        self._derived: Dict[str, pd.Series] = {}
+
+    @classmethod
+    def scan(cls, df: pd.DataFrame, dimensions: Sequence[str],
+             multivalue: Optional[Mapping[str, MultiValueIndex]] = None,
+             sketches: Optional[Mapping[Hashable, object]] = None) -> 'PartialAggregates':
+        """Group ``df`` by ``dimensions`` in one pass.
+
+        ``sketches`` are summaries already built from the same rows (see
+        :func:`build_sketches`).
+        """
+        dims = list(dimensions)
+        with profiling.stage('aggregate', 'scan'):
+            if dims:
+                sizes = df.groupby(dims, dropna=False, observed=True, sort=False).size()
+                groups = sizes.rename(COUNT).reset_index()
+            else:
+                groups = pd.DataFrame({COUNT: [len(df)]})
+            counts = {name: index.counts(sort=False)
+                      for name, index in (multivalue or {}).items()}
+        return cls(groups, counts, sketches)
+
+    @property
+    def dimensions(self) -> List[str]:
+        return [c for c in self.groups.columns if c != COUNT]
+
+    @property
+    def total(self) -> int:
+        return int(self.groups[COUNT].sum())
+
+    def column(self, name: str) -> pd.Series:
+        if name in self.groups.columns:
+            return self.groups[name]
+        if name not in self._derived:
+            self._derived[name] = TABLE_COLUMNS[name][1](self.groups)
+        return self._derived[name]
+
+    def frame(self, columns: Sequence[str], where: Sequence[Condition] = ()) -> pd.DataFrame:
+        """Grouped rows restricted to ``where`` with the requested columns."""
+        data = {name: self.column(name) for name in columns}
+        data[COUNT] = self.groups[COUNT]
+        frame = pd.DataFrame(data)
+        if where:
+            mask = np.ones(len(frame), dtype=bool)
+            for name, op, value in where:
+                mask &= _OPERATORS[op](self.column(name), value).fillna(False).to_numpy(dtype=bool)
+            frame = frame[mask]
+        return frame
+
+    def merge(self, other: 'PartialAggregates') -> 'PartialAggregates':
+        """Combine the partial aggregates of two disjoint sets of rows."""
+        if set(self.dimensions) != set(other.dimensions):
+            raise ValueError('cannot merge partial aggregates over different dimensions')
+        dims = self.dimensions
+        combined = pd.concat([self.groups, other.groups[self.groups.columns]], ignore_index=True)
+        if dims:
+            groups = (combined.groupby(dims, dropna=False, observed=True, sort=False)[COUNT]
+                      .sum().reset_index())
+        else:
+            groups = pd.DataFrame({COUNT: [combined[COUNT].sum()]})
+        counts = dict(self.value_counts)
+        for name, series in other.value_counts.items():
+            counts[name] = _add_counts(counts[name], series) if name in counts else series
+        sketches = dict(self.sketches)
+        for spec, sketch in other.sketches.items():
+            sketches[spec] = sketches[spec].merge(sketch) if spec in sketches else sketch
+        return PartialAggregates(groups, counts, sketches)
+
+
+def _add_counts(first: pd.Series, second: pd.Series) -> pd.Series:
+    """Sum two value counts, keeping values in order of first appearance."""
+    labels = first.index.append(second.index[~second.index.isin(first.index)])
+    total = first.reindex(labels, fill_value=0) + second.reindex(labels, fill_value=0)
+    return total.astype('int64').rename(COUNT)
+
+
+# ============================================
+# Weighted statistics
+# ============================================
+
+def _weighted_quantile(values: np.ndarray, weights: np.ndarray, q: float) -> float:
+    """Quantile of the expanded sample, with pandas' linear interpolation."""
+    cumulative = np.cumsum(weights)
+    position = (cumulative[-1] - 1) * q
+    lower = np.floor(position)
+    lo = values[np.searchsorted(cumulative, lower, side='right')]
+    hi = values[np.searchsorted(cumulative, lower + 1, side='right')] if position > lower else lo
+    return float(lo + (position - lower) * (hi - lo))
+
+
+def weighted_describe(values: pd.Series, weights: pd.Series,
+                      name: Optional[str] = None) -> pd.Series:
+    """``Series.describe()`` of ``values`` repeated ``weights`` times."""
+    keep = values.notna() & (weights > 0)
+    v = values[keep].to_numpy(dtype='float64')
+    w = weights[keep].to_numpy(dtype='int64')
+    order = np.argsort(v, kind='stable')
+    v, w = v[order], w[order]
+    n = int(w.sum())
+    index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+    if n == 0:
+        return pd.Series([0.0] + [np.nan] * 7, index=index, name=name)
+    mean = float((v * w).sum() / n)
+    std = float(np.sqrt((w * (v - mean) ** 2).sum() / (n - 1))) if n > 1 else np.nan
+    stats = [float(n), mean, std, float(v[0])]
+    stats += [_weighted_quantile(v, w, q) for q in (0.25, 0.5, 0.75)]
+    stats.append(float(v[-1]))
+    return pd.Series(stats, index=index, name=name)
+
+
+# ============================================
+# Declared aggregates
+# ============================================
+
+@dataclass(frozen=True)
+class Count:
+    """Rows per value of ``by`` (``value_counts`` / ``groupby().size()``).
+
+    ``sort`` is ``'count'`` (largest first) or ``'index'``; ``top`` keeps the
+    first ``top`` entries after sorting.  With ``dropna=False`` rows with a
+    missing ``by`` value are counted under NaN.
+    """
+
+    name: str
+    by: Tuple[str, ...]
+    where: Tuple[Condition, ...] = ()
+    sort: str = 'count'
+    top: Optional[int] = None
+    dropna: bool = True
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return self.by + tuple(c[0] for c in self.where)
+
+    def evaluate(self, partial: PartialAggregates) -> pd.Series:
+        frame = partial.frame(self.by, self.where)
+        keys = list(self.by)
+        result = frame.groupby(keys if len(keys) > 1 else keys[0],
+                               observed=True, sort=False, dropna=self.dropna)[COUNT].sum()
+        result = result[result > 0]
+        if self.sort == 'index':
+            result = result.sort_index()
+        else:
+            result = result.sort_values(ascending=False, kind='stable')
+        if self.top is not None:
+            result = result.head(self.top)
+        return result.astype('int64')
+
+
+@dataclass(frozen=True)
+class Crosstab:
+    """``pd.crosstab(df[index], df[column])``.
+
+    ``top`` keeps only the most frequent ``index`` values.
+    """
+
+    name: str
+    index: str
+    column: str
+    where: Tuple[Condition, ...] = ()
+    top: Optional[int] = None
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.index, self.column) + tuple(c[0] for c in self.where)
+
+    def evaluate(self, partial: PartialAggregates) -> pd.DataFrame:
+        frame = partial.frame((self.index, self.column), self.where)
+        frame = frame[frame[self.index].notna() & frame[self.column].notna()]
+        if self.top is not None:
+            totals = frame.groupby(self.index, observed=True)[COUNT].sum()
+            keep = totals.sort_values(ascending=False, kind='stable').head(self.top).index
+            frame = frame[frame[self.index].isin(keep)]
+        table = (frame.groupby([self.index, self.column], observed=True)[COUNT].sum()
+                 .unstack(fill_value=0))
+        table = table.loc[:, table.sum() > 0]
+        return table.astype('int64')
+
+
+@dataclass(frozen=True)
+class Mean:
+    """Mean of ``value`` (skipping missing values), optionally per ``by`` group."""
+
+    name: str
+    value: str
+    by: Tuple[str, ...] = ()
+    where: Tuple[Condition, ...] = ()
+    ascending: Optional[bool] = None
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.value,) + self.by + tuple(c[0] for c in self.where)
+
+    def evaluate(self, partial: PartialAggregates):
+        frame = partial.frame((self.value,) + self.by, self.where)
+        values = frame[self.value].astype('float64')
+        weights = frame[COUNT].where(values.notna(), 0)
+        frame = frame.assign(_sum=values.fillna(0) * weights, _n=weights)
+        if not self.by:
+            n = frame['_n'].sum()
+            return float(frame['_sum'].sum() / n) if n else np.nan
+        sums = frame.groupby(list(self.by) if len(self.by) > 1 else self.by[0],
+                             observed=True)[['_sum', '_n']].sum()
+        result = (sums['_sum'] / sums['_n'].replace(0, np.nan)).rename(self.value)
+        if self.ascending is not None:
+            result = result.sort_values(ascending=self.ascending)
+        return result
+
+
+@dataclass(frozen=True)
+class Describe:
+    """``Series.describe()`` of ``value`` over the rows matching ``where``."""
+
+    name: str
+    value: str
+    where: Tuple[Condition, ...] = ()
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.value,) + tuple(c[0] for c in self.where)
+
+    def evaluate(self, partial: PartialAggregates) -> pd.Series:
+        frame = partial.frame((self.value,), self.where)
+        return weighted_describe(frame[self.value], frame[COUNT], name=self.value)
+
+
+@dataclass(frozen=True)
+class Unique:
+    """Number of distinct non-missing values of ``column``."""
+
+    name: str
+    column: str
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def evaluate(self, partial: PartialAggregates) -> int:
+        frame = partial.frame((self.column,))
+        return int(frame.loc[frame[COUNT] > 0, self.column].dropna().nunique())
+
+
+@dataclass(frozen=True)
+class Extent:
+    """``(min, max)`` of ``column``."""
+
+    name: str
+    column: str
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def evaluate(self, partial: PartialAggregates) -> Tuple[object, object]:
+        values = partial.frame((self.column,))[self.column].dropna()
+        return values.min(), values.max()
+
+
+@dataclass(frozen=True)
+class Total:
+    """Number of rows matching ``where``."""
+
+    name: str
+    where: Tuple[Condition, ...] = ()
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(c[0] for c in self.where)
+
+    def evaluate(self, partial: PartialAggregates) -> int:
+        return int(partial.frame((), self.where)[COUNT].sum())
+
+
+@dataclass(frozen=True)
+class TopValues:
+    """Most frequent values of a comma-separated column."""
+
+    name: str
+    column: str
+    top: Optional[int] = None
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        # Answered from the multi-value index, not from the row scan.
+        return ()
+
+    def evaluate(self, partial: PartialAggregates) -> pd.Series:
+        counts = partial.value_counts[self.column].sort_values(ascending=False, kind='stable')
+        return counts if self.top is None else counts.head(self.top)
+
+
+@dataclass(frozen=True)
+class DistinctValues:
+    """Number of distinct values of a comma-separated column."""
+
+    name: str
+    column: str
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ()
+
+    def evaluate(self, partial: PartialAggregates) -> int:
+        counts = partial.value_counts[self.column]
+        return int((counts > 0).sum())
+
+
+@dataclass(frozen=True)
+class HeavyHitterSketch:
+    """:class:`~netflix_analysis.sketches.HeavyHitters` of a comma-separated column."""
+
+    column: str
+    capacity: int
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ()
+
+    @property
+    def multivalue(self) -> Tuple[str, ...]:
+        return (self.column,)
+
+    def build(self, df: pd.DataFrame,
+              index_lookup: Callable[[str], MultiValueIndex]) -> HeavyHitters:
+        return HeavyHitters.from_counts(index_lookup(self.column).counts(sort=False),
+                                        self.capacity)
+
+
+@dataclass(frozen=True)
+class ApproxTopValues:
+    """:class:`TopValues` estimated in ``capacity`` counters.
+
+    Each count is at most ``1 / capacity`` of the number of values below
+    the true one, and ties keep the order in which values first appeared.
+    """
+
+    name: str
+    column: str
+    top: Optional[int] = None
+    capacity: int = capacity_for(DEFAULT_EPSILON)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ()
+
+    @property
+    def sketch(self) -> HeavyHitterSketch:
+        return HeavyHitterSketch(self.column, self.capacity)
+
+    def evaluate(self, partial: PartialAggregates) -> pd.Series:
+        return partial.sketches[self.sketch].top(self.top)
+
+
+@dataclass(frozen=True)
+class DistinctSketch:
+    """:class:`~netflix_analysis.sketches.HyperLogLog` of a column's values.
+
+    Comma-separated columns count the values of their index, other columns
+    the values of the rows.
+    """
+
+    column: str
+    precision: int
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return () if self.column in MULTI_VALUED_COLUMNS else (self.column,)
+
+    @property
+    def multivalue(self) -> Tuple[str, ...]:
+        return (self.column,) if self.column in MULTI_VALUED_COLUMNS else ()
+
+    def build(self, df: pd.DataFrame,
+              index_lookup: Callable[[str], MultiValueIndex]) -> HyperLogLog:
+        if self.column in MULTI_VALUED_COLUMNS:
+            counts = index_lookup(self.column).counts(sort=False)
+            values = counts.index[counts.to_numpy() > 0]
+        else:
+            values = df[self.column]
+        return HyperLogLog.from_values(values, self.precision)
+
+
+@dataclass(frozen=True)
+class ApproxDistinct:
+    """:class:`Unique` or :class:`DistinctValues` estimated with a HyperLogLog.
+
+    Exact up to ``2 ** precision / 8`` distinct values, then within about
+    ``1.04 / sqrt(2 ** precision)`` of the true count.
+    """
+
+    name: str
+    column: str
+    precision: int = DEFAULT_PRECISION
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        # Read from the rows by the sketch, not grouped by
+        return ()
+
+    @property
+    def sketch(self) -> DistinctSketch:
+        return DistinctSketch(self.column, self.precision)
+
+    def evaluate(self, partial: PartialAggregates) -> int:
+        return partial.sketches[self.sketch].count()
+
+
+@dataclass(frozen=True)
+class QuantileSketch:
+    """:class:`~netflix_analysis.sketches.KLL` of ``value`` over the rows matching ``where``."""
+
+    value: str
+    where: Tuple[Condition, ...]
+    k: int
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(base_dimensions((self.value,) + tuple(c[0] for c in self.where)))
+
+    @property
+    def multivalue(self) -> Tuple[str, ...]:
+        return ()
+
+    def build(self, df: pd.DataFrame,
+              index_lookup: Callable[[str], MultiValueIndex]) -> KLL:
+        values = row_column(df, self.value)
+        mask = np.ones(len(df), dtype=bool)
+        for name, op, wanted in self.where:
+            column = row_column(df, name)
+            mask &= _OPERATORS[op](column, wanted).fillna(False).to_numpy(dtype=bool)
+        return KLL.from_values(values[mask], self.k)
+
+
+@dataclass(frozen=True)
+class ApproxDescribe:
+    """:class:`Describe` with quantiles estimated by a KLL sketch.
+
+    Count, mean, standard deviation, minimum and maximum stay exact.
+    """
+
+    name: str
+    value: str
+    where: Tuple[Condition, ...] = ()
+    k: int = DEFAULT_QUANTILE_K
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ()
+
+    @property
+    def sketch(self) -> QuantileSketch:
+        return QuantileSketch(self.value, self.where, self.k)
+
+    def evaluate(self, partial: PartialAggregates) -> pd.Series:
+        sketch = partial.sketches[self.sketch]
+        index = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+        if sketch.count == 0:
+            return pd.Series([0.0] + [np.nan] * 7, index=index, name=self.value)
+        values, weights = sketch.items()
+        stats = [float(sketch.count), sketch.mean, sketch.std, sketch.min]
+        stats += [_weighted_quantile(values, weights, q) for q in (0.25, 0.5, 0.75)]
+        stats.append(sketch.max)
+        return pd.Series(stats, index=index, name=self.value)
+
+
+@dataclass(frozen=True)
+class ApproxDistribution:
+    """``Count`` of ``value`` by value (``sort='index'``), estimated by a KLL sketch.
+
+    Meant for histograms: counts are those of the sketch's retained values,
+    so they add up to the number of rows but are spread over fewer values,
+    and the exact minimum and maximum are always listed.
+    """
+
+    name: str
+    value: str
+    where: Tuple[Condition, ...] = ()
+    k: int = DEFAULT_QUANTILE_K
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return ()
+
+    @property
+    def sketch(self) -> QuantileSketch:
+        return QuantileSketch(self.value, self.where, self.k)
+
+    def evaluate(self, partial: PartialAggregates) -> pd.Series:
+        sketch = partial.sketches[self.sketch]
+        counts = sketch.distribution()
+        if len(counts):
+            # The extremes may not be retained; list them with no count so a
+            # histogram still spans the exact range
+            extremes = pd.Index([sketch.min, sketch.max]).difference(counts.index)
+            counts = pd.concat([counts, pd.Series(0, index=extremes, name=COUNT)]).sort_index()
+        if len(counts) and (counts.index == np.round(counts.index)).all():
+            counts.index = counts.index.astype('int64')
+        return counts.rename_axis(self.value)
+
+
+# Numeric measures whose describe-style statistics and distributions have
+# sketch-backed variants
+QUANTILE_COLUMNS = ('duration_min', 'year_gap')
+
+
+def approximate(aggregate, approximation: Approximation):
+    """The sketch-backed variant of ``aggregate``, or ``aggregate`` itself."""
+    if isinstance(aggregate, TopValues):
+        return ApproxTopValues(aggregate.name, aggregate.column, aggregate.top,
+                               approximation.capacity)
+    if isinstance(aggregate, (Unique, DistinctValues)):
+        return ApproxDistinct(aggregate.name, aggregate.column, approximation.precision)
+    if isinstance(aggregate, Describe) and aggregate.value in QUANTILE_COLUMNS:
+        return ApproxDescribe(aggregate.name, aggregate.value, aggregate.where,
+                              approximation.quantile_k)
+    if (isinstance(aggregate, Count) and len(aggregate.by) == 1
+            and aggregate.by[0] in QUANTILE_COLUMNS and aggregate.sort == 'index'
+            and aggregate.top is None):
+        return ApproxDistribution(aggregate.name, aggregate.by[0], aggregate.where,
+                                  approximation.quantile_k)
+    return aggregate
+
+
+def required_dimensions(aggregates: Iterable) -> List[str]:
+    """Row-level columns the single scan must group by."""
+    columns: List[str] = []
+    for aggregate in aggregates:
+        for name in aggregate.columns:
+            if name not in columns:
+                columns.append(name)
+    return base_dimensions(columns)
+
+
+def required_multivalue(aggregates: Iterable) -> List[str]:
+    """Comma-separated columns whose value counts the aggregates need."""
+    names: List[str] = []
+    for aggregate in aggregates:
+        if isinstance(aggregate, (TopValues, DistinctValues)) and aggregate.column not in names:
+            names.append(aggregate.column)
+    return names
+
+
+def required_sketches(aggregates: Iterable) -> List:
+    """Sketch specs of the approximate aggregates, one per distinct summary."""
+    specs: List = []
+    for aggregate in aggregates:
+        spec = getattr(aggregate, 'sketch', None)
+        if spec is not None and spec not in specs:
+            specs.append(spec)
+    return specs
+
+
+def build_sketches(specs: Iterable, df: pd.DataFrame,
+                   index_lookup: Callable[[str], MultiValueIndex]) -> Dict[Hashable, object]:
+    """Summaries of ``df`` for every sketch spec, keyed by spec."""
+    with profiling.stage('aggregate', 'sketches'):
+        return {spec: spec.build(df, index_lookup) for spec in specs}
+
+
+def evaluate_aggregates(aggregates: Iterable, partial: PartialAggregates) -> Dict[str, object]:
+    results = {}
+    for aggregate in aggregates:
+        with profiling.stage('aggregate', aggregate.name):
+            results[aggregate.name] = aggregate.evaluate(partial)
+    return results
+
+
+class AggregateState:
+    """Mergeable partial aggregates with one grouped table per dimension set.
+
+    Aggregates that group by the same columns share a
+    :class:`PartialAggregates`; value counts of comma-separated columns go to
+    the partial of the aggregates that report them.
+    """
+
+    def __init__(self, aggregates: Sequence,
+                 partials: Mapping[FrozenSet[str], PartialAggregates]):
+        self.aggregates = tuple(aggregates)
+        self.partials = dict(partials)
+
+    @staticmethod
+    def grouping_sets(aggregates: Iterable) -> Dict[FrozenSet[str], List]:
+        """Aggregates keyed by the set of row-level columns they group by."""
+        sets: Dict[FrozenSet[str], List] = {}
+        for aggregate in aggregates:
+            sets.setdefault(frozenset(required_dimensions([aggregate])), []).append(aggregate)
+        return sets
+
+    @classmethod
+    def scan(cls, df: pd.DataFrame, aggregates: Sequence,
+             multivalue: Optional[Mapping[str, MultiValueIndex]] = None) -> 'AggregateState':
+        multivalue = multivalue or {}
+        partials = {}
+        for key, members in cls.grouping_sets(aggregates).items():
+            counted = {name: multivalue[name] for name in required_multivalue(members)}
+            sketches = build_sketches(required_sketches(members), df, multivalue.__getitem__)
+            partials[key] = PartialAggregates.scan(df, required_dimensions(members), counted,
+                                                   sketches)
+        return cls(aggregates, partials)
+
+    @property
+    def total(self) -> int:
+        return next(iter(self.partials.values())).total if self.partials else 0
+
+    def merge(self, other: 'AggregateState') -> 'AggregateState':
+        """Combine the states of two disjoint sets of rows."""
+        if self.partials.keys() != other.partials.keys():
+            raise ValueError('cannot merge aggregate states over different aggregates')
+        return AggregateState(self.aggregates, {
+            key: partial.merge(other.partials[key]) for key, partial in self.partials.items()
+        })
+
+    def evaluate(self) -> Dict[str, object]:
+        results = {}
+        for key, members in self.grouping_sets(self.aggregates).items():
+            results.update(evaluate_aggregates(members, self.partials[key]))
+        return {aggregate.name: results[aggregate.name] for aggregate in self.aggregates}
+
+
+def run_aggregates(df: pd.DataFrame, aggregates: Sequence,
+                   multivalue: Optional[Mapping[str, MultiValueIndex]] = None
+                   ) -> Dict[str, object]:
+    """Scan ``df`` once and return every aggregate's result keyed by name."""
+    multivalue = multivalue or {}
+    counted = {name: multivalue[name] for name in required_multivalue(aggregates)}
+    sketches = build_sketches(required_sketches(aggregates), df, multivalue.__getitem__)
+    partial = PartialAggregates.scan(df, required_dimensions(aggregates), counted, sketches)
+    return evaluate_aggregates(aggregates, partial)
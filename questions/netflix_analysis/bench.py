@@ -0,0 +1,263 @@
+"""Benchmark the question pipeline on synthetic catalogs of increasing size.
+
+:func:`generate_catalog` writes a CSV with the schema of
+``netflix_titles_CLEANED.csv`` by resampling the real file: ``type``,
+``duration`` and ``rating`` are drawn together from one title and
+``date_added`` and ``release_year`` from another, so movies keep "90 min"
+durations, shows keep "2 Seasons" and dates keep the "September 25, 2021"
+format, while the comma-separated columns, titles and descriptions are
+drawn independently.  Every value therefore follows the real distribution
+at any scale.
+
+:func:`run_benchmark` times each stage separately (CSV parse, column store
+build, cached load, derived columns, every question's aggregation, the
+combined single scan and every chart) and returns a JSON-serializable
+report.  From ``questions/``::
+
+    python -m netflix_analysis.bench --scales 1,10,100 --output bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from .aggregate import (
+    PartialAggregates,
+    evaluate_aggregates,
+    required_dimensions,
+    required_multivalue,
+)
+from .cache import open_cached_store
+from .derive import add_derived_columns
+from .loader import find_dataset_path, read_dataset_csv
+from .questions import get_question
+from .runner import parse_question_list, plan_run
+
+# Columns resampled together so that they stay consistent with each other.
+JOINT_COLUMNS = (
+    ('type', 'duration', 'rating'),
+    ('date_added', 'release_year'),
+)
+
+GENERATE_BLOCK_ROWS = 100_000
+
+
+def generate_catalog(output: Union[str, Path], scale: float,
+                     source: Optional[Union[str, Path]] = None, seed: int = 0,
+                     block_rows: int = GENERATE_BLOCK_ROWS) -> int:
+    """Write a synthetic catalog ``scale`` times the size of ``source``.
+
+    Rows are written ``block_rows`` at a time so large scales never hold
+    the whole catalog in memory.  Returns the number of rows written.
+    """
+    real = pd.read_csv(find_dataset_path(source), dtype=str)
+    rows = max(1, int(round(scale * len(real))))
+    rng = np.random.default_rng(seed)
+    grouped = {c for group in JOINT_COLUMNS for c in group}
+    independent = [c for c in real.columns if c != 'show_id' and c not in grouped]
+
+    with open(output, 'w', encoding='utf-8', newline='') as fh:
+        for start in range(0, rows, block_rows):
+            n = min(block_rows, rows - start)
+            block = {'show_id': [f's{i}' for i in range(start + 1, start + n + 1)]}
+            for group in JOINT_COLUMNS:
+                picks = rng.integers(0, len(real), n)
+                for column in group:
+                    block[column] = real[column].to_numpy()[picks]
+            for column in independent:
+                block[column] = real[column].to_numpy()[rng.integers(0, len(real), n)]
+            pd.DataFrame(block, columns=real.columns).to_csv(fh, index=False, header=start == 0)
+    return rows
+
+
+def _measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Wall and CPU seconds of ``func`` (median of ``repeat`` runs)."""
+    walls, cpus = [], []
+    for _ in range(repeat):
+        wall, cpu = time.perf_counter(), time.process_time()
+        func()
+        walls.append(time.perf_counter() - wall)
+        cpus.append(time.process_time() - cpu)
+    return {'wall_s': statistics.median(walls), 'cpu_s': statistics.median(cpus),
+            'min_wall_s': min(walls)}
+
+
+@contextlib.contextmanager
+def _cache_dir(directory: Path) -> Iterator[None]:
+    """Point ``NETFLIX_CACHE_DIR`` at ``directory`` for the enclosed block."""
+    previous = os.environ.get('NETFLIX_CACHE_DIR')
+    os.environ['NETFLIX_CACHE_DIR'] = str(directory)
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop('NETFLIX_CACHE_DIR', None)
+        else:
+            os.environ['NETFLIX_CACHE_DIR'] = previous
+
+
+def benchmark_catalog(path: Path, cache_dir: Path, repeat: int = 3, render: bool = True,
+                      questions: Optional[Sequence[int]] = None) -> Dict[str, object]:
+    """Time every stage of the pipeline on the catalog at ``path``.
+
+    ``cache_dir`` holds the catalog's caches and is deleted to time the
+    cache build, so it must be a directory of the benchmark's own.
+    """
+    with _cache_dir(cache_dir):
+        return _benchmark_catalog(path, cache_dir, repeat, render, questions)
+
+
+def _benchmark_catalog(path: Path, cache_dir: Path, repeat: int, render: bool,
+                       questions: Optional[Sequence[int]]) -> Dict[str, object]:
+    plan = plan_run(questions)
+    timings: Dict[str, object] = {}
+
+    timings['load_csv'] = _measure(lambda: read_dataset_csv(path), repeat)
+
+    def build_store():
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        return open_cached_store(path, read_dataset_csv)
+
+    timings['cache_build'] = _measure(build_store, 1)
+    store = open_cached_store(path, read_dataset_csv)
+    timings['load_cached'] = _measure(lambda: store.to_frame(plan.columns), repeat)
+
+    df = store.to_frame(plan.columns)
+    indexes = {name: store.multivalue(name) for name in plan.multivalue}
+
+    def derive():
+        return add_derived_columns(df.copy(deep=False), plan.derived, indexes.__getitem__)
+
+    timings['derive'] = _measure(derive, repeat)
+    df = derive()
+
+    def aggregate(aggregates):
+        counted = {name: indexes[name] for name in required_multivalue(aggregates)}
+        partial = PartialAggregates.scan(df, required_dimensions(aggregates), counted)
+        return evaluate_aggregates(aggregates, partial)
+
+    per_question = {}
+    for number in plan.questions:
+        aggregates = get_question(number).aggregates
+        per_question[f'q{number:02d}'] = _measure(lambda: aggregate(aggregates), repeat)
+    timings['aggregate'] = per_question
+    timings['aggregate_single_scan'] = _measure(lambda: aggregate(plan.aggregates), repeat)
+
+    if render:
+        import matplotlib.pyplot as plt
+
+        from .charts import apply_style, draw_chart
+
+        apply_style()
+        results = aggregate(plan.aggregates)
+
+        def render_one(number):
+            fig = draw_chart(number, results)
+            try:
+                fig.savefig(io.BytesIO(), format='png')
+            finally:
+                plt.close(fig)
+
+        timings['render'] = {f'q{number:02d}': _measure(lambda: render_one(number), repeat)
+                             for number in plan.questions}
+
+    return {'rows': store.rows, 'bytes': path.stat().st_size, 'timings': timings}
+
+
+def run_benchmark(scales: Sequence[float], repeat: int = 3, render: bool = True,
+                  questions: Optional[Sequence[int]] = None,
+                  source: Optional[Union[str, Path]] = None, seed: int = 0,
+                  work_dir: Optional[Union[str, Path]] = None) -> Dict[str, object]:
+    """Generate a catalog per scale, benchmark it and return the report.
+
+    Catalogs and their caches go to ``work_dir`` (a temporary directory,
+    removed afterwards, by default).
+    """
+    temporary = work_dir is None
+    work_dir = Path(tempfile.mkdtemp(prefix='netflix_bench_') if temporary else work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    runs: List[Dict[str, object]] = []
+    try:
+        for scale in scales:
+            path = work_dir / f'catalog_x{scale:g}.csv'
+            started = time.perf_counter()
+            generate_catalog(path, scale, source, seed)
+            generate_s = time.perf_counter() - started
+            run = {'scale': scale, 'generate_s': generate_s}
+            run.update(benchmark_catalog(path, work_dir / f'cache_x{scale:g}', repeat, render,
+                                         questions))
+            runs.append(run)
+    finally:
+        if temporary:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+        },
+        'repeat': repeat,
+        'seed': seed,
+        'runs': runs,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m netflix_analysis.bench',
+        description='Time the Netflix question pipeline on synthetic catalogs.')
+    parser.add_argument('--scales', default='1,10',
+                        help='comma-separated multiples of the real catalog size (default: 1,10)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per measurement; the median is reported (default: 3)')
+    parser.add_argument('--questions', default=None,
+                        help='only benchmark these questions, e.g. 8,11,14')
+    parser.add_argument('--no-render', action='store_true', help='skip chart rendering')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the generator')
+    parser.add_argument('--source', default=None,
+                        help='real catalog to resample (default: the dataset the scripts use)')
+    parser.add_argument('--work-dir', default=None,
+                        help='keep generated catalogs here instead of a temporary directory')
+    parser.add_argument('--output', default=None,
+                        help='write the JSON report to this file instead of stdout')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if not args.no_render:
+        import matplotlib
+        matplotlib.use('Agg')
+    questions = parse_question_list(args.questions) if args.questions else None
+    scales = [float(s) for s in args.scales.split(',') if s.strip()]
+    report = run_benchmark(scales, args.repeat, not args.no_render, questions,
+                           args.source, args.seed, args.work_dir)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + '\n', encoding='utf-8')
+    else:
+        sys.stdout.write(text + '\n')
+
+
+if __name__ == '__main__':
+    main()
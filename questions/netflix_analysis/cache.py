@@ -0,0 +1,145 @@
+"""Binary columnar cache for the parsed dataset.
+
+The first load of a CSV writes the typed frame as a memory-mapped column
+store (see :mod:`netflix_analysis.colstore`) next to the source, or under
+``NETFLIX_CACHE_DIR``.  Later loads open that store instead of tokenizing
+the CSV again.  The store records the source size, mtime and SHA-256; a
+size/mtime match is trusted, a size match with a new mtime is confirmed by
+hash (and the new mtime recorded), and anything else rebuilds the store.
+Building the store also splits every comma-separated column into a
+:class:`~netflix_analysis.multivalue.MultiValueIndex`, so the split/explode
+cost is paid once per dataset version rather than once per question.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+from . import profiling
+from .colstore import ColumnStore, update_meta, write_store
+from .multivalue import build_multivalue_indexes
+
+# Bump when the on-disk layout or the loader's parsing rules change so that
+# stale caches are rebuilt instead of misread.
+CACHE_VERSION = 5
+
+CACHE_DIR_NAME = '.netflix_cache'
+_HASH_BLOCK = 1 << 20
+
+
+def cache_dir_for(source: Path) -> Path:
+    """Directory holding cache files for ``source``."""
+    override = os.environ.get('NETFLIX_CACHE_DIR')
+    if override:
+        return Path(override)
+    return source.parent / CACHE_DIR_NAME
+
+
+def store_path_for(source: Path) -> Path:
+    return cache_dir_for(source) / f'{source.stem}.cols'
+
+
+def file_sha256(path: Union[str, Path]) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(_HASH_BLOCK), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_signature(source: Path) -> Dict[str, object]:
+    stat = source.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _record_mtime(store: ColumnStore, signature: Dict[str, object]) -> None:
+    """Record the mtime of a source whose hash still matches the store.
+
+    Later loads then trust the size/mtime check again instead of rehashing
+    a touched but unchanged CSV every time.
+    """
+    store.meta = dict(store.meta, mtime_ns=signature['mtime_ns'])
+    try:
+        update_meta(store.directory, store.meta)
+    except OSError:
+        pass  # read-only cache: keep confirming by hash
+
+
+def _open_valid_store(store_path: Path, signature: Dict[str, object],
+                      source: Path) -> Optional[ColumnStore]:
+    try:
+        store = ColumnStore(store_path)
+    except (OSError, ValueError, KeyError):
+        return None
+    meta = store.meta
+    if meta.get('version') != CACHE_VERSION or meta.get('size') != signature['size']:
+        return None
+    if meta.get('mtime_ns') == signature['mtime_ns']:
+        return store
+    if meta.get('sha256') == file_sha256(source):
+        _record_mtime(store, signature)
+        return store
+    return None
+
+
+def open_cached_store(
+    source: Union[str, Path],
+    build: Callable[[Path], pd.DataFrame],
+) -> ColumnStore:
+    """Return the column store for ``source``, building it on a miss.
+
+    ``build`` parses the CSV and is only called when no valid store exists.
+    Raises ``OSError`` if the store cannot be written.
+    """
+    source = Path(source)
+    store_path = store_path_for(source)
+    signature = _source_signature(source)
+    store = _open_valid_store(store_path, signature, source)
+    if store is None:
+        df = build(source)
+        with profiling.stage('load', 'build_cache'):
+            meta = dict(signature, version=CACHE_VERSION,
+                        sha256=file_sha256(source), source=str(source))
+            write_store(df, store_path, meta, indexes=build_multivalue_indexes(df))
+        store = ColumnStore(store_path)
+    return store
+
+
+def load_cached_frame(
+    source: Union[str, Path],
+    build: Callable[[Path], pd.DataFrame],
+    columns: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """Return the frame for ``source`` (optionally only ``columns``).
+
+    Any problem writing the cache is swallowed so a read-only checkout still
+    loads the data, just without the speed-up.
+    """
+    try:
+        store = open_cached_store(source, build)
+    except (OSError, ValueError):
+        df = build(Path(source))
+        return df if columns is None else df[list(columns)]
+    return store.to_frame(columns)
+
+
+def dataset_sha256(source: Union[str, Path]) -> str:
+    """SHA-256 of ``source``, taken from its column store when that is current."""
+    source = Path(source)
+    signature = _source_signature(source)
+    try:
+        store = ColumnStore(store_path_for(source))
+    except (OSError, ValueError, KeyError):
+        return file_sha256(source)
+    meta = store.meta
+    if (meta.get('size'), meta.get('mtime_ns')) == (signature['size'], signature['mtime_ns']):
+        return meta['sha256']
+    digest = file_sha256(source)
+    if meta.get('size') == signature['size'] and meta.get('sha256') == digest:
+        _record_mtime(store, signature)
+    return digest
@@ -0,0 +1,451 @@
+"""Charts for the 15 questions and the headless batch renderer.
+
+Every chart is drawn from the question's aggregate results (see
+:mod:`netflix_analysis.questions`), never from the row-level frame, so a
+chart can be rendered in another process from a few small pickled
+Series/DataFrames.  :func:`render_all` does exactly that: it forces the
+non-interactive Agg backend, renders the requested figures across a process
+pool and saves each one to the output directory in every requested format.
+
+Each saved file is recorded in the output directory's
+``.chart_fingerprints.json`` with a fingerprint of the chart's input data,
+the code and style it is drawn with, and the library versions.  The next
+:func:`render_all` into the same directory keeps every file whose
+fingerprint still matches and only redraws the charts whose numbers moved.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+from matplotlib.colors import LinearSegmentedColormap, LogNorm
+from matplotlib.lines import Line2D
+
+from . import profiling
+from .questions import QUESTION_AGGREGATES
+from .runner import to_jsonable
+
+DEFAULT_FORMATS = ('png',)
+
+MANIFEST_NAME = '.chart_fingerprints.json'
+
+MONTH_NAMES = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+TYPE_COLORS = {'Movie': '#E50914', 'TV Show': '#B20710'}
+
+# Above this many titles Q14 draws a 2D histogram per type instead of one
+# scatter marker per title
+GAP_DENSITY_THRESHOLD = 100_000
+
+
+def apply_style() -> None:
+    """Set style for better-looking plots."""
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+
+
+# ============================================
+# Question charts
+# ============================================
+
+def chart_type_distribution(results):
+    type_counts = results['type_counts']
+    plt.figure(figsize=(8, 8))
+    colors = ['#E50914', '#B20710']
+    plt.pie(type_counts.values, labels=type_counts.index, autopct='%1.1f%%',
+            colors=colors, startangle=90, textprops={'fontsize': 14, 'weight': 'bold'})
+    plt.title('Netflix Content Type Distribution', fontsize=16, weight='bold', pad=20)
+    plt.tight_layout()
+
+
+def chart_top_countries(results):
+    plt.figure(figsize=(12, 6))
+    results['country_counts'].plot(kind='barh', color='#E50914')
+    plt.title('Top 10 Countries by Netflix Content', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Number of Titles', fontsize=12, weight='bold')
+    plt.ylabel('Country', fontsize=12, weight='bold')
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+
+
+def chart_rating_distribution(results):
+    plt.figure(figsize=(12, 6))
+    results['rating_counts'].plot(kind='bar', color='#B20710')
+    plt.title('Netflix Content Rating Distribution', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Rating', fontsize=12, weight='bold')
+    plt.ylabel('Count', fontsize=12, weight='bold')
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+
+
+def chart_release_year_trend(results):
+    year_counts = results['year_counts']
+    plt.figure(figsize=(14, 6))
+    plt.plot(year_counts.index, year_counts.values, marker='o',
+             color='#E50914', linewidth=2, markersize=6)
+    plt.title('Netflix Content by Release Year', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Release Year', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles', fontsize=12, weight='bold')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+
+def chart_type_rating_heatmap(results):
+    plt.figure(figsize=(12, 6))
+    sns.heatmap(results['pivot_table'], annot=True, fmt='d', cmap='Reds',
+                cbar_kws={'label': 'Count'}, linewidths=0.5)
+    plt.title('Content Type vs Rating Heatmap', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Rating', fontsize=12, weight='bold')
+    plt.ylabel('Content Type', fontsize=12, weight='bold')
+    plt.tight_layout()
+
+
+def chart_movie_durations(results):
+    # One bar per distinct duration, weighted by how many movies have it
+    distribution = results['duration_distribution']
+    plt.figure(figsize=(12, 6))
+    plt.hist(distribution.index, weights=distribution.values, bins=20,
+             color='#E50914', edgecolor='black')
+    plt.title('Distribution of Movie Durations', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Duration (minutes)', fontsize=12, weight='bold')
+    plt.ylabel('Frequency', fontsize=12, weight='bold')
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+
+
+def chart_tv_seasons(results):
+    plt.figure(figsize=(10, 6))
+    results['season_counts'].plot(kind='bar', color='#B20710')
+    plt.title('TV Show Seasons Distribution', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Number of Seasons', fontsize=12, weight='bold')
+    plt.ylabel('Number of Shows', fontsize=12, weight='bold')
+    plt.xticks(rotation=0)
+    plt.tight_layout()
+
+
+def chart_monthly_additions(results):
+    plt.figure(figsize=(14, 6))
+    results['monthly_additions'].plot(color='#E50914', linewidth=2)
+    plt.title('Content Added to Netflix Over Time', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Date', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+
+def chart_type_by_release_year(results):
+    year_type = results['year_type'].reindex(columns=['Movie', 'TV Show'], fill_value=0)
+    plt.figure(figsize=(14, 6))
+    plt.stackplot(year_type.index, year_type['Movie'], year_type['TV Show'],
+                  labels=['Movie', 'TV Show'], colors=['#E50914', '#B20710'], alpha=0.8)
+    plt.title('Movies vs TV Shows by Release Year (Stacked)', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Release Year', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles', fontsize=12, weight='bold')
+    plt.legend(loc='upper left')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+
+def chart_top_directors(results):
+    plt.figure(figsize=(12, 6))
+    results['director_counts'].plot(kind='barh', color='#831010')
+    plt.title('Top 10 Directors with Most Content on Netflix', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Number of Titles', fontsize=12, weight='bold')
+    plt.ylabel('Director', fontsize=12, weight='bold')
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+
+
+def chart_yearly_additions(results):
+    plt.figure(figsize=(12, 6))
+    results['yearly_additions'].plot(kind='bar', color='#E50914')
+    plt.title('Content Added to Netflix by Year', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Year', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
+    plt.xticks(rotation=45)
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+
+
+def chart_duration_by_rating(results):
+    plt.figure(figsize=(12, 6))
+    results['avg_duration_by_rating'].plot(kind='bar', color='#B20710')
+    plt.title('Average Movie Duration by Content Rating', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Rating', fontsize=12, weight='bold')
+    plt.ylabel('Average Duration (minutes)', fontsize=12, weight='bold')
+    plt.xticks(rotation=45, ha='right')
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+
+
+def chart_monthly_pattern(results):
+    monthly_pattern = results['monthly_pattern']
+    plt.figure(figsize=(12, 6))
+    plt.bar(range(1, 13), [monthly_pattern.get(i, 0) for i in range(1, 13)], color='#E50914')
+    plt.title('Seasonal Pattern: Content Added by Month', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Month', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
+    plt.xticks(range(1, 13), MONTH_NAMES)
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+
+
+def gap_density(gap_points) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """Bin (release_year, year_gap, type) counts into one-year cells per type.
+
+    Returns the release-year and gap bin edges and, per type, the title
+    counts with shape ``(len(year_edges) - 1, len(gap_edges) - 1)``.  Works
+    on the distinct points, so its cost does not grow with the catalog.
+    """
+    points = gap_points.index.to_frame(index=False)
+    years = points['release_year'].to_numpy(dtype='float64')
+    gaps = points['year_gap'].to_numpy(dtype='float64')
+    counts = gap_points.to_numpy(dtype='float64')
+    year_edges = np.arange(years.min(), years.max() + 2) - 0.5
+    gap_edges = np.arange(gaps.min(), gaps.max() + 2) - 0.5
+    types = points['type'].to_numpy(dtype=object)
+    grids = {}
+    for label in TYPE_COLORS:
+        chosen = types == label
+        grids[label] = np.histogram2d(years[chosen], gaps[chosen], bins=(year_edges, gap_edges),
+                                      weights=counts[chosen])[0]
+    return year_edges, gap_edges, grids
+
+
+def draw_gap_density(gap_points) -> None:
+    """Q14 as one log-scaled 2D histogram per type (see :func:`gap_density`)."""
+    year_edges, gap_edges, grids = gap_density(gap_points)
+    peak = max(grid.max() for grid in grids.values())
+    fig, axes = plt.subplots(1, len(grids), figsize=(14, 6), sharey=True)
+    for ax, (label, grid) in zip(axes, grids.items()):
+        cmap = LinearSegmentedColormap.from_list(label, ['#FDE0E1', TYPE_COLORS[label]])
+        mesh = ax.pcolormesh(year_edges, gap_edges, np.ma.masked_equal(grid.T, 0), cmap=cmap,
+                             norm=LogNorm(vmin=1, vmax=max(peak, 1)))
+        ax.set_title(label, fontsize=13, weight='bold')
+        ax.set_xlabel('Release Year', fontsize=12, weight='bold')
+        ax.grid(True, alpha=0.3)
+        fig.colorbar(mesh, ax=ax, label='Titles')
+    axes[0].set_ylabel('Years Until Added to Netflix', fontsize=12, weight='bold')
+    fig.suptitle('Time Gap: Release Year to Netflix Addition', fontsize=16, weight='bold')
+
+
+def chart_release_to_addition_gap(results):
+    gap_points = results['year_gap_points']
+    if gap_points.sum() > GAP_DENSITY_THRESHOLD:
+        draw_gap_density(gap_points)
+        return
+
+    # Expand the (release_year, year_gap, type) counts back to one marker per title
+    df_gap = gap_points.index.to_frame(index=False)
+    df_gap = df_gap.loc[np.repeat(np.arange(len(gap_points)), gap_points.values)]
+
+    plt.figure(figsize=(14, 6))
+    plt.scatter(df_gap['release_year'], df_gap['year_gap'],
+                c=df_gap['type'].map(TYPE_COLORS), alpha=0.5, s=30)
+    plt.title('Time Gap: Release Year to Netflix Addition', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Release Year', fontsize=12, weight='bold')
+    plt.ylabel('Years Until Added to Netflix', fontsize=12, weight='bold')
+    plt.grid(True, alpha=0.3)
+    legend_elements = [Line2D([0], [0], marker='o', color='w', markerfacecolor=color,
+                              markersize=10, label=label)
+                       for label, color in TYPE_COLORS.items()]
+    plt.legend(handles=legend_elements, loc='upper left')
+    plt.tight_layout()
+
+
+def chart_top_countries_by_type(results):
+    results['country_type_pivot'].plot(kind='bar', color=['#E50914', '#B20710'], figsize=(12, 6))
+    plt.title('Top 5 Countries: Movies vs TV Shows', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Country', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles', fontsize=12, weight='bold')
+    plt.legend(title='Content Type', fontsize=10)
+    plt.xticks(rotation=45, ha='right')
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+
+
+CHARTS: Dict[int, Callable[[Mapping[str, object]], None]] = {
+    1: chart_type_distribution,
+    2: chart_top_countries,
+    3: chart_rating_distribution,
+    4: chart_release_year_trend,
+    5: chart_type_rating_heatmap,
+    6: chart_movie_durations,
+    7: chart_tv_seasons,
+    8: chart_monthly_additions,
+    9: chart_type_by_release_year,
+    10: chart_top_directors,
+    11: chart_yearly_additions,
+    12: chart_duration_by_rating,
+    13: chart_monthly_pattern,
+    14: chart_release_to_addition_gap,
+    15: chart_top_countries_by_type,
+}
+
+
+def chart_filename(number: int) -> str:
+    """File stem of a saved chart, e.g. ``q05_type_rating_heatmap``."""
+    return f"q{number:02d}_{CHARTS[number].__name__[len('chart_'):]}"
+
+
+def chart_inputs(number: int, results: Mapping[str, object]) -> Dict[str, object]:
+    """The subset of ``results`` a chart draws from."""
+    return {a.name: results[a.name] for a in QUESTION_AGGREGATES[number]}
+
+
+def draw_chart(number: int, results: Mapping[str, object]):
+    """Draw question ``number``'s chart on a new figure and return it."""
+    with profiling.stage('render', chart_filename(number), question=number):
+        CHARTS[number](results)
+    return plt.gcf()
+
+
+# ============================================
+# Batch rendering
+# ============================================
+
+def _init_worker() -> None:
+    matplotlib.use('Agg')
+    apply_style()
+
+
+def _helpers(function: Callable) -> List[Callable]:
+    """``function`` and every function of this module it calls, directly or not."""
+    found: List[Callable] = []
+    pending = [function]
+    while pending:
+        current = pending.pop()
+        if current in found:
+            continue
+        found.append(current)
+        codes = [current.__code__]
+        while codes:
+            code = codes.pop()
+            # Comprehensions and lambdas have code objects of their own
+            codes.extend(c for c in code.co_consts if inspect.iscode(c))
+            for name in code.co_names:
+                value = globals().get(name)
+                if inspect.isfunction(value) and value.__module__ == __name__:
+                    pending.append(value)
+    return found
+
+
+def chart_fingerprint(number: int, inputs: Mapping[str, object], fmt: str) -> str:
+    """Hash of everything a saved chart depends on: data, drawing code, style and format.
+
+    The drawing code includes the helpers the chart function calls (e.g.
+    Q14's :func:`draw_gap_density` and :func:`gap_density`).
+    """
+    parts = [
+        json.dumps(to_jsonable(dict(inputs)), sort_keys=True),
+        *(inspect.getsource(f) for f in _helpers(CHARTS[number])),
+        inspect.getsource(apply_style),
+        repr((MONTH_NAMES, TYPE_COLORS, GAP_DENSITY_THRESHOLD, fmt,
+              matplotlib.__version__, sns.__version__)),
+    ]
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _read_manifest(output_dir: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), encoding='utf-8') as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(output_dir: str, manifest: Mapping[str, str]) -> None:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    staging = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(staging, 'w', encoding='utf-8') as fh:
+            json.dump(dict(sorted(manifest.items())), fh, indent=1)
+        os.replace(staging, path)
+    finally:
+        if os.path.exists(staging):
+            os.unlink(staging)
+
+
+def _render_to_files(number: int, inputs: Mapping[str, object], output_dir: str,
+                     formats: Sequence[str]) -> List[str]:
+    fig = draw_chart(number, inputs)
+    paths = []
+    try:
+        for fmt in formats:
+            path = os.path.join(output_dir, f'{chart_filename(number)}.{fmt}')
+            with profiling.stage('render', f'save:{fmt}', question=number):
+                fig.savefig(path, format=fmt)
+            paths.append(path)
+    finally:
+        plt.close(fig)
+    return paths
+
+
+def render_all(
+    results: Mapping[str, object],
+    output_dir: Union[str, Path],
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    workers: Optional[int] = None,
+    questions: Optional[Iterable[int]] = None,
+    reuse: bool = True,
+) -> Dict[int, List[str]]:
+    """Save the charts of ``questions`` (all by default) without a display.
+
+    With ``reuse`` a file already in ``output_dir`` whose fingerprint (see
+    :func:`chart_fingerprint`) matches is kept instead of being redrawn.
+    The remaining figures are rendered across ``workers`` processes
+    (default: one per CPU, capped at the number of charts); ``workers=1``
+    renders in this process.  Returns the file paths per question.
+    """
+    numbers = sorted(CHARTS) if questions is None else sorted(questions)
+    os.makedirs(output_dir, exist_ok=True)
+    output_dir = str(output_dir)
+    formats = tuple(formats)
+
+    manifest = _read_manifest(output_dir)
+    inputs = {n: chart_inputs(n, results) for n in numbers}
+    fingerprints: Dict[str, str] = {}
+    pending: Dict[int, Tuple[str, ...]] = {}
+    for n in numbers:
+        stale = []
+        for fmt in formats:
+            name = f'{chart_filename(n)}.{fmt}'
+            fingerprints[name] = chart_fingerprint(n, inputs[n], fmt)
+            if (not reuse or manifest.get(name) != fingerprints[name]
+                    or not os.path.exists(os.path.join(output_dir, name))):
+                stale.append(fmt)
+        if stale:
+            pending[n] = tuple(stale)
+    profiling.annotate('charts_reused', [n for n in numbers if n not in pending])
+
+    if workers is None:
+        workers = min(len(pending), os.cpu_count() or 1)
+    if workers <= 1 or len(pending) <= 1:
+        if pending:
+            _init_worker()
+        for n, stale in pending.items():
+            _render_to_files(n, inputs[n], output_dir, stale)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = [pool.submit(_render_to_files, n, inputs[n], output_dir, stale)
+                       for n, stale in pending.items()]
+            for future in futures:
+                future.result()
+
+    manifest.update(fingerprints)
+    try:
+        _write_manifest(output_dir, manifest)
+    except OSError:
+        pass
+    return {n: [os.path.join(output_dir, f'{chart_filename(n)}.{fmt}') for fmt in formats]
+            for n in numbers}
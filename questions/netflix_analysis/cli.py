@@ -0,0 +1,163 @@
+"""``python -m netflix_analysis`` command line.
+
+``query`` answers ad-hoc filter / group-by / count questions (see
+:mod:`netflix_analysis.query`) from the memory-mapped column store, so
+after the first run nothing is re-read from the CSV.  ``top`` streams the
+CSV once to estimate the most frequent directors, cast members, countries
+or genres in bounded memory.  ``additions`` counts
+titles added in a date range from prefix sums of daily additions (see
+:mod:`netflix_analysis.timeindex`).  ``serve`` keeps the
+catalog loaded and answers the same over HTTP (see
+:mod:`netflix_analysis.service`).  From ``questions/``::
+
+    python -m netflix_analysis query --filter type=Movie --filter countries=India \\
+        --filter rating=TV-MA --filter year_added=2019
+    python -m netflix_analysis query --filter type=Movie --group-by rating,year_added --top 10
+    python -m netflix_analysis top --column cast --top 20 --epsilon 0.0005
+    python -m netflix_analysis additions --start 2019-01-01 --end 2019-12-31 --by rating
+    python -m netflix_analysis serve --port 8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+from .query import parse_query, queryable_columns, run_query
+from .loader import DEFAULT_CHUNKSIZE
+from .multivalue import MULTI_VALUED_COLUMNS
+from .runner import stream_heavy_hitters, to_jsonable
+from .service import DEFAULT_CACHE_SIZE, DEFAULT_PORT, serve
+from .sketches import DEFAULT_EPSILON, Approximation
+from .timeindex import load_addition_index
+
+
+def _format_result(result, fmt: str) -> str:
+    if fmt == 'json':
+        return json.dumps(to_jsonable(result))
+    if not isinstance(result, (pd.Series, pd.DataFrame)):
+        return str(result)
+    if fmt == 'csv':
+        return result.to_csv().rstrip('\n')
+    return result.to_string()
+
+
+def _query(args) -> None:
+    query = parse_query(args.filter, args.group_by, args.top, args.sort, not args.keep_missing)
+    result = run_query(query, args.dataset, use_cache=not args.no_cache)
+    sys.stdout.write(_format_result(result, args.format) + '\n')
+
+
+def _top(args) -> None:
+    if args.top < 1:
+        raise ValueError('--top must be a positive integer')
+    sketch = stream_heavy_hitters(args.column, args.dataset, Approximation(args.epsilon),
+                                  args.chunksize)
+    sys.stdout.write(_format_result(sketch.bounds(args.top), args.format) + '\n')
+
+
+def _additions(args) -> None:
+    index = load_addition_index(None if args.by == 'none' else args.by, args.dataset,
+                                use_cache=not args.no_cache)
+    if args.window is None:
+        result = index.count(args.start, args.end)
+    else:
+        result = index.rolling(args.window).loc[args.start:args.end]
+        if index.by is None:
+            result = result.iloc[:, 0].rename('count')
+    sys.stdout.write(_format_result(result, args.format) + '\n')
+
+
+def _serve(args) -> None:
+    serve(args.dataset, args.host, args.port, args.cache_size,
+          use_cache=not args.no_cache, log_requests=args.log_requests)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m netflix_analysis',
+                                     description='Netflix dataset analysis tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    query = commands.add_parser(
+        'query', help='count titles matching filters, optionally grouped',
+        description='Count titles matching every --filter, optionally grouped by columns. '
+                    f'Columns: {", ".join(queryable_columns())}.')
+    query.add_argument('--filter', action='append', default=[], metavar='COLUMN{=,!=,>=,<=,>,<}VALUE',
+                       help='e.g. type=Movie, rating=TV-MA,TV-14 or release_year>=2015 (repeatable)')
+    query.add_argument('--group-by', default=None, metavar='COLUMNS',
+                       help='comma-separated columns to count by, e.g. rating,year_added')
+    query.add_argument('--top', type=int, default=None, help='only print the N largest groups')
+    query.add_argument('--sort', choices=('count', 'index'), default='count',
+                       help='order groups by count (default) or by value')
+    query.add_argument('--keep-missing', action='store_true',
+                       help='count titles with a missing group-by value as "(missing)"')
+    query.add_argument('--format', choices=('table', 'json', 'csv'), default='table')
+    query.add_argument('--dataset', default=None,
+                       help='CSV to query (default: the dataset the scripts use)')
+    query.add_argument('--no-cache', action='store_true',
+                       help='parse the CSV instead of using the column cache')
+    query.set_defaults(handler=_query)
+
+    top = commands.add_parser(
+        'top', help='estimate the most frequent values of a comma-separated column',
+        description='Stream the CSV once and print lower and upper bounds on the counts of '
+                    'the most frequent values of --column, keeping at most 1/--epsilon '
+                    'counters however many distinct values there are.')
+    top.add_argument('--column', choices=MULTI_VALUED_COLUMNS, default='directors',
+                     help='column to count (listed_in holds the genres; default: directors)')
+    top.add_argument('--top', type=int, default=10, help='values to print (default: 10)')
+    top.add_argument('--epsilon', type=float, default=DEFAULT_EPSILON,
+                     help=f'largest count error as a fraction of the values counted '
+                          f'(default: {DEFAULT_EPSILON})')
+    top.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                     help=f'rows read at a time (default: {DEFAULT_CHUNKSIZE})')
+    top.add_argument('--format', choices=('table', 'json', 'csv'), default='table')
+    top.add_argument('--dataset', default=None,
+                     help='CSV to read (default: the dataset the scripts use)')
+    top.set_defaults(handler=_top)
+
+    additions = commands.add_parser(
+        'additions', help='count titles added between two dates',
+        description='Count titles added from --start to --end (inclusive) per --by group, '
+                    'or with --window N the titles added in the N days ending on each day.')
+    additions.add_argument('--start', default=None, help='first day, e.g. 2019-01-01')
+    additions.add_argument('--end', default=None, help='last day, e.g. 2019-12-31')
+    additions.add_argument('--by', default='type',
+                           help="group by this column, e.g. rating or primary_country, "
+                                "or 'none' (default: type)")
+    additions.add_argument('--window', type=int, default=None, metavar='DAYS',
+                           help='print rolling DAYS-day counts for every day in the range')
+    additions.add_argument('--format', choices=('table', 'json', 'csv'), default='table')
+    additions.add_argument('--dataset', default=None,
+                           help='CSV to query (default: the dataset the scripts use)')
+    additions.add_argument('--no-cache', action='store_true',
+                           help='parse the CSV and rebuild the index instead of using the caches')
+    additions.set_defaults(handler=_additions)
+
+    server = commands.add_parser(
+        'serve', help='serve the questions and queries as JSON over HTTP',
+        description='Keep the dataset loaded and answer /questions, /questions/<n>, /query '
+                    'and /health with JSON.')
+    server.add_argument('--host', default='127.0.0.1', help='address to bind (default: 127.0.0.1)')
+    server.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help=f'port to listen on (default: {DEFAULT_PORT})')
+    server.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE,
+                        help=f'responses kept in the LRU cache (default: {DEFAULT_CACHE_SIZE})')
+    server.add_argument('--dataset', default=None,
+                        help='CSV to serve (default: the dataset the scripts use)')
+    server.add_argument('--no-cache', action='store_true',
+                        help='parse the CSV instead of using the column cache')
+    server.add_argument('--log-requests', action='store_true', help='log every request to stderr')
+    server.set_defaults(handler=_serve)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    try:
+        args.handler(args)
+    except ValueError as exc:
+        sys.exit(f'error: {exc}')
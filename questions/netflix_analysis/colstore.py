@@ -0,0 +1,257 @@
+"""Memory-mapped on-disk column store for the parsed dataset.
+
+A store is a directory with one ``.npy`` file per physical array and a
+``meta.json`` describing the columns:
+
+* numeric        -> ``<name>.npy`` holding the values as-is (float64 with
+                    NaN, plus the dtype, for nullable or extension dtypes)
+* datetime64     -> ``<name>.npy`` holding int64 ticks in the column's unit
+* category       -> ``<name>.codes.npy``; the labels live in ``meta.json``
+* text           -> ``<name>.data.npy`` (NUL-joined UTF-8 bytes),
+                    ``<name>.offsets.npy`` (byte offset of every value, plus
+                    the end) and ``<name>.null.npy`` (missing-value mask)
+
+Comma-separated columns may also carry a prebuilt
+:class:`~netflix_analysis.multivalue.MultiValueIndex`, stored as
+``<name>.mv.codes.npy``, ``<name>.mv.offsets.npy`` and the distinct labels
+as a text array under ``<name>.mv.labels``.
+
+Every array is opened with ``mmap_mode='r'``, so processes reading the same
+store share one copy in the page cache.  Numeric, datetime and category
+columns are handed to pandas without copying; text columns are only turned
+into Python strings when a caller asks for them, which keeps the heavy
+``cast`` and ``description`` columns out of every process that does not use
+them.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .multivalue import MultiValueIndex
+
+STORE_FORMAT = 1
+META_FILE = 'meta.json'
+_SEPARATOR = '\x00'
+
+
+# ============================================
+# Writing
+# ============================================
+
+def _write_text(directory: Path, prefix: str, values: pd.Series) -> None:
+    null = values.isna().to_numpy()
+    filled = values.astype(object).where(~null, '').tolist()
+    joined = _SEPARATOR.join(filled)
+    if joined.count(_SEPARATOR) != max(len(filled) - 1, 0):
+        raise ValueError(f'{prefix!r} contains NUL characters')
+    lengths = np.fromiter((len(v.encode('utf-8')) + 1 for v in filled),
+                          dtype=np.int64, count=len(filled))
+    offsets = np.zeros(len(filled) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    np.save(directory / f'{prefix}.data.npy', np.frombuffer(joined.encode('utf-8'), dtype=np.uint8))
+    np.save(directory / f'{prefix}.offsets.npy', offsets)
+    np.save(directory / f'{prefix}.null.npy', null)
+
+
+def _write_multivalue(directory: Path, name: str, index: MultiValueIndex) -> None:
+    np.save(directory / f'{name}.mv.codes.npy', index.codes)
+    np.save(directory / f'{name}.mv.offsets.npy', index.offsets)
+    _write_text(directory, f'{name}.mv.labels', pd.Series(index.labels, dtype=object))
+
+
+def write_store(df: pd.DataFrame, directory: Union[str, Path],
+                meta: Optional[Dict[str, object]] = None,
+                indexes: Optional[Dict[str, MultiValueIndex]] = None) -> None:
+    """Write ``df`` as a column store at ``directory``, replacing any old one.
+
+    ``indexes`` maps column names to prebuilt multi-value indexes to store
+    alongside the columns.
+
+    The store is assembled in a sibling temporary directory and swapped in
+    with renames; processes still mapping the old files keep reading them
+    until they close.
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(dir=directory.parent, prefix=f'.{directory.name}.'))
+    try:
+        schema = []
+        for name in df.columns:
+            col = df[name]
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                np.save(staging / f'{name}.codes.npy', col.cat.codes.to_numpy())
+                schema.append({'name': name, 'kind': 'category',
+                               'categories': [str(c) for c in col.cat.categories],
+                               'ordered': bool(col.cat.ordered)})
+            elif pd.api.types.is_datetime64_any_dtype(col.dtype):
+                values = col.to_numpy()
+                np.save(staging / f'{name}.npy', values.view('int64'))
+                schema.append({'name': name, 'kind': 'datetime', 'dtype': str(values.dtype)})
+            elif (pd.api.types.is_numeric_dtype(col.dtype) and not col.hasnans
+                  and isinstance(col.dtype, np.dtype)):
+                np.save(staging / f'{name}.npy', col.to_numpy())
+                schema.append({'name': name, 'kind': 'numeric'})
+            elif pd.api.types.is_numeric_dtype(col.dtype):
+                np.save(staging / f'{name}.npy', col.to_numpy(dtype='float64', na_value=np.nan))
+                schema.append({'name': name, 'kind': 'numeric', 'dtype': str(col.dtype)})
+            else:
+                _write_text(staging, name, col)
+                schema.append({'name': name, 'kind': 'text'})
+        for name, index in (indexes or {}).items():
+            _write_multivalue(staging, name, index)
+        payload = {'format': STORE_FORMAT, 'rows': len(df), 'columns': schema,
+                   'indexes': sorted(indexes or {}), 'meta': meta or {}}
+        (staging / META_FILE).write_text(json.dumps(payload), encoding='utf-8')
+
+        retired = None
+        if directory.exists():
+            retired = Path(tempfile.mkdtemp(dir=directory.parent, prefix=f'.{directory.name}.old.'))
+            os.replace(directory, retired / directory.name)
+        os.replace(staging, directory)
+        if retired is not None:
+            shutil.rmtree(retired, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def update_meta(directory: Union[str, Path], meta: Dict[str, object]) -> None:
+    """Replace the ``meta`` recorded in the store at ``directory``.
+
+    Only ``meta.json`` is rewritten (through a temporary file and a rename),
+    so readers see either the old or the new metadata.
+    """
+    path = Path(directory) / META_FILE
+    payload = json.loads(path.read_text(encoding='utf-8'))
+    payload['meta'] = meta
+    fd, staging = tempfile.mkstemp(dir=path.parent, prefix=f'.{META_FILE}.')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as fh:
+            fh.write(json.dumps(payload))
+        os.replace(staging, path)
+    except BaseException:
+        os.unlink(staging)
+        raise
+
+
+# ============================================
+# Reading
+# ============================================
+
+class ColumnStore:
+    """Read-only, memory-mapped view of a store written by :func:`write_store`."""
+
+    def __init__(self, directory: Union[str, Path]):
+        self.directory = Path(directory)
+        payload = json.loads((self.directory / META_FILE).read_text(encoding='utf-8'))
+        if payload.get('format') != STORE_FORMAT:
+            raise ValueError(f'unsupported column store format in {self.directory}')
+        self.rows: int = payload['rows']
+        self.meta: Dict[str, object] = payload['meta']
+        self._schema = {entry['name']: entry for entry in payload['columns']}
+        self._indexes = set(payload.get('indexes', ()))
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._schema)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def _array(self, filename: str) -> np.ndarray:
+        arr = self._arrays.get(filename)
+        if arr is None:
+            try:
+                arr = np.load(self.directory / filename, mmap_mode='r').view(np.ndarray)
+            except ValueError:
+                # Zero-length arrays cannot be mapped.
+                arr = np.load(self.directory / filename)
+            self._arrays[filename] = arr
+        return arr
+
+    def kind(self, name: str) -> str:
+        return self._schema[name]['kind']
+
+    def array(self, name: str) -> np.ndarray:
+        """Zero-copy NumPy view of a numeric, datetime or category column.
+
+        Category columns return their integer codes.
+        """
+        entry = self._schema[name]
+        if entry['kind'] == 'category':
+            return self._array(f'{name}.codes.npy')
+        if entry['kind'] == 'datetime':
+            return self._array(f'{name}.npy').view(entry['dtype'])
+        if entry['kind'] == 'numeric':
+            return self._array(f'{name}.npy')
+        raise TypeError(f'column {name!r} is text; use text() or value()')
+
+    def categories(self, name: str) -> List[str]:
+        return list(self._schema[name]['categories'])
+
+    def value(self, name: str, row: int) -> Optional[str]:
+        """Decode a single text value straight from the mapped buffer."""
+        if self._array(f'{name}.null.npy')[row]:
+            return None
+        offsets = self._array(f'{name}.offsets.npy')
+        start, stop = int(offsets[row]), int(offsets[row + 1]) - 1
+        return bytes(self._array(f'{name}.data.npy')[start:stop]).decode('utf-8')
+
+    def _read_text(self, prefix: str) -> np.ndarray:
+        data = self._array(f'{prefix}.data.npy')
+        null = self._array(f'{prefix}.null.npy')
+        values = np.array(data.tobytes().decode('utf-8').split(_SEPARATOR), dtype=object)
+        if len(null) == 0:
+            return values[:0]
+        values[null] = np.nan
+        return values
+
+    def text(self, name: str) -> np.ndarray:
+        """Materialize a text column as an object array (NaN for missing)."""
+        return self._read_text(name)
+
+    def has_multivalue(self, name: str) -> bool:
+        return name in self._indexes
+
+    def multivalue(self, name: str) -> MultiValueIndex:
+        """Prebuilt index of a comma-separated column; codes and offsets stay mapped."""
+        if name not in self._indexes:
+            raise KeyError(f'no multi-value index for {name!r} in {self.directory}')
+        labels = pd.Index(self._read_text(f'{name}.mv.labels'), dtype=str, name=name)
+        return MultiValueIndex(labels, self._array(f'{name}.mv.codes.npy'),
+                               self._array(f'{name}.mv.offsets.npy'), name=name)
+
+    def series(self, name: str) -> pd.Series:
+        entry = self._schema[name]
+        kind = entry['kind']
+        if kind == 'category':
+            values = pd.Categorical.from_codes(
+                self.array(name), categories=pd.Index(entry['categories'], dtype=str),
+                ordered=entry['ordered'],
+            )
+        elif kind == 'numeric' and 'dtype' in entry:
+            values = pd.array(self.array(name), dtype=entry['dtype'])
+        elif kind in ('numeric', 'datetime'):
+            values = self.array(name)
+        else:
+            values = pd.array(self.text(name), dtype=str)
+        return pd.Series(values, name=name, copy=False)
+
+    def to_frame(self, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Build a DataFrame holding only ``columns`` (all by default)."""
+        names = self.columns if columns is None else list(columns)
+        missing = [n for n in names if n not in self._schema]
+        if missing:
+            raise KeyError(f'columns not in store: {missing}')
+        return pd.DataFrame({name: self.series(name) for name in names},
+                            index=pd.RangeIndex(self.rows), copy=False)
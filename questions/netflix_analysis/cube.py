@@ -0,0 +1,257 @@
+"""Sparse count cube over the categorical dimensions of the catalog.
+
+Q3, Q5, Q9, Q11, Q13 and Q15 are all slices of one count of titles by
+``type``, ``rating``, ``primary_country``, ``release_year`` and
+``month_added``.  :func:`build_cube` groups the rows by those dimensions
+once and keeps only the non-empty cells, each as one integer code per
+dimension plus a count; ``year_added`` and ``month_number`` follow from
+``month_added`` and are kept as extra coordinates of the same cells.
+
+:meth:`CountCube.rollup` and :meth:`CountCube.crosstab` then answer any
+count over any combination of those columns (e.g. rating by year_added)
+with a few NumPy operations over the cells, never touching row data, and
+:meth:`CountCube.partial` exposes the cells to the aggregation engine.
+:func:`load_cube` builds the cube once per dataset version and keeps it in
+``.netflix_cache/<stem>.cube.pkl``.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import derive, profiling
+from .aggregate import PartialAggregates
+from .cache import cache_dir_for, dataset_sha256
+from .loader import find_dataset_path, load_dataset, load_multivalue_index
+
+# Bump when the saved layout or the dimensions change.
+CUBE_VERSION = 4
+
+CUBE_DIMENSIONS = ('type', 'rating', 'primary_country', 'release_year', 'month_added')
+# Functions of month_added, so they add no cells
+CUBE_COORDINATES = {
+    'year_added': lambda months: months.year,
+    'month_number': lambda months: months.month,
+}
+
+_LOADED: Dict[Tuple[str, int, int], 'CountCube'] = {}
+
+
+def _codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Sorted distinct values and each row's position among them (-1 if missing).
+
+    A categorical column keeps its dtype, so counts taken from the cube are
+    indexed exactly like counts taken from the rows.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return (values.cat.codes.to_numpy(dtype=np.int32),
+                pd.CategoricalIndex(values.cat.categories, dtype=values.dtype))
+    codes, labels = pd.factorize(values, sort=True)
+    return codes.astype(np.int32), pd.Index(labels)
+
+
+def _take(labels: pd.Index, positions: np.ndarray) -> pd.Index:
+    """``labels`` at ``positions``, where position -1 is a missing value."""
+    if (positions >= 0).all():
+        return labels.take(positions)
+    if labels.dtype.kind in 'iu':
+        labels = labels.astype('float64')
+    return labels.take(positions, allow_fill=True, fill_value=np.nan)
+
+
+def _where_key(where: Optional[Mapping[str, object]]) -> Tuple:
+    return tuple(sorted((name, tuple(wanted) if isinstance(wanted, (list, tuple, set)) else wanted)
+                        for name, wanted in (where or {}).items()))
+
+
+@dataclass
+class CountCube:
+    """Titles per non-empty combination of :data:`CUBE_DIMENSIONS`.
+
+    ``codes[d][i]`` is cell ``i``'s position in ``labels[d]`` (``-1`` for
+    a missing value) and ``counts[i]`` its number of titles.  Cells are in
+    order of their first row in the dataset.
+    """
+
+    labels: Dict[str, pd.Index]
+    codes: Dict[str, np.ndarray]
+    counts: np.ndarray
+    # Rollups and crosstabs already answered
+    _answers: Dict[Tuple, object] = field(default_factory=dict, repr=False, compare=False)
+
+    @property
+    def dimensions(self) -> Tuple[str, ...]:
+        return tuple(self.labels)
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def _check(self, names) -> None:
+        unknown = [name for name in names if name not in self.labels]
+        if unknown:
+            raise ValueError(f'the cube has no dimension {unknown}; '
+                             f'choose from {", ".join(self.dimensions)}')
+
+    def _mask(self, where: Optional[Mapping[str, object]]) -> np.ndarray:
+        mask = np.ones(len(self.counts), dtype=bool)
+        for name, wanted in (where or {}).items():
+            self._check([name])
+            values = wanted if isinstance(wanted, (list, tuple, set)) else [wanted]
+            positions = self.labels[name].get_indexer(list(values))
+            mask &= np.isin(self.codes[name], positions[positions >= 0])
+        return mask
+
+    def slice(self, **where) -> 'CountCube':
+        """The cells matching ``where`` (``dimension=value`` or ``=[values]``)."""
+        mask = self._mask(where)
+        return CountCube(self.labels, {d: c[mask] for d, c in self.codes.items()},
+                         self.counts[mask])
+
+    def __getstate__(self):
+        # Remembered answers are not worth saving
+        state = self.__dict__.copy()
+        state['_answers'] = {}
+        return state
+
+    def rollup(self, by: Union[str, Sequence[str]], where: Optional[Mapping[str, object]] = None,
+               dropna: bool = True) -> pd.Series:
+        """Titles per combination of ``by``, ordered by value, restricted to ``where``.
+
+        Results are remembered, so asking again costs a dictionary lookup.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        return self._remember(('rollup', tuple(by), _where_key(where), dropna),
+                              lambda: self._rollup(by, where, dropna))
+
+    def _remember(self, key: Tuple, compute):
+        result = self._answers.get(key)
+        if result is None:
+            result = self._answers[key] = compute()
+        return result.copy(deep=False)
+
+    def _rollup(self, by, where, dropna) -> pd.Series:
+        self._check(by)
+        mask = self._mask(where)
+        if dropna:
+            for name in by:
+                mask &= self.codes[name] >= 0
+        if not by:
+            return pd.Series([int(self.counts[mask].sum())], name='count')
+
+        # Shift codes by one so missing values (-1) get a slot of their own
+        codes = [self.codes[name][mask] + 1 for name in by]
+        sizes = [len(self.labels[name]) + 1 for name in by]
+        cells, inverse = np.unique(np.ravel_multi_index(codes, sizes), return_inverse=True)
+        sums = np.bincount(inverse, weights=self.counts[mask], minlength=len(cells))
+        levels = []
+        for name, positions in zip(by, np.unravel_index(cells, sizes)):
+            levels.append(_take(self.labels[name], positions - 1).rename(name))
+        index = levels[0] if len(levels) == 1 else pd.MultiIndex.from_arrays(levels)
+        return pd.Series(sums.astype(np.int64), index=index, name='count')
+
+    def crosstab(self, index: str, column: str,
+                 where: Optional[Mapping[str, object]] = None) -> pd.DataFrame:
+        """``pd.crosstab(index, column)`` of the titles matching ``where``."""
+        return self._remember(('crosstab', index, column, _where_key(where)),
+                              lambda: self.rollup([index, column], where)
+                              .unstack(fill_value=0).rename_axis(columns=column))
+
+    def partial(self) -> PartialAggregates:
+        """The cells as a grouped table the aggregation engine can evaluate."""
+        key = ('partial',)
+        if key not in self._answers:
+            groups = {name: _take(self.labels[name], self.codes[name])
+                      for name in CUBE_DIMENSIONS}
+            groups['count'] = self.counts
+            self._answers[key] = PartialAggregates(pd.DataFrame(groups))
+        return self._answers[key]
+
+
+def build_cube(df: pd.DataFrame) -> CountCube:
+    """Group ``df`` (with every column of :data:`CUBE_DIMENSIONS`) into a cube."""
+    with profiling.stage('aggregate', 'cube'):
+        labels: Dict[str, pd.Index] = {}
+        row_codes = []
+        for name in CUBE_DIMENSIONS:
+            codes, labels[name] = _codes(df[name])
+            row_codes.append(codes + 1)
+        sizes = [len(labels[name]) + 1 for name in CUBE_DIMENSIONS]
+        cells, first, counts = np.unique(np.ravel_multi_index(row_codes, sizes),
+                                         return_index=True, return_counts=True)
+        # Keep cells in order of first appearance, like a groupby(sort=False)
+        # over the rows, so count ties come out in the same order
+        order = np.argsort(first, kind='stable')
+        cells, counts = cells[order], counts[order]
+        codes = {name: (positions - 1).astype(np.int32)
+                 for name, positions in zip(CUBE_DIMENSIONS, np.unravel_index(cells, sizes))}
+
+        months = pd.PeriodIndex(labels['month_added'])
+        for name, coordinate in CUBE_COORDINATES.items():
+            per_month, labels[name] = pd.factorize(np.asarray(coordinate(months)), sort=True)
+            labels[name] = pd.Index(labels[name])
+            lookup = np.append(per_month, -1).astype(np.int32)
+            codes[name] = lookup[codes['month_added']]
+    return CountCube(labels, codes, counts.astype(np.int64))
+
+
+def cube_path_for(source: Path) -> Path:
+    return cache_dir_for(source) / f'{source.stem}.cube.pkl'
+
+
+def _load_saved(path: Path, digest: str) -> Optional[CountCube]:
+    try:
+        with open(path, 'rb') as fh:
+            saved = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if (not isinstance(saved, dict) or saved.get('version') != CUBE_VERSION
+            or saved.get('digest') != digest):
+        return None
+    return saved['cube']
+
+
+def _save(path: Path, saved: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(staging, 'wb') as fh:
+            pickle.dump(saved, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+    finally:
+        if staging.exists():
+            staging.unlink()
+
+
+def load_cube(path: Optional[Union[str, Path]] = None, use_cache: bool = True) -> CountCube:
+    """The dataset's cube, built once per dataset version and reused from disk."""
+    source = find_dataset_path(path)
+    stat = source.stat()
+    key = (str(source), stat.st_size, stat.st_mtime_ns)
+    cube = _LOADED.get(key)
+    if cube is not None:
+        return cube
+
+    digest = dataset_sha256(source)
+    cube_path = cube_path_for(source)
+    cube = _load_saved(cube_path, digest) if use_cache else None
+    if cube is None:
+        df = load_dataset(source, use_cache,
+                          columns=derive.source_columns(CUBE_DIMENSIONS)).copy(deep=False)
+        derive.add_derived_columns(df, CUBE_DIMENSIONS,
+                                   lambda column: load_multivalue_index(column, source, use_cache))
+        cube = build_cube(df)
+        if use_cache:
+            try:
+                _save(cube_path, {'version': CUBE_VERSION, 'digest': digest, 'cube': cube})
+            except OSError:
+                pass
+    _LOADED[key] = cube
+    return cube
@@ -0,0 +1,71 @@
+"""Parse ``date_added`` once per distinct string.
+
+A catalog of any size holds only a few thousand distinct ``date_added``
+strings ("September 25, 2021"), so the loader reads the column as a
+categorical (the CSV parser hashes the strings as it reads them) and
+:func:`parse_dates` normalizes and parses each category once with the
+known format, then maps the results back through the codes.  Other input
+is factorized first.  Stray whitespace (leading/trailing blanks, doubled
+spaces, a space before the comma) is normalized before parsing.  Strings
+that still do not match the format become ``NaT`` and are listed, with
+their counts, in the returned :class:`DateParseResult`.
+"""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DATE_ADDED_FORMAT = '%B %d, %Y'
+
+
+class UnparseableDatesWarning(UserWarning):
+    """Some non-empty dates did not match the expected format."""
+
+
+@dataclass
+class DateParseResult:
+    dates: pd.Series
+    # Occurrences of every non-empty string that could not be parsed
+    unparseable: pd.Series
+
+
+def normalize_whitespace(values: pd.Series) -> pd.Series:
+    return (values.str.strip()
+            .str.replace(r'\s+', ' ', regex=True)
+            .str.replace(' ,', ',', regex=False))
+
+
+def parse_dates(values: pd.Series, fmt: str = DATE_ADDED_FORMAT) -> DateParseResult:
+    """Parse ``values`` with ``fmt``, once per distinct string."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    uniques = uniques.to_numpy(dtype=object)
+    texts = normalize_whitespace(pd.Series(uniques, dtype=object).astype(str))
+    parsed = pd.to_datetime(texts, format=fmt, errors='coerce').to_numpy()
+
+    dates = np.full(len(codes), np.datetime64('NaT'), dtype=parsed.dtype)
+    present = codes >= 0
+    dates[present] = parsed[codes[present]]
+
+    failed = np.isnan(parsed) & (texts != '').to_numpy()
+    counts = np.bincount(codes[present], minlength=len(uniques))
+    unparseable = pd.Series(counts[failed], index=pd.Index(uniques[failed], dtype=object),
+                            name='count').sort_values(ascending=False, kind='stable')
+    return DateParseResult(pd.Series(dates, index=values.index, name=values.name), unparseable)
+
+
+def parse_date_added(values: pd.Series) -> pd.Series:
+    """Parsed ``date_added``; warns once listing any strings that could not be parsed."""
+    result = parse_dates(values)
+    if len(result.unparseable):
+        sample = ', '.join(repr(v) for v in result.unparseable.index[:5])
+        warnings.warn(f'{int(result.unparseable.sum())} date_added values could not be parsed '
+                      f'as "{DATE_ADDED_FORMAT}" (e.g. {sample}); they are treated as missing',
+                      UnparseableDatesWarning, stacklevel=2)
+    return result.dates
@@ -0,0 +1,114 @@
+"""Derived columns shared between questions, resolved as a dependency graph.
+
+Several questions need the same derived columns: ``date_added`` broken into
+months and years (Q8, Q11, Q13, Q14) and the first listed country (Q2,
+Q15).  (``duration_min`` and ``num_seasons`` are parsed by the loader and
+cached with the dataset, see :mod:`netflix_analysis.durations`.)  Each one
+is declared once here together with its inputs, and
+:func:`add_derived_columns` computes the requested columns plus everything
+they depend on, each exactly once and in dependency order.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+import pandas as pd
+
+from . import profiling
+from .multivalue import MultiValueIndex
+
+IndexLookup = Callable[[str], MultiValueIndex]
+
+
+@dataclass(frozen=True)
+class DerivedColumn:
+    """A column computed from dataset columns, other derived columns and
+    multi-value indexes (``multivalue`` names the comma-separated columns)."""
+
+    name: str
+    inputs: Tuple[str, ...]
+    compute: Callable[[pd.DataFrame, Mapping[str, MultiValueIndex]], pd.Series]
+    multivalue: Tuple[str, ...] = ()
+
+
+DERIVED_COLUMNS: Dict[str, DerivedColumn] = {c.name: c for c in (
+    DerivedColumn('primary_country', (),
+                  lambda df, idx: idx['countries'].first().set_axis(df.index),
+                  multivalue=('countries',)),
+    DerivedColumn('month_added', ('date_added',),
+                  lambda df, idx: df['date_added'].dt.to_period('M')),
+    DerivedColumn('year_added', ('date_added',),
+                  lambda df, idx: df['date_added'].dt.year),
+    DerivedColumn('month_number', ('date_added',),
+                  lambda df, idx: df['date_added'].dt.month),
+    DerivedColumn('year_gap', ('year_added', 'release_year'),
+                  lambda df, idx: df['year_added'] - df['release_year']),
+)}
+
+
+def resolve(names: Iterable[str]) -> List[str]:
+    """Derived columns needed for ``names``, dependencies first.
+
+    Names that are not derived columns are treated as dataset columns and
+    left out.  Raises ``ValueError`` on a dependency cycle.
+    """
+    order: List[str] = []
+    visiting: Set[str] = set()
+
+    def visit(name: str) -> None:
+        if name not in DERIVED_COLUMNS or name in order:
+            return
+        if name in visiting:
+            raise ValueError(f'derived column dependency cycle through {name!r}')
+        visiting.add(name)
+        for dependency in DERIVED_COLUMNS[name].inputs:
+            visit(dependency)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def source_columns(names: Iterable[str]) -> List[str]:
+    """Dataset columns that must be loaded to produce ``names``."""
+    names = list(names)
+    columns: List[str] = []
+    for name in names + [d for n in resolve(names) for d in DERIVED_COLUMNS[n].inputs]:
+        if name not in DERIVED_COLUMNS and name not in columns:
+            columns.append(name)
+    return columns
+
+
+def multivalue_inputs(names: Iterable[str]) -> List[str]:
+    """Comma-separated columns whose indexes the derived ``names`` need."""
+    needed: List[str] = []
+    for name in resolve(names):
+        for column in DERIVED_COLUMNS[name].multivalue:
+            if column not in needed:
+                needed.append(column)
+    return needed
+
+
+def add_derived_columns(df: pd.DataFrame, names: Iterable[str],
+                        index_lookup: Optional[IndexLookup] = None) -> pd.DataFrame:
+    """Add ``names`` and their dependencies to ``df`` in place.
+
+    Columns already present are not recomputed.  ``index_lookup`` returns
+    the multi-value index of a comma-separated column; by default the index
+    is built from ``df``.
+    """
+    for name in resolve(names):
+        if name in df.columns:
+            continue
+        column = DERIVED_COLUMNS[name]
+        with profiling.stage('derive', name):
+            indexes = {}
+            for source in column.multivalue:
+                indexes[source] = (index_lookup(source) if index_lookup is not None
+                                   else MultiValueIndex.from_series(df[source]))
+            df[name] = column.compute(df, indexes)
+    return df
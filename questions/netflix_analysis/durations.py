@@ -0,0 +1,89 @@
+"""Split ``duration`` into typed ``duration_min`` and ``num_seasons`` columns.
+
+``duration`` holds "90 min" for movies and "1 Season" / "2 Seasons" for TV
+shows.  The questions used to run ``str.extract(r'(\\d+)')`` over the movie
+and TV subsets separately.  :func:`parse_durations` instead parses every
+distinct ``duration`` string once (the loader reads the column as a
+categorical, as it does for ``date_added``), maps number and unit back
+through the codes in one vectorized pass over the frame, and keeps a value
+only where its unit agrees with ``type``.  Both columns are nullable
+``Int16`` and are stored in the column cache with the rest of the dataset.
+"""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+DURATION_PATTERN = r'^\s*(\d+)\s*(min|Seasons?)\s*$'
+
+# Unit codes, and the unit each content type's duration must use
+NO_UNIT, MINUTES, SEASONS = 0, 1, 2
+TYPE_UNITS = {'Movie': MINUTES, 'TV Show': SEASONS}
+
+DURATION_COLUMNS = ('duration_min', 'num_seasons')
+
+
+class InvalidDurationsWarning(UserWarning):
+    """Some durations did not parse or did not match the title's type."""
+
+
+@dataclass
+class DurationParseResult:
+    minutes: pd.Series
+    seasons: pd.Series
+    # Occurrences of every (type, duration) pair that was rejected
+    invalid: pd.Series
+
+
+def _codes(values: pd.Series):
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    return pd.factorize(values)
+
+
+def parse_durations(duration: pd.Series, types: pd.Series) -> DurationParseResult:
+    """Parse ``duration`` once per distinct value and validate it against ``types``."""
+    codes, uniques = _codes(duration)
+    parts = pd.Series(uniques.to_numpy(dtype=object), dtype=str).str.extract(DURATION_PATTERN)
+    # One trailing slot for missing values (code -1)
+    numbers = np.append(pd.to_numeric(parts[0]).to_numpy(dtype='float64', na_value=np.nan),
+                        np.nan)
+    units = np.append(np.select([parts[1].str.startswith('Season').fillna(False).to_numpy(bool),
+                                 parts[1].notna().to_numpy(bool)], [SEASONS, MINUTES], NO_UNIT),
+                      NO_UNIT).astype(np.int8)
+
+    type_codes, type_labels = _codes(types)
+    type_units = np.append([TYPE_UNITS.get(t, NO_UNIT) for t in type_labels], NO_UNIT)
+    expected = type_units.astype(np.int8)[type_codes]
+
+    row_numbers, row_units = numbers[codes], units[codes]
+    valid = (row_units == expected) & (row_units != NO_UNIT)
+    minutes = np.where(valid & (row_units == MINUTES), row_numbers, np.nan)
+    seasons = np.where(valid & (row_units == SEASONS), row_numbers, np.nan)
+
+    rejected = (codes >= 0) & ~valid
+    invalid = (pd.DataFrame({'type': types[rejected].to_numpy(dtype=object),
+                             'duration': duration[rejected].to_numpy(dtype=object)})
+               .value_counts(sort=True, dropna=False).rename('count'))
+    return DurationParseResult(
+        pd.Series(pd.array(minutes, dtype='Int16'), index=duration.index, name='duration_min'),
+        pd.Series(pd.array(seasons, dtype='Int16'), index=duration.index, name='num_seasons'),
+        invalid,
+    )
+
+
+def add_duration_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add ``duration_min`` and ``num_seasons`` to ``df`` in place; warns about rejected values."""
+    result = parse_durations(df['duration'], df['type'])
+    if len(result.invalid):
+        sample = ', '.join(f'{t} {d!r}' for t, d in result.invalid.index[:5])
+        warnings.warn(f'{int(result.invalid.sum())} durations could not be parsed or do not '
+                      f'match the title type (e.g. {sample}); they are treated as missing',
+                      InvalidDurationsWarning, stacklevel=2)
+    df['duration_min'] = result.minutes
+    df['num_seasons'] = result.seasons
+    return df
@@ -0,0 +1,139 @@
+"""Incremental refresh of the question aggregates for an append-only catalog.
+
+New titles are appended to the CSV as new rows, so the aggregates of the
+rows already seen never change.  :func:`refresh_plan` persists the
+:class:`~netflix_analysis.aggregate.AggregateState` of a plan together with
+a high-water mark (the byte offset and number of rows processed) and the
+SHA-256 of every byte before that mark.  The next refresh checks that the
+processed prefix is still in place, reads only the bytes appended since,
+merges their partial aggregates into the saved state and moves the mark
+forward, so its parsing cost scales with the number of new titles (hashing
+the prefix again is cheap next to parsing it).
+
+Anything other than an append (a rewritten or truncated file, a different
+plan, a new state version) makes the refresh start over from the header.
+The file is assumed not to be written to while a refresh reads it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from .cache import CACHE_VERSION, cache_dir_for
+from .loader import DEFAULT_CHUNKSIZE, find_dataset_path, header_end, iter_dataset_chunks
+from .runner import RunPlan, accumulate, stream_columns
+
+# Bump when the saved state layout or the aggregate semantics change.
+STATE_VERSION = 2
+
+_HASH_BLOCK = 1 << 20
+
+
+@dataclass
+class RefreshInfo:
+    """What a refresh did: rows read now, rows covered in total, and whether
+    the saved state had to be rebuilt from the start of the file."""
+
+    new_rows: int
+    total_rows: int
+    rebuilt: bool
+
+
+def plan_signature(plan: RunPlan) -> str:
+    """Stable hash of what ``plan`` computes, used to key its saved state."""
+    text = repr((STATE_VERSION, CACHE_VERSION, plan.aggregates, plan.derived))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def state_path_for(source: Path, plan: RunPlan) -> Path:
+    return cache_dir_for(source) / f'{source.stem}.state' / f'{plan_signature(plan)[:16]}.pkl'
+
+
+def _prefix_checksums(path: Path, offset: int) -> Dict[str, str]:
+    """SHA-256 of the first ``offset`` bytes of ``path``.
+
+    The whole prefix is hashed: an edit anywhere in the processed rows,
+    even one that keeps the file size, must start the refresh over.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as fh:
+        remaining = offset
+        while remaining > 0:
+            block = fh.read(min(_HASH_BLOCK, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return {'prefix': digest.hexdigest()}
+
+
+def _load_state(state_path: Path, plan: RunPlan, source: Path) -> Optional[dict]:
+    try:
+        with open(state_path, 'rb') as fh:
+            saved = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if (not isinstance(saved, dict) or saved.get('version') != STATE_VERSION
+            or saved.get('signature') != plan_signature(plan)):
+        return None
+    offset = saved['offset']
+    if source.stat().st_size < offset or saved['checksums'] != _prefix_checksums(source, offset):
+        return None
+    return saved
+
+
+def _save_state(state_path: Path, saved: dict) -> None:
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    staging = state_path.with_name(f'{state_path.name}.{os.getpid()}.tmp')
+    try:
+        with open(staging, 'wb') as fh:
+            pickle.dump(saved, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, state_path)
+    finally:
+        if staging.exists():
+            staging.unlink()
+
+
+def refresh_plan(plan: RunPlan, path: Optional[Union[str, Path]] = None,
+                 chunksize: int = DEFAULT_CHUNKSIZE):
+    """Bring the saved state of ``plan`` up to date and evaluate it.
+
+    Returns ``(results, info)`` where ``results`` equals
+    :func:`~netflix_analysis.runner.run_plan`'s and ``info`` is a
+    :class:`RefreshInfo`.  A state that cannot be saved (read-only
+    checkout) is simply recomputed next time.
+    """
+    source = find_dataset_path(path)
+    state_path = state_path_for(source, plan)
+    saved = _load_state(state_path, plan, source)
+    rebuilt = saved is None
+    if rebuilt:
+        saved = {'version': STATE_VERSION, 'signature': plan_signature(plan),
+                 'offset': header_end(source), 'rows': 0, 'state': None}
+
+    end = source.stat().st_size
+    state = saved['state']
+    new_rows = 0
+    if end > saved['offset']:
+        chunks = iter_dataset_chunks(source, stream_columns(plan), chunksize,
+                                     byte_range=(saved['offset'], end))
+        delta = accumulate(plan, chunks)
+        if delta is not None:
+            new_rows = delta.total
+            state = delta if state is None else state.merge(delta)
+    if state is None:
+        raise ValueError('the dataset has no rows to aggregate')
+
+    if rebuilt or new_rows or end != saved['offset']:
+        saved.update(offset=end, rows=saved['rows'] + new_rows, state=state,
+                     checksums=_prefix_checksums(source, end))
+        try:
+            _save_state(state_path, saved)
+        except OSError:
+            pass
+    return state.evaluate(), RefreshInfo(new_rows, saved['rows'], rebuilt)
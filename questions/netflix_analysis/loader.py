@@ -0,0 +1,252 @@
+"""Single entry point for loading the cleaned Netflix titles dataset.
+
+Every question script used to carry its own ``load_netflix_dataset()`` that
+probed four relative paths and let pandas infer every dtype.  This module
+resolves the CSV once, reads it with explicit dtypes, parses ``date_added``
+once per distinct value (see :mod:`netflix_analysis.dates`), splits
+``duration`` into typed ``duration_min`` / ``num_seasons`` columns (see
+:mod:`netflix_analysis.durations`), and hands the same frame to every
+caller in the process.  Parsed frames are also persisted by
+:mod:`netflix_analysis.cache` as a memory-mapped column store, so later
+runs skip the CSV entirely and only materialize the columns they ask for.
+:func:`iter_dataset_chunks` reads the CSV a bounded number of rows at a
+time for inputs too large to load.
+"""
+
+from __future__ import annotations
+
+import io
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from . import profiling
+from .cache import load_cached_frame, open_cached_store
+from .dates import parse_date_added
+from .durations import add_duration_columns
+from .multivalue import MultiValueIndex
+
+DATASET_FILENAMES = (
+    'netflix_titles_CLEANED.csv',
+    'netflix_titles.CLEANED.csv',
+)
+
+# Directories searched (in order) when no explicit path is given.  Paths
+# relative to the working directory come first so that running a script
+# from the repository root or from ``questions/`` behaves as before.
+_QUESTIONS_DIR = Path(__file__).resolve().parent.parent
+_SEARCH_DIRS = (
+    Path('..'),
+    Path('.'),
+    _QUESTIONS_DIR,
+    _QUESTIONS_DIR.parent,
+)
+
+CSV_DTYPES = {
+    'show_id': str,
+    'type': 'category',
+    'title': str,
+    'directors': str,
+    'cast': str,
+    'countries': str,
+    # Parsed per distinct value by netflix_analysis.dates
+    'date_added': 'category',
+    'release_year': 'int16',
+    'rating': 'category',
+    # Split into duration_min / num_seasons by netflix_analysis.durations
+    'duration': 'category',
+    'listed_in': str,
+    'description': str,
+}
+
+# Columns added by the loader, and the CSV columns each is parsed from
+PARSED_COLUMNS = {
+    'duration_min': ('duration', 'type'),
+    'num_seasons': ('duration', 'type'),
+}
+
+# Categories differ from chunk to chunk, so chunked reads keep them as text
+# and partial aggregates merge them as plain values.  date_added and
+# duration stay categorical: they are parsed before anything groups by them.
+CHUNK_DTYPES = {name: (str if dtype == 'category' and name not in ('date_added', 'duration')
+                       else dtype)
+                for name, dtype in CSV_DTYPES.items()}
+
+DEFAULT_CHUNKSIZE = 100_000
+
+# Loaded frames keyed by (resolved path, size, mtime, columns) so a modified
+# file is re-read but repeated calls within one run share a single frame.
+_FRAMES: Dict[Tuple[str, int, int, Optional[Tuple[str, ...]]], pd.DataFrame] = {}
+_INDEXES: Dict[Tuple[str, int, int, str], MultiValueIndex] = {}
+
+
+def find_dataset_path(path: Optional[Union[str, Path]] = None) -> Path:
+    """Return the dataset location, honouring ``NETFLIX_DATASET`` if set."""
+    if path is None:
+        path = os.environ.get('NETFLIX_DATASET')
+    if path is not None:
+        path = Path(path)
+        if not path.is_file():
+            raise FileNotFoundError(f'Netflix dataset not found: {path}')
+        return path.resolve()
+
+    for directory in _SEARCH_DIRS:
+        for name in DATASET_FILENAMES:
+            candidate = directory / name
+            if candidate.is_file():
+                return candidate.resolve()
+    searched = ', '.join(str(d / n) for d in _SEARCH_DIRS for n in DATASET_FILENAMES)
+    raise FileNotFoundError(f'Netflix dataset not found; searched {searched}')
+
+
+def read_dataset_csv(path: Union[str, Path]) -> pd.DataFrame:
+    """Read the CSV with declared dtypes, a parsed ``date_added`` and the
+    typed duration columns."""
+    with profiling.stage('load', 'read_csv'):
+        df = pd.read_csv(path, dtype=CSV_DTYPES)
+    with profiling.stage('load', 'parse_date_added'):
+        df['date_added'] = parse_date_added(df['date_added'])
+    with profiling.stage('load', 'parse_durations'):
+        add_duration_columns(df)
+    return df
+
+
+def csv_columns(columns: Sequence[str]) -> List[str]:
+    """CSV columns to read to produce ``columns`` (which may include parsed ones)."""
+    needed: List[str] = []
+    for name in columns:
+        for source in PARSED_COLUMNS.get(name, (name,)):
+            if source not in needed:
+                needed.append(source)
+    return needed
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of ``length`` bytes of an open binary file."""
+
+    def __init__(self, fh, length: int):
+        self._fh = fh
+        self._remaining = length
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._fh.read(min(len(buffer), self._remaining))
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def header_end(path: Union[str, Path]) -> int:
+    """Byte offset of the first data row (just past the header line)."""
+    with open(path, 'rb') as fh:
+        fh.readline()
+        return fh.tell()
+
+
+def iter_dataset_chunks(
+    path: Optional[Union[str, Path]] = None,
+    columns: Optional[Sequence[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    byte_range: Optional[Tuple[int, int]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Yield the dataset ``chunksize`` rows at a time, parsed like :func:`load_dataset`.
+
+    Only ``columns`` are read (all by default) and nothing is cached, so
+    memory use is bounded by the chunk size however large the file is.
+    ``byte_range=(start, stop)`` reads only the rows stored in those bytes
+    of the file, which must begin and end on row boundaries; the header is
+    still taken from the first line.
+    """
+    resolved = find_dataset_path(path)
+    usecols = None if columns is None else csv_columns(columns)
+    with open(resolved, 'rb') as fh:
+        if byte_range is None:
+            source, header = fh, 'infer'
+            names = None
+        else:
+            names = pd.read_csv(fh, nrows=0).columns.tolist()
+            start, stop = byte_range
+            fh.seek(start)
+            source, header = io.BufferedReader(_ByteRange(fh, stop - start)), None
+        reader = pd.read_csv(source, dtype=CHUNK_DTYPES, usecols=usecols, chunksize=chunksize,
+                             header=header, names=names)
+        with reader:
+            for chunk in reader:
+                if 'date_added' in chunk:
+                    chunk['date_added'] = parse_date_added(chunk['date_added'])
+                if 'duration' in chunk and 'type' in chunk:
+                    add_duration_columns(chunk)
+                yield chunk if columns is None else chunk[list(columns)]
+
+
+def load_dataset(
+    path: Optional[Union[str, Path]] = None,
+    use_cache: bool = True,
+    columns: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Load the dataset once per process and return the shared frame.
+
+    With ``use_cache`` (the default) the parsed frame is served from the
+    memory-mapped column store when the CSV is unchanged.  Pass ``columns``
+    to materialize only what a question needs; the other columns are never
+    decoded.  Callers that add derived columns modify the shared frame; take
+    a ``.copy()`` first if a private frame is needed.
+    """
+    resolved = find_dataset_path(path)
+    stat = resolved.stat()
+    wanted = None if columns is None else tuple(columns)
+    key = (str(resolved), stat.st_size, stat.st_mtime_ns, wanted)
+    df = _FRAMES.get(key)
+    if df is None:
+        with profiling.stage('load', 'dataset'):
+            if use_cache:
+                df = load_cached_frame(resolved, read_dataset_csv, wanted)
+            else:
+                df = read_dataset_csv(resolved)
+                if wanted is not None:
+                    df = df[list(wanted)]
+        for stale in [k for k in _FRAMES if k[0] == key[0] and k[1:3] != key[1:3]]:
+            del _FRAMES[stale]
+        _FRAMES[key] = df
+    return df
+
+
+def load_multivalue_index(
+    column: str,
+    path: Optional[Union[str, Path]] = None,
+    use_cache: bool = True,
+) -> MultiValueIndex:
+    """Return the split index of a comma-separated column.
+
+    With ``use_cache`` the index comes prebuilt from the column store (its
+    codes and offsets stay memory-mapped); otherwise it is built from the
+    CSV and kept for the rest of the process.
+    """
+    resolved = find_dataset_path(path)
+    stat = resolved.stat()
+    key = (str(resolved), stat.st_size, stat.st_mtime_ns, column)
+    index = _INDEXES.get(key)
+    if index is None:
+        with profiling.stage('load', f'index:{column}'):
+            index = _open_multivalue_index(resolved, column, use_cache)
+        _INDEXES[key] = index
+    return index
+
+
+def _open_multivalue_index(resolved: Path, column: str, use_cache: bool) -> MultiValueIndex:
+    index = None
+    if use_cache:
+        try:
+            store = open_cached_store(resolved, read_dataset_csv)
+        except (OSError, ValueError):
+            store = None
+        if store is not None and store.has_multivalue(column):
+            index = store.multivalue(column)
+    if index is None:
+        df = load_dataset(resolved, use_cache=use_cache, columns=[column])
+        index = MultiValueIndex.from_series(df[column])
+    return index
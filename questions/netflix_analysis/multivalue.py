@@ -0,0 +1,108 @@
+"""CSR-style index over the comma-separated columns.
+
+``countries``, ``directors``, ``cast`` and ``listed_in`` hold several values
+per title ("United States, India").  The questions used to re-run
+``str.split(',')`` (and sometimes ``explode``/``strip``) on them every time
+they were needed.  A :class:`MultiValueIndex` does that split once:
+
+* ``labels``  - every distinct, whitespace-stripped value
+* ``codes``   - one integer code per (row, value) pair, row by row
+* ``offsets`` - ``codes[offsets[i]:offsets[i + 1]]`` are the values of row i
+
+Empty tokens (from trailing commas) are dropped, so a row whose only value
+is empty behaves like a missing value.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+MULTI_VALUED_COLUMNS = ('countries', 'directors', 'cast', 'listed_in')
+
+
+class MultiValueIndex:
+    """Distinct values of a comma-separated column plus per-row offsets."""
+
+    def __init__(self, labels: pd.Index, codes: np.ndarray, offsets: np.ndarray,
+                 name: Optional[str] = None):
+        self.labels = labels
+        self.codes = codes
+        self.offsets = offsets
+        self.name = name
+
+    @classmethod
+    def from_series(cls, values: pd.Series, sep: str = ',') -> 'MultiValueIndex':
+        n_rows = len(values)
+        if not values.notna().any():
+            # A chunk can miss the column entirely (read as float NaN)
+            return cls(pd.Index([], dtype=str, name=values.name), np.empty(0, dtype=np.int32),
+                       np.zeros(n_rows + 1, dtype=np.int64), name=values.name)
+        # Split the values themselves: astype(str) would turn NaN into 'nan'
+        # wherever str is not a missing-aware dtype (pandas < 3)
+        parts = values.astype(object).where(values.notna()).str.split(sep)
+        # explode() turns a missing row into a single NaN entry
+        per_row = parts.str.len().fillna(1).to_numpy(dtype=np.int64)
+        tokens = parts.explode().str.strip().to_numpy(dtype=object)
+        rows = np.repeat(np.arange(n_rows), per_row)
+
+        keep = pd.notna(tokens) & (tokens != '')
+        codes, labels = pd.factorize(tokens[keep])
+        offsets = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=n_rows), out=offsets[1:])
+        return cls(pd.Index(labels, dtype=str, name=values.name),
+                   codes.astype(np.int32), offsets, name=values.name)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def row_lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def nunique(self) -> int:
+        return len(self.labels)
+
+    def counts(self, sort: bool = True) -> pd.Series:
+        """Occurrences of every value, largest first (like exploded ``value_counts``).
+
+        With ``sort=False`` values stay in order of first appearance.
+        """
+        counts = np.bincount(self.codes, minlength=len(self.labels))
+        series = pd.Series(counts, index=self.labels, name='count')
+        if not sort:
+            return series
+        return series.sort_values(ascending=False, kind='stable')
+
+    def first(self) -> pd.Series:
+        """First listed value of every row (NaN for rows without values)."""
+        has_value = self.row_lengths() > 0
+        first = np.full(len(self), np.nan, dtype=object)
+        first_codes = self.codes[self.offsets[:-1][has_value]]
+        first[has_value] = self.labels.to_numpy(dtype=object)[first_codes]
+        return pd.Series(first, name=self.name)
+
+    def explode(self) -> pd.Series:
+        """One entry per (row, value) pair, indexed by row position."""
+        rows = np.repeat(np.arange(len(self)), self.row_lengths())
+        return pd.Series(self.labels.take(self.codes), index=rows, name=self.name)
+
+    def slice(self, start: int, stop: int) -> 'MultiValueIndex':
+        """Index of rows ``start:stop``, sharing ``labels`` with this one.
+
+        Values that only occur outside the slice keep their label and count 0.
+        """
+        lo, hi = self.offsets[start], self.offsets[stop]
+        return MultiValueIndex(self.labels, self.codes[lo:hi],
+                               self.offsets[start:stop + 1] - lo, name=self.name)
+
+    def row_values(self, row: int) -> list:
+        return list(self.labels.take(self.codes[self.offsets[row]:self.offsets[row + 1]]))
+
+
+def build_multivalue_indexes(df: pd.DataFrame,
+                             columns: Iterable[str] = MULTI_VALUED_COLUMNS
+                             ) -> Dict[str, MultiValueIndex]:
+    """Index every comma-separated column present in ``df``."""
+    return {name: MultiValueIndex.from_series(df[name]) for name in columns if name in df}
@@ -0,0 +1,83 @@
+"""Map-reduce evaluation of a run plan over row partitions in a process pool.
+
+:func:`parallel_plan` splits the catalog into contiguous row ranges, has
+each worker process derive and scan its range into an
+:class:`~netflix_analysis.aggregate.AggregateState` (value counts,
+crosstab cells, the counts behind Q12's means, exploded director counts
+and any sketches of an approximate plan) and merges the states in row
+order, so ties come out in the same order as in a single scan and the
+results equal :func:`~netflix_analysis.runner.run_plan`'s.
+
+The dataset and multi-value indexes are opened from the memory-mapped
+column store once before the pool starts, so workers share the mapped
+pages instead of each parsing the CSV, and only the small per-partition
+states travel back to the parent.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from . import derive, profiling
+from .aggregate import AggregateState
+from .loader import find_dataset_path, load_dataset, load_multivalue_index
+from .runner import RunPlan
+
+
+def partition_bounds(n_rows: int, partitions: int) -> List[Tuple[int, int]]:
+    """``partitions`` contiguous ``(start, stop)`` row ranges of near-equal size."""
+    partitions = max(1, min(partitions, n_rows))
+    edges = [n_rows * i // partitions for i in range(partitions + 1)]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def scan_partition(plan: RunPlan, path: Union[str, Path], use_cache: bool,
+                   start: int, stop: int) -> AggregateState:
+    """Derive and scan rows ``start:stop`` of the dataset according to ``plan``."""
+    with profiling.stage('aggregate', 'partition'):
+        df = load_dataset(path, use_cache, columns=plan.columns).iloc[start:stop].copy(deep=False)
+        indexes = {name: load_multivalue_index(name, path, use_cache).slice(start, stop)
+                   for name in plan.multivalue}
+        derive.add_derived_columns(df, plan.derived, indexes.__getitem__)
+        return AggregateState.scan(df, plan.aggregates, indexes)
+
+
+def parallel_plan(plan: RunPlan, path: Optional[Union[str, Path]] = None,
+                  workers: Optional[int] = None, partitions: Optional[int] = None,
+                  use_cache: bool = True) -> Dict[str, object]:
+    """Evaluate ``plan`` over row partitions in ``workers`` processes.
+
+    ``workers`` defaults to one per CPU and ``partitions`` to ``workers``;
+    ``workers=1`` scans the partitions in this process.
+    """
+    profiling.annotate('plan', plan.describe())
+    source = str(find_dataset_path(path))
+    # Build or open the shared caches once, before any worker needs them
+    n_rows = len(load_dataset(source, use_cache, columns=plan.columns))
+    for name in plan.multivalue:
+        load_multivalue_index(name, source, use_cache)
+    if n_rows == 0:
+        raise ValueError('the dataset has no rows to aggregate')
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    bounds = partition_bounds(n_rows, partitions or workers)
+    profiling.annotate('partitions', {'workers': workers, 'bounds': bounds})
+    with profiling.stage('aggregate', 'partitions'):
+        if workers <= 1 or len(bounds) <= 1:
+            states = [scan_partition(plan, source, use_cache, start, stop)
+                      for start, stop in bounds]
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+                futures = [pool.submit(scan_partition, plan, source, use_cache, start, stop)
+                           for start, stop in bounds]
+                states = [future.result() for future in futures]
+
+    with profiling.stage('aggregate', 'merge'):
+        state = states[0]
+        for other in states[1:]:
+            state = state.merge(other)
+    return state.evaluate()
@@ -0,0 +1,25 @@
+"""Compute-only switch for the question scripts.
+
+Importing matplotlib and seaborn costs more than loading the cached dataset
+and answering a question, so the scripts import them only inside an
+``if plots_enabled():`` block.  Passing ``--no-plots`` to a script, or
+setting ``NETFLIX_NO_PLOTS=1``, prints the tables without ever importing a
+plotting library (e.g. for cron jobs).
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import Optional, Sequence
+
+NO_PLOTS_FLAG = '--no-plots'
+NO_PLOTS_ENV = 'NETFLIX_NO_PLOTS'
+
+
+def plots_enabled(argv: Optional[Sequence[str]] = None) -> bool:
+    """False when charts were turned off on the command line or in the environment."""
+    argv = sys.argv[1:] if argv is None else argv
+    if NO_PLOTS_FLAG in argv:
+        return False
+    return os.environ.get(NO_PLOTS_ENV, '') in ('', '0')
@@ -0,0 +1,165 @@
+"""Stage timers, optional cProfile capture and a JSON run report.
+
+The loader, derived columns, aggregation engine and chart code wrap their
+work in :func:`stage` blocks (``load``, ``derive``, ``aggregate``,
+``render``).  They cost nothing until a :class:`RunProfiler` is started;
+then every block records its wall and CPU time, keyed by stage, name and
+question, and nested blocks remember their parent so totals are not
+counted twice.  With ``cprofile=True`` the whole run is also captured by
+:mod:`cProfile` and the report lists the hottest functions.
+
+``q1.py --profile-report run.json`` turns this on for the combined script.
+Any other script can be profiled unchanged by setting
+``NETFLIX_PROFILE=run.json`` (and ``NETFLIX_PROFILE_CPROFILE=1``); the
+report is then written when the interpreter exits.
+"""
+
+from __future__ import annotations
+
+import atexit
+import cProfile
+import contextlib
+import io
+import json
+import os
+import pstats
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+_ACTIVE: Optional['RunProfiler'] = None
+
+Key = Tuple[str, str, Optional[int], Optional[str]]
+
+
+class RunProfiler:
+    """Collects stage timings (and optionally a cProfile) for one run."""
+
+    def __init__(self, cprofile: bool = False, top: int = 25):
+        self.started = datetime.now(timezone.utc)
+        self.top = top
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._stages: Dict[Key, Dict[str, float]] = {}
+        self._stack: List[str] = []
+        self._annotations: Dict[str, object] = {}
+        self._finished: Optional[Tuple[float, float]] = None
+        self.profile = cProfile.Profile() if cprofile else None
+        if self.profile is not None:
+            self.profile.enable()
+
+    @contextlib.contextmanager
+    def stage(self, stage: str, name: str = '', question: Optional[int] = None) -> Iterator[None]:
+        label = f'{stage}:{name}' if name else stage
+        parent = self._stack[-1] if self._stack else None
+        self._stack.append(label)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            entry = self._stages.setdefault((stage, name, question, parent),
+                                            {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0})
+            entry['calls'] += 1
+            entry['wall_s'] += time.perf_counter() - wall
+            entry['cpu_s'] += time.process_time() - cpu
+
+    def annotate(self, key: str, value: object) -> None:
+        """Attach JSON-serializable context (e.g. the run plan) to the report."""
+        self._annotations[key] = value
+
+    def finish(self) -> None:
+        if self._finished is None:
+            if self.profile is not None:
+                self.profile.disable()
+            self._finished = (time.perf_counter() - self._wall, time.process_time() - self._cpu)
+
+    def hot_functions(self) -> List[Dict[str, object]]:
+        if self.profile is None:
+            return []
+        stats = pstats.Stats(self.profile, stream=io.StringIO())
+        rows = []
+        for (filename, line, function), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({'function': function, 'file': filename, 'line': line,
+                         'calls': calls, 'own_s': own, 'cumulative_s': cumulative})
+        rows.sort(key=lambda row: row['cumulative_s'], reverse=True)
+        return rows[:self.top]
+
+    def report(self) -> Dict[str, object]:
+        self.finish()
+        stages = [dict(stage=stage, name=name, question=question, parent=parent, **times)
+                  for (stage, name, question, parent), times in self._stages.items()]
+        totals: Dict[str, Dict[str, float]] = {}
+        for row in stages:
+            if row['parent'] is None:
+                total = totals.setdefault(row['stage'], {'wall_s': 0.0, 'cpu_s': 0.0})
+                total['wall_s'] += row['wall_s']
+                total['cpu_s'] += row['cpu_s']
+        report = {
+            'created': self.started.isoformat(timespec='seconds'),
+            'argv': sys.argv,
+            'wall_s': self._finished[0],
+            'cpu_s': self._finished[1],
+            'totals': totals,
+            'stages': sorted(stages, key=lambda row: row['wall_s'], reverse=True),
+        }
+        report.update(self._annotations)
+        if self.profile is not None:
+            report['hot_functions'] = self.hot_functions()
+        return report
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Write :meth:`report` as JSON (and the raw profile next to it as ``.prof``)."""
+        path = Path(path)
+        path.write_text(json.dumps(self.report(), indent=2, default=str) + '\n', encoding='utf-8')
+        if self.profile is not None:
+            self.profile.dump_stats(str(path.with_suffix('.prof')))
+
+
+def start(cprofile: bool = False) -> RunProfiler:
+    """Start collecting timings for this process."""
+    global _ACTIVE
+    _ACTIVE = RunProfiler(cprofile=cprofile)
+    return _ACTIVE
+
+
+def stop() -> Optional[RunProfiler]:
+    """Stop collecting and return the profiler (``None`` if none was running)."""
+    global _ACTIVE
+    profiler, _ACTIVE = _ACTIVE, None
+    if profiler is not None:
+        profiler.finish()
+    return profiler
+
+
+def active() -> Optional[RunProfiler]:
+    return _ACTIVE
+
+
+def stage(stage: str, name: str = '', question: Optional[int] = None):
+    """Time the enclosed block if profiling is on; otherwise do nothing."""
+    if _ACTIVE is None:
+        return contextlib.nullcontext()
+    return _ACTIVE.stage(stage, name, question)
+
+
+def annotate(key: str, value: object) -> None:
+    if _ACTIVE is not None:
+        _ACTIVE.annotate(key, value)
+
+
+def enable_from_env() -> None:
+    """Profile the whole process if ``NETFLIX_PROFILE`` names a report file."""
+    path = os.environ.get('NETFLIX_PROFILE')
+    if not path or _ACTIVE is not None:
+        return
+    profiler = start(cprofile=os.environ.get('NETFLIX_PROFILE_CPROFILE', '') not in ('', '0'))
+
+    def write_report():
+        if _ACTIVE is profiler:
+            stop()
+        profiler.write(path)
+
+    atexit.register(write_report)
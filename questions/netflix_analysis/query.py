@@ -0,0 +1,217 @@
+"""Ad-hoc filter / group-by / count queries over the cached dataset.
+
+A :class:`Query` names filters such as ``type=Movie``, ``countries=India``
+or ``year_added>=2019`` and the columns to group by.  :func:`run_query`
+loads only the columns involved from the memory-mapped column store,
+derives ``year_added``, ``primary_country`` and friends through
+:mod:`netflix_analysis.derive`, and counts the matching titles with the
+aggregation engine's :class:`~netflix_analysis.aggregate.Count`.
+
+Queries over the columns of the count cube (``type``, ``rating``,
+``primary_country``, ``release_year`` and the ``date_added`` months and
+years, see :mod:`netflix_analysis.cube`) are answered from its
+pre-aggregated cells without loading any rows.
+
+Comma-separated columns (``countries``, ``directors``, ``cast``,
+``listed_in``) are answered from their multi-value index: filtering on one
+keeps titles listing any of the values, and grouping by one counts a title
+once under each value it lists.  From ``questions/``::
+
+    python -m netflix_analysis query --filter type=Movie --filter countries=India \\
+        --filter rating=TV-MA --group-by year_added
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import derive
+from .aggregate import TABLE_COLUMNS, Count, Total, base_dimensions, run_aggregates
+from .cube import CUBE_DIMENSIONS, load_cube
+from .loader import CSV_DTYPES, PARSED_COLUMNS, load_dataset, load_multivalue_index
+from .multivalue import MULTI_VALUED_COLUMNS, MultiValueIndex
+
+MISSING = '(missing)'
+
+_FILTER = re.compile(r'^\s*([A-Za-z_]+)\s*(!=|>=|<=|=|>|<)\s*(.*?)\s*$')
+
+
+@dataclass(frozen=True)
+class Filter:
+    """``column op value``; ``=``/``!=`` accept several comma-separated values."""
+
+    column: str
+    op: str
+    values: Tuple[str, ...]
+
+    @classmethod
+    def parse(cls, text: str) -> 'Filter':
+        match = _FILTER.match(text)
+        if match is None:
+            raise ValueError(f'cannot parse filter {text!r}; expected e.g. type=Movie '
+                             f'or release_year>=2015')
+        column, op, value = match.groups()
+        if op in ('=', '!='):
+            values = tuple(v.strip() for v in value.split(',') if v.strip())
+        else:
+            values = (value,)
+        if not values:
+            raise ValueError(f'filter {text!r} has no value')
+        return cls(column, op, values)
+
+
+@dataclass(frozen=True)
+class Query:
+    filters: Tuple[Filter, ...] = ()
+    group_by: Tuple[str, ...] = ()
+    top: Optional[int] = None
+    sort: str = 'count'
+    dropna: bool = True
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        names = [f.column for f in self.filters] + list(self.group_by)
+        return tuple(dict.fromkeys(names))
+
+
+def queryable_columns() -> List[str]:
+    """Every column a query may filter or group by."""
+    names = list(CSV_DTYPES) + list(PARSED_COLUMNS) + list(derive.DERIVED_COLUMNS)
+    return list(dict.fromkeys(names))
+
+
+def _check_columns(query: Query) -> None:
+    known = set(queryable_columns())
+    unknown = [c for c in query.columns if c not in known]
+    if unknown:
+        raise ValueError(f'unknown column(s) {unknown}; choose from {", ".join(queryable_columns())}')
+    multi = [c for c in query.group_by if c in MULTI_VALUED_COLUMNS]
+    if len(multi) > 1:
+        raise ValueError(f'can group by at most one comma-separated column, got {multi}')
+    if query.sort not in ('count', 'index'):
+        raise ValueError(f"sort must be 'count' or 'index', not {query.sort!r}")
+
+
+def _coerce(dtype, value: str):
+    """Convert a filter value from the command line to ``dtype``."""
+    if isinstance(dtype, pd.PeriodDtype):
+        return pd.Period(value, freq=dtype.freq)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.Timestamp(value)
+    if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+        return float(value)
+    return value
+
+
+def _condition(df: pd.DataFrame, flt: Filter):
+    """The aggregation engine's ``(column, op, value)`` form of ``flt``."""
+    # Table columns (year_added, ...) are computed as float64 after grouping
+    dtype = np.dtype('float64') if flt.column in TABLE_COLUMNS else df[flt.column].dtype
+    values = [_coerce(dtype, v) for v in flt.values]
+    if len(values) > 1:
+        return (flt.column, 'in' if flt.op == '=' else 'not in', values)
+    return (flt.column, '==' if flt.op == '=' else flt.op, values[0])
+
+
+def _multivalue_mask(index: MultiValueIndex, flt: Filter) -> np.ndarray:
+    if flt.op not in ('=', '!='):
+        raise ValueError(f'{flt.column} only supports = and != filters')
+    wanted = np.flatnonzero(index.labels.isin(flt.values))
+    rows = np.repeat(np.arange(len(index)), index.row_lengths())
+    mask = np.zeros(len(index), dtype=bool)
+    mask[rows[np.isin(index.codes, wanted)]] = True
+    return ~mask if flt.op == '!=' else mask
+
+
+def run_query(query: Query, path: Optional[Union[str, Path]] = None,
+              use_cache: bool = True) -> Union[int, pd.Series]:
+    """Number of matching titles, or their counts per ``group_by`` value."""
+    _check_columns(query)
+    if use_cache and query.dropna and set(base_dimensions(query.columns)) <= set(CUBE_DIMENSIONS):
+        partial = load_cube(path).partial()
+        where = tuple(_condition(partial.groups, f) for f in query.filters)
+        result = _aggregate(query, where).evaluate(partial)
+        return _integral_index(result) if query.group_by else result
+
+    multi = [c for c in query.columns if c in MULTI_VALUED_COLUMNS]
+    # year_added and friends are computed by the engine from month_added
+    scalar = base_dimensions(c for c in query.columns if c not in MULTI_VALUED_COLUMNS)
+
+    def index_lookup(column: str) -> MultiValueIndex:
+        return load_multivalue_index(column, path, use_cache)
+
+    df = load_dataset(path, use_cache, columns=derive.source_columns(scalar)).copy(deep=False)
+    derive.add_derived_columns(df, scalar, index_lookup)
+
+    mask = np.ones(len(df), dtype=bool)
+    for flt in query.filters:
+        if flt.column in MULTI_VALUED_COLUMNS:
+            mask &= _multivalue_mask(index_lookup(flt.column), flt)
+    df = df[mask]
+
+    exploded = [c for c in query.group_by if c in MULTI_VALUED_COLUMNS]
+    if exploded:
+        # One row per (title, listed value)
+        index = index_lookup(exploded[0])
+        values = index.explode()
+        if not query.dropna:
+            # Titles listing no value at all count once as missing
+            empty = np.flatnonzero(index.row_lengths() == 0)
+            values = pd.concat([values, pd.Series(np.nan, index=empty, name=values.name)])
+            values = values.sort_index(kind='stable')
+        values = values[np.isin(values.index, df.index)]
+        df = df.loc[values.index].assign(**{exploded[0]: values.to_numpy()})
+
+    where = tuple(_condition(df, f) for f in query.filters if f.column not in multi)
+    if not query.group_by:
+        return run_aggregates(df, [_aggregate(query, where)])['result']
+
+    result = _integral_index(run_aggregates(df, [_aggregate(query, where)])['result'])
+    return result if query.dropna else _label_missing(result)
+
+
+def _aggregate(query: Query, where):
+    if not query.group_by:
+        return Total('result', where=where)
+    return Count('result', by=tuple(query.group_by), where=where, sort=query.sort, top=query.top,
+                 dropna=query.dropna)
+
+
+def _label_missing(result: pd.Series) -> pd.Series:
+    """Show missing group keys as ``MISSING``."""
+    index = result.index
+    levels = [index.get_level_values(i) for i in range(index.nlevels)]
+    levels = [level.astype(object).fillna(MISSING).rename(level.name) for level in levels]
+    if isinstance(index, pd.MultiIndex):
+        return result.set_axis(pd.MultiIndex.from_arrays(levels))
+    return result.set_axis(levels[0])
+
+
+def _integral_index(result: pd.Series) -> pd.Series:
+    """Show whole-number float keys (e.g. ``year_added``) as integers."""
+    index = result.index
+    levels = index.levels if isinstance(index, pd.MultiIndex) else [index]
+    if not any(pd.api.types.is_float_dtype(level.dtype) for level in levels):
+        return result
+
+    def as_int(level: pd.Index) -> pd.Index:
+        if pd.api.types.is_float_dtype(level.dtype) and np.all(np.mod(level.dropna(), 1) == 0):
+            return level.astype('Int64')
+        return level
+
+    if isinstance(index, pd.MultiIndex):
+        return result.set_axis(index.set_levels([as_int(level) for level in index.levels]))
+    return result.set_axis(as_int(index))
+
+
+def parse_query(filters: Sequence[str] = (), group_by: Optional[str] = None,
+                top: Optional[int] = None, sort: str = 'count', dropna: bool = True) -> Query:
+    """Build a :class:`Query` from command-line style strings."""
+    columns = tuple(c.strip() for c in (group_by or '').split(',') if c.strip())
+    return Query(tuple(Filter.parse(f) for f in filters), columns, top, sort, dropna)
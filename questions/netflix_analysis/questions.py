@@ -0,0 +1,118 @@
+"""Registry of the 15 questions and the summary block.
+
+Each :class:`Question` declares the aggregates it reports (evaluated by
+:mod:`netflix_analysis.aggregate` in a single scan) and the derived columns
+those aggregates group by (resolved by :mod:`netflix_analysis.derive`).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+from .aggregate import (
+    Count,
+    Crosstab,
+    Describe,
+    DistinctValues,
+    Extent,
+    Mean,
+    TopValues,
+    Total,
+    Unique,
+)
+
+MOVIE = (('type', '==', 'Movie'),)
+TV_SHOW = (('type', '==', 'TV Show'),)
+
+SUMMARY = 0
+
+
+@dataclass(frozen=True)
+class Question:
+    number: int
+    title: str
+    aggregates: Tuple
+    requires: Tuple[str, ...] = ()
+
+
+QUESTIONS: Dict[int, Question] = {q.number: q for q in (
+    Question(1, 'Content Type Distribution',
+             (Count('type_counts', by=('type',)),)),
+    Question(2, 'Top Countries by Content',
+             (Count('country_counts', by=('primary_country',), top=10),),
+             requires=('primary_country',)),
+    Question(3, 'Content Rating Distribution',
+             (Count('rating_counts', by=('rating',)),)),
+    Question(4, 'Content Release Year Trend',
+             (Count('year_counts', by=('release_year',), sort='index'),)),
+    Question(5, 'Content Type vs Rating Heatmap',
+             (Crosstab('pivot_table', index='type', column='rating'),)),
+    Question(6, 'Movie Duration Distribution',
+             (Describe('duration_stats', 'duration_min', where=MOVIE),
+              Count('duration_distribution', by=('duration_min',), where=MOVIE, sort='index'))),
+    Question(7, 'TV Show Seasons Distribution',
+             (Count('season_counts', by=('num_seasons',), where=TV_SHOW, sort='index'),)),
+    Question(8, 'Content Added to Netflix Over Time',
+             (Count('monthly_additions', by=('month_added',), sort='index'),),
+             requires=('month_added',)),
+    Question(9, 'Movies vs TV Shows Over Release Years',
+             (Crosstab('year_type', index='release_year', column='type'),)),
+    Question(10, 'Top 10 Directors by Content Count',
+             (TopValues('director_counts', 'directors', top=10),)),
+    Question(11, 'Content Added by Year',
+             (Count('yearly_additions', by=('year_added',), sort='index'),),
+             requires=('month_added',)),
+    Question(12, 'Average Movie Duration by Rating',
+             (Mean('avg_duration_by_rating', 'duration_min', by=('rating',), where=MOVIE,
+                   ascending=False),)),
+    Question(13, 'Content Addition by Month',
+             (Count('monthly_pattern', by=('month_number',), sort='index'),),
+             requires=('month_added',)),
+    Question(14, 'Release Year vs Addition Date Gap',
+             (Describe('year_gap_stats', 'year_gap', where=(('year_gap', '>=', 0),)),
+              Count('year_gap_points', by=('release_year', 'year_gap', 'type'),
+                    where=(('year_gap', '>=', 0),), sort='index')),
+             requires=('month_added',)),
+    Question(15, 'Top 5 Countries - Content Type Breakdown',
+             (Crosstab('country_type_pivot', index='primary_country', column='type', top=5),),
+             requires=('primary_country',)),
+)}
+
+SUMMARY_QUESTION = Question(
+    SUMMARY, 'Summary Statistics',
+    (
+        Total('total'),
+        Total('movies', where=MOVIE),
+        Total('tv_shows', where=TV_SHOW),
+        Unique('unique_countries', 'primary_country'),
+        Unique('unique_ratings', 'rating'),
+        DistinctValues('unique_directors', 'directors'),
+        DistinctValues('unique_cast', 'cast'),
+        DistinctValues('unique_genres', 'listed_in'),
+        Extent('year_range', 'release_year'),
+        Mean('avg_movie_duration', 'duration_min', where=MOVIE),
+        Mean('avg_tv_seasons', 'num_seasons', where=TV_SHOW),
+    ),
+    requires=('primary_country',),
+)
+
+# Aggregates by question number, kept for callers that only need those.
+QUESTION_AGGREGATES: Dict[int, Tuple] = {n: q.aggregates for n, q in QUESTIONS.items()}
+SUMMARY_AGGREGATES: Tuple = SUMMARY_QUESTION.aggregates
+
+
+def get_question(number: int) -> Question:
+    if number == SUMMARY:
+        return SUMMARY_QUESTION
+    try:
+        return QUESTIONS[number]
+    except KeyError:
+        raise ValueError(f'unknown question {number}; expected 1-{max(QUESTIONS)}') from None
+
+
+def all_aggregates(numbers: Optional[Iterable[int]] = None, summary: bool = True) -> Tuple:
+    """Aggregates of ``numbers`` (all questions by default), then the summary's."""
+    numbers = sorted(QUESTIONS) if numbers is None else sorted(set(numbers))
+    aggregates = tuple(a for n in numbers for a in get_question(n).aggregates)
+    return aggregates + (SUMMARY_AGGREGATES if summary else ())
@@ -0,0 +1,213 @@
+"""On-disk memoization of each question's aggregate results.
+
+:func:`run_plan_cached` answers a :class:`~netflix_analysis.runner.RunPlan`
+question by question from pickles under ``.netflix_cache/<stem>.results/``
+and only loads and scans the dataset for the questions it has no entry for.
+An entry is keyed by
+
+* the SHA-256 of the CSV (read from the column store's metadata when the
+  store is current, so an unchanged file is not hashed again),
+* the question's definition (its aggregates and derived columns), and
+* a digest of the modules that compute results, plus :data:`RESULTS_VERSION`
+  and the pandas version,
+
+so editing the data, a question or the aggregation code misses the cache
+rather than serving stale numbers.  The directory is kept under
+``NETFLIX_RESULT_CACHE_MB`` megabytes (default 64) by deleting the least
+recently used entries after each write.
+
+:func:`dataset_overview` keeps the text of ``q1.py``'s dataset overview the
+same way, so a run whose results are all cached never builds the frame.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from . import profiling
+from .cache import CACHE_VERSION, cache_dir_for, dataset_sha256
+from .loader import find_dataset_path, load_dataset
+from .questions import SUMMARY, Question
+from .runner import RunPlan, plan_run, run_plan
+
+# Bump when the meaning of a cached result changes in a way the module
+# digest below cannot see.
+RESULTS_VERSION = 1
+
+DEFAULT_MAX_MB = 64
+
+# Modules whose code determines the numbers a question reports
+_RESULT_MODULES = ('aggregate', 'cache', 'colstore', 'cube', 'dates', 'derive', 'durations',
+                   'loader', 'multivalue', 'questions', 'runner', 'sketches')
+
+_CODE_DIGEST: Optional[str] = None
+
+
+@dataclass
+class CacheInfo:
+    """Which questions came from the cache and which had to be computed."""
+
+    hits: List[int] = field(default_factory=list)
+    misses: List[int] = field(default_factory=list)
+
+
+def code_digest() -> str:
+    """Digest of the result-producing modules, :data:`RESULTS_VERSION` and pandas."""
+    global _CODE_DIGEST
+    if _CODE_DIGEST is None:
+        digest = hashlib.sha256(repr((RESULTS_VERSION, CACHE_VERSION,
+                                      pd.__version__)).encode('utf-8'))
+        package = Path(__file__).resolve().parent
+        for name in _RESULT_MODULES:
+            digest.update((package / f'{name}.py').read_bytes())
+        _CODE_DIGEST = digest.hexdigest()
+    return _CODE_DIGEST
+
+
+def question_key(question: Question, dataset_digest: str) -> str:
+    text = repr((code_digest(), question.number, question.aggregates, question.requires))
+    return f'{dataset_digest[:16]}-q{question.number:02d}-' \
+           f'{hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]}'
+
+
+def results_dir_for(source: Path) -> Path:
+    return cache_dir_for(source) / f'{source.stem}.results'
+
+
+def max_cache_bytes() -> int:
+    try:
+        megabytes = float(os.environ.get('NETFLIX_RESULT_CACHE_MB', DEFAULT_MAX_MB))
+    except ValueError:
+        megabytes = DEFAULT_MAX_MB
+    return int(megabytes * (1 << 20))
+
+
+def _load_entry(path: Path) -> Optional[Dict[str, object]]:
+    try:
+        with open(path, 'rb') as fh:
+            results = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    if not isinstance(results, dict):
+        return None
+    try:
+        os.utime(path)  # mark as recently used
+    except OSError:
+        pass
+    return results
+
+
+def _save_entry(path: Path, results: Dict[str, object]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with open(staging, 'wb') as fh:
+            pickle.dump(results, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(staging, path)
+    finally:
+        if staging.exists():
+            staging.unlink()
+
+
+def evict(directory: Path, max_bytes: int) -> List[Path]:
+    """Delete least recently used entries until ``directory`` fits in ``max_bytes``."""
+    entries: List[Tuple[float, int, Path]] = []
+    for path in directory.glob('*.pkl'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    removed = []
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed.append(path)
+    return removed
+
+
+def run_plan_cached(plan: RunPlan, path: Optional[Union[str, Path]] = None,
+                    use_cache: bool = True) -> Tuple[Dict[str, object], CacheInfo]:
+    """:func:`~netflix_analysis.runner.run_plan`, reusing saved per-question results.
+
+    Returns ``(results, info)``.  Questions without a saved entry are run
+    together in one plan and saved; a cache directory that cannot be
+    written (read-only checkout) only costs the speed-up.
+    """
+    source = find_dataset_path(path)
+    directory = results_dir_for(source)
+    with profiling.stage('load', 'result_cache'):
+        digest = dataset_sha256(source)
+        cached: Dict[int, Dict[str, object]] = {}
+        for question in plan.selected():
+            entry = _load_entry(directory / f'{question_key(question, digest)}.pkl')
+            if entry is not None:
+                cached[question.number] = entry
+
+    info = CacheInfo()
+    missing = [q for q in plan.selected() if q.number not in cached]
+    if missing:
+        numbers = [q.number for q in missing if q.number != SUMMARY]
+        computed = run_plan(plan_run(numbers, summary=len(numbers) < len(missing),
+                                     approximation=plan.approximation), source, use_cache)
+        try:
+            for question in missing:
+                _save_entry(directory / f'{question_key(question, digest)}.pkl',
+                            {a.name: computed[a.name] for a in question.aggregates})
+            evict(directory, max_cache_bytes())
+        except OSError:
+            pass
+        cached.update({q.number: {a.name: computed[a.name] for a in q.aggregates}
+                       for q in missing})
+
+    results: Dict[str, object] = {}
+    for question in plan.selected():
+        (info.misses if question in missing else info.hits).append(question.number)
+        results.update(cached[question.number])
+    profiling.annotate('result_cache', {'hits': info.hits, 'misses': info.misses})
+    return results, info
+
+
+def format_overview(df: pd.DataFrame) -> str:
+    """The dataset overview ``q1.py`` prints: shape, first rows and ``info()``."""
+    info = io.StringIO()
+    df.info(buf=info)
+    return (f'Dataset Shape: {df.shape}\n\nFirst few rows:\n{df.head()}\n\n'
+            f'Dataset Info:\n{info.getvalue()}None\n')
+
+
+def dataset_overview(path: Optional[Union[str, Path]] = None, use_cache: bool = True) -> str:
+    """:func:`format_overview` of the dataset, reusing the saved text.
+
+    Saved under the same key scheme as the question results, so the full
+    frame is only loaded when the data or the loader changed.
+    """
+    source = find_dataset_path(path)
+    with profiling.stage('load', 'result_cache'):
+        entry_path = results_dir_for(source) / \
+            f'{dataset_sha256(source)[:16]}-overview-{code_digest()[:16]}.pkl'
+        entry = _load_entry(entry_path)
+    if entry is not None and isinstance(entry.get('text'), str):
+        return entry['text']
+    text = format_overview(load_dataset(source, use_cache))
+    try:
+        _save_entry(entry_path, {'text': text})
+        evict(entry_path.parent, max_cache_bytes())
+    except OSError:
+        pass
+    return text
@@ -0,0 +1,279 @@
+"""Run a subset of the questions, deriving each shared column exactly once.
+
+:func:`plan_run` turns the requested question numbers into the dataset
+columns to load, the derived columns to compute (in dependency order) and
+the multi-value indexes to open; :func:`run_questions` executes that plan
+and evaluates every requested aggregate in one scan.  Asking for Q8, Q11
+and Q14 therefore loads only ``date_added``, ``release_year`` and ``type``
+and derives ``month_added`` once for all three.
+
+:func:`stream_plan` executes the same plan over CSV chunks instead, merging
+mergeable partial aggregates chunk by chunk, for files too large to load.
+
+A plan made with an :class:`~netflix_analysis.sketches.Approximation`
+answers the aggregates that have a sketch-backed variant (see
+:func:`~netflix_analysis.aggregate.approximate`) from mergeable summaries,
+so the state of a streamed run stays the same size however many distinct
+directors or cast members the catalog holds.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import derive, profiling
+from .aggregate import (
+    AggregateState,
+    Count,
+    Crosstab,
+    PartialAggregates,
+    approximate,
+    build_sketches,
+    evaluate_aggregates,
+    required_dimensions,
+    required_multivalue,
+    required_sketches,
+)
+from .cube import CUBE_DIMENSIONS, load_cube
+from .loader import DEFAULT_CHUNKSIZE, iter_dataset_chunks, load_dataset, load_multivalue_index
+from .multivalue import MULTI_VALUED_COLUMNS, MultiValueIndex
+from .questions import QUESTIONS, SUMMARY, Question, get_question
+from .sketches import Approximation, HeavyHitters
+
+
+@dataclass(frozen=True)
+class RunPlan:
+    questions: Tuple[int, ...]
+    aggregates: Tuple
+    dimensions: Tuple[str, ...]
+    derived: Tuple[str, ...]
+    columns: Tuple[str, ...]
+    multivalue: Tuple[str, ...]
+    summary: bool = False
+    approximation: Optional[Approximation] = None
+
+    def selected(self) -> List[Question]:
+        """The planned questions, followed by the summary block if requested."""
+        numbers = list(self.questions) + ([SUMMARY] if self.summary else [])
+        return [_approximated(get_question(n), self.approximation) for n in numbers]
+
+    def describe(self) -> Dict[str, object]:
+        """JSON-friendly outline of the plan, used in profiling reports."""
+        return {
+            'questions': list(self.questions),
+            'summary': self.summary,
+            'columns': list(self.columns),
+            'derived': list(self.derived),
+            'multivalue': list(self.multivalue),
+            'approximation': None if self.approximation is None else vars(self.approximation),
+            'requires': {q.number: list(q.requires) for q in self.selected()},
+        }
+
+
+def parse_question_list(text: str) -> List[int]:
+    """Parse ``"8,11,14"`` (ranges such as ``"1-5"`` allowed) into question numbers."""
+    numbers: List[int] = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, stop = (int(p) for p in part.split('-', 1))
+            numbers.extend(range(start, stop + 1))
+        else:
+            numbers.append(int(part))
+    for number in numbers:
+        get_question(number)
+    return sorted(set(numbers))
+
+
+def _approximated(question: Question, approximation: Optional[Approximation]) -> Question:
+    if approximation is None:
+        return question
+    return replace(question, aggregates=tuple(approximate(a, approximation)
+                                              for a in question.aggregates))
+
+
+def plan_run(numbers: Optional[Iterable[int]] = None, summary: bool = True,
+             approximation: Optional[Approximation] = None) -> RunPlan:
+    """Work out what to load and derive for ``numbers`` (all questions by default).
+
+    With ``approximation``, aggregates that have a sketch-backed variant
+    are replaced by it.
+    """
+    numbers = tuple(sorted(QUESTIONS) if numbers is None else sorted(set(numbers)))
+    selected = [_approximated(get_question(n), approximation) for n in numbers]
+    if summary:
+        selected.append(_approximated(get_question(SUMMARY), approximation))
+
+    aggregates = tuple(a for q in selected for a in q.aggregates)
+    dimensions = required_dimensions(aggregates)
+    for question in selected:
+        used = required_dimensions(question.aggregates)
+        undeclared = [d for d in used
+                      if d in derive.DERIVED_COLUMNS and d not in question.requires]
+        if undeclared:
+            raise ValueError(f'question {question.number} groups by {undeclared} '
+                             f'without declaring them in requires')
+
+    requires = [c for q in selected for c in q.requires]
+    derived = derive.resolve(requires)
+    specs = required_sketches(aggregates)
+    columns = derive.source_columns(dimensions + requires
+                                    + [c for spec in specs for c in spec.columns])
+    multivalue = required_multivalue(aggregates)
+    sketched = [c for spec in specs for c in spec.multivalue]
+    for name in sketched + derive.multivalue_inputs(requires):
+        if name not in multivalue:
+            multivalue.append(name)
+    return RunPlan(numbers, aggregates, tuple(dimensions), tuple(derived),
+                   tuple(columns), tuple(multivalue), summary, approximation)
+
+
+def scan_plan(plan: RunPlan, path: Optional[Union[str, Path]] = None,
+              use_cache: bool = True) -> PartialAggregates:
+    """Load and derive according to ``plan`` and group the rows once."""
+    def index_lookup(column: str):
+        return load_multivalue_index(column, path, use_cache)
+
+    df = load_dataset(path, use_cache, columns=plan.columns).copy(deep=False)
+    derive.add_derived_columns(df, plan.derived, index_lookup)
+    counted = {name: index_lookup(name) for name in required_multivalue(plan.aggregates)}
+    sketches = build_sketches(required_sketches(plan.aggregates), df, index_lookup)
+    return PartialAggregates.scan(df, plan.dimensions, counted, sketches)
+
+
+def from_cube(question: Question) -> bool:
+    """Whether every aggregate of ``question`` is a count the cube can answer."""
+    return (all(isinstance(a, (Count, Crosstab)) and getattr(a, 'dropna', True)
+                for a in question.aggregates)
+            and set(required_dimensions(question.aggregates)) <= set(CUBE_DIMENSIONS))
+
+
+def run_plan(plan: RunPlan, path: Optional[Union[str, Path]] = None,
+             use_cache: bool = True) -> Dict[str, object]:
+    """Load, derive and aggregate according to ``plan``.
+
+    With ``use_cache``, questions that only count titles by the cube's
+    dimensions (see :func:`from_cube`) are answered from the saved count
+    cube and only the rest are scanned, so e.g. Q3 and Q5 load no rows.
+    """
+    profiling.annotate('plan', plan.describe())
+    selected = plan.selected()
+    cubed = [q.number for q in selected if use_cache and from_cube(q)]
+    rest = [q.number for q in selected if q.number not in cubed]
+    partials: Dict[int, PartialAggregates] = {}
+    if cubed:
+        cube = load_cube(path).partial()
+        partials.update(dict.fromkeys(cubed, cube))
+    if rest:
+        scanned = scan_plan(plan if not cubed else
+                            plan_run([n for n in rest if n != SUMMARY], summary=SUMMARY in rest,
+                                     approximation=plan.approximation), path, use_cache)
+        partials.update(dict.fromkeys(rest, scanned))
+    profiling.annotate('from_cube', cubed)
+
+    results: Dict[str, object] = {}
+    for question in selected:
+        with profiling.stage('aggregate', 'evaluate', question=question.number):
+            results.update(evaluate_aggregates(question.aggregates, partials[question.number]))
+    return results
+
+
+def stream_columns(plan: RunPlan) -> List[str]:
+    """Dataset columns to read when the multi-value indexes are built per chunk."""
+    return list(plan.columns) + [c for c in plan.multivalue if c not in plan.columns]
+
+
+def accumulate(plan: RunPlan, chunks: Iterable[pd.DataFrame],
+               state: Optional[AggregateState] = None) -> Optional[AggregateState]:
+    """Fold ``chunks`` (read with :func:`stream_columns`) into ``state``."""
+    for chunk in chunks:
+        indexes = {name: MultiValueIndex.from_series(chunk[name]) for name in plan.multivalue}
+        derive.add_derived_columns(chunk, plan.derived, indexes.__getitem__)
+        partial = AggregateState.scan(chunk, plan.aggregates, indexes)
+        state = partial if state is None else state.merge(partial)
+    return state
+
+
+def stream_plan(plan: RunPlan, path: Optional[Union[str, Path]] = None,
+                chunksize: int = DEFAULT_CHUNKSIZE) -> Dict[str, object]:
+    """Evaluate ``plan`` reading the CSV ``chunksize`` rows at a time.
+
+    Each chunk is derived and scanned on its own and folded into an
+    :class:`~netflix_analysis.aggregate.AggregateState`, which holds one
+    small grouped table per dimension set; memory therefore depends on the
+    chunk size and the number of distinct values, not on the file size.
+    The results equal :func:`run_plan`'s.
+    """
+    profiling.annotate('plan', plan.describe())
+    state = accumulate(plan, iter_dataset_chunks(path, stream_columns(plan), chunksize))
+    if state is None:
+        raise ValueError('the dataset has no rows to stream')
+    return state.evaluate()
+
+
+def stream_heavy_hitters(column: str, path: Optional[Union[str, Path]] = None,
+                         approximation: Approximation = Approximation(),
+                         chunksize: int = DEFAULT_CHUNKSIZE) -> HeavyHitters:
+    """Most frequent values of a comma-separated column, read chunk by chunk.
+
+    Only ``approximation.capacity`` counters outlive a chunk, so memory is
+    bounded by the chunk size and the error setting, not by the number of
+    distinct values (e.g. every cast member of a large history).
+    """
+    if column not in MULTI_VALUED_COLUMNS:
+        raise ValueError(f'{column!r} is not a comma-separated column; '
+                         f'choose from {", ".join(MULTI_VALUED_COLUMNS)}')
+    sketch = HeavyHitters(approximation.capacity)
+    for chunk in iter_dataset_chunks(path, [column], chunksize):
+        counts = MultiValueIndex.from_series(chunk[column]).counts(sort=False)
+        sketch = sketch.merge(HeavyHitters.from_counts(counts, approximation.capacity))
+    return sketch
+
+
+def to_jsonable(value: object) -> object:
+    """Convert an aggregate result to plain JSON types.
+
+    Series become ``{"name", "index", "data"}`` and frames
+    ``{"index", "columns", "data"}`` (pandas' ``split`` layout); periods
+    are written as strings and missing values as ``null``.
+    """
+    if isinstance(value, pd.DataFrame):
+        return {'index': [to_jsonable(v) for v in value.index],
+                'columns': [to_jsonable(v) for v in value.columns],
+                'data': [[to_jsonable(v) for v in row]
+                         for row in value.itertuples(index=False, name=None)]}
+    if isinstance(value, pd.Series):
+        return {'name': to_jsonable(value.name),
+                'index': [to_jsonable(v) for v in value.index],
+                'data': [to_jsonable(v) for v in value]}
+    if isinstance(value, (tuple, list)):
+        return [to_jsonable(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+def run_questions(numbers: Optional[Iterable[int]] = None, summary: bool = True,
+                  path: Optional[Union[str, Path]] = None,
+                  use_cache: bool = True,
+                  chunksize: Optional[int] = None,
+                  approximation: Optional[Approximation] = None) -> Dict[str, object]:
+    """Results of the requested questions' aggregates, keyed by aggregate name.
+
+    With ``chunksize`` the CSV is streamed (see :func:`stream_plan`).
+    """
+    plan = plan_run(numbers, summary, approximation)
+    if chunksize is not None:
+        return stream_plan(plan, path, chunksize)
+    return run_plan(plan, path, use_cache)
@@ -0,0 +1,270 @@
+"""Local HTTP service answering the questions and ad-hoc queries as JSON.
+
+:class:`AggregateService` keeps the catalog loaded: the first request
+groups every question's rows once (:func:`~netflix_analysis.runner.scan_plan`)
+and later requests only evaluate aggregates on that small table.  Encoded
+responses are kept in an :class:`LRUCache` keyed on the request parameters
+and the dataset version (the CSV's size and modification time), so a
+repeated request is answered without touching pandas, and editing the CSV
+makes every older entry unreachable.  From ``questions/``::
+
+    python -m netflix_analysis serve --port 8765
+
+Endpoints (all ``GET``, all JSON):
+
+``/questions``
+    number, title and aggregate names of every question (0 is the summary).
+``/questions/<n>[?top=N]``
+    the aggregates of question ``n``, e.g. ``/questions/2?top=20`` for the
+    top 20 countries; ``top`` applies to aggregates that have one.
+``/query?filter=type=Movie&filter=countries=India&group_by=rating&top=5``
+    an ad-hoc count (see :mod:`netflix_analysis.query`); ``sort`` and
+    ``keep_missing`` are accepted too.
+``/additions?start=2019-01-01&end=2019-12-31&by=rating``
+    titles added in a date range (inclusive; either end may be omitted)
+    from the prefix sums in :mod:`netflix_analysis.timeindex`; ``by``
+    defaults to ``type``, ``by=none`` counts all titles.
+``/health``
+    dataset version and cache statistics.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import threading
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Hashable, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from . import profiling
+from .aggregate import PartialAggregates, evaluate_aggregates
+from .loader import find_dataset_path
+from .query import parse_query, run_query
+from .questions import QUESTIONS, SUMMARY, get_question
+from .runner import plan_run, scan_plan, to_jsonable
+from .timeindex import load_addition_index
+
+DEFAULT_PORT = 8765
+DEFAULT_CACHE_SIZE = 1024
+
+
+class LRUCache:
+    """Thread-safe mapping that forgets the least recently used entry when full."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        if maxsize < 1:
+            raise ValueError('cache size must be at least 1')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: bytes) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'maxsize': self.maxsize,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+def _with_top(aggregate, top: Optional[int]):
+    if top is None or 'top' not in {f.name for f in dataclasses.fields(aggregate)}:
+        return aggregate
+    return dataclasses.replace(aggregate, top=top)
+
+
+def _encode(payload: object) -> bytes:
+    return json.dumps(payload).encode('utf-8')
+
+
+class AggregateService:
+    """Answers question and query requests for one dataset, caching the responses."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, use_cache: bool = True,
+                 cache_size: int = DEFAULT_CACHE_SIZE):
+        self.path = find_dataset_path(path)
+        self.use_cache = use_cache
+        self.cache = LRUCache(cache_size)
+        self._plan = plan_run(summary=True)
+        self._partial: Optional[Tuple[str, PartialAggregates]] = None
+        self._lock = threading.Lock()
+
+    def dataset_version(self) -> str:
+        stat = self.path.stat()
+        return f'{stat.st_size}-{stat.st_mtime_ns}'
+
+    def _scan(self, version: str) -> PartialAggregates:
+        if self._partial is None or self._partial[0] != version:
+            with profiling.stage('service', 'scan'):
+                self._partial = (version, scan_plan(self._plan, self.path, self.use_cache))
+        return self._partial[1]
+
+    def _cached(self, key: Tuple, compute) -> bytes:
+        version = self.dataset_version()
+        key = (version,) + key
+        body = self.cache.get(key)
+        if body is None:
+            # One computation at a time: misses share the scanned table
+            with self._lock:
+                body = self.cache.get(key)
+                if body is None:
+                    body = _encode(dict(compute(version), dataset_version=version))
+                    self.cache.put(key, body)
+        return body
+
+    def questions(self) -> bytes:
+        numbers = sorted(QUESTIONS) + [SUMMARY]
+        return _encode({'questions': [
+            {'number': n, 'title': get_question(n).title,
+             'aggregates': [a.name for a in get_question(n).aggregates]} for n in numbers]})
+
+    def question(self, number: int, top: Optional[int] = None) -> bytes:
+        question = get_question(number)
+        if top is not None and top < 1:
+            raise ValueError('top must be a positive integer')
+
+        def compute(version):
+            aggregates = [_with_top(a, top) for a in question.aggregates]
+            results = evaluate_aggregates(aggregates, self._scan(version))
+            return {'question': number, 'title': question.title,
+                    'results': {name: to_jsonable(value) for name, value in results.items()}}
+
+        return self._cached(('question', number, top), compute)
+
+    def query(self, filters: Sequence[str] = (), group_by: Optional[str] = None,
+              top: Optional[int] = None, sort: str = 'count', dropna: bool = True) -> bytes:
+        query = parse_query(filters, group_by, top, sort, dropna)
+
+        def compute(version):
+            return {'result': to_jsonable(run_query(query, self.path, self.use_cache))}
+
+        return self._cached(('query', query), compute)
+
+    def additions(self, start: Optional[str] = None, end: Optional[str] = None,
+                  by: Optional[str] = 'type') -> bytes:
+        def compute(version):
+            index = load_addition_index(by, self.path, self.use_cache)
+            return {'result': to_jsonable(index.count(start, end))}
+
+        return self._cached(('additions', start, end, by), compute)
+
+    def health(self) -> bytes:
+        return _encode({'dataset': str(self.path), 'dataset_version': self.dataset_version(),
+                        'cache': self.cache.stats()})
+
+
+def _single(params: Mapping[str, Sequence[str]], name: str) -> Optional[str]:
+    values = params.get(name)
+    return values[-1] if values else None
+
+
+def _int_param(params: Mapping[str, Sequence[str]], name: str) -> Optional[int]:
+    value = _single(params, name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f'{name} must be an integer, not {value!r}') from None
+
+
+def make_handler(service: AggregateService, log_requests: bool = False):
+    """Request handler class bound to ``service``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body go out in separate writes; don't let Nagle hold the body
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = parse_qs(url.query)
+            parts = [p for p in url.path.split('/') if p]
+            try:
+                if parts == ['questions']:
+                    body = service.questions()
+                elif len(parts) == 2 and parts[0] == 'questions':
+                    try:
+                        number = int(parts[1])
+                    except ValueError:
+                        raise ValueError(f'unknown question {parts[1]!r}') from None
+                    body = service.question(number, _int_param(params, 'top'))
+                elif parts == ['query']:
+                    body = service.query(params.get('filter', []), _single(params, 'group_by'),
+                                         _int_param(params, 'top'),
+                                         _single(params, 'sort') or 'count',
+                                         _single(params, 'keep_missing') in (None, '', '0'))
+                elif parts == ['additions']:
+                    by = _single(params, 'by') or 'type'
+                    body = service.additions(_single(params, 'start'), _single(params, 'end'),
+                                             None if by == 'none' else by)
+                elif parts == ['health']:
+                    body = service.health()
+                else:
+                    self._send(404, _encode({'error': f'no such endpoint {url.path!r}'}))
+                    return
+            except ValueError as exc:
+                self._send(400, _encode({'error': str(exc)}))
+                return
+            except Exception as exc:
+                # Answer rather than drop the connection
+                traceback.print_exc()
+                self._send(500, _encode({'error': f'{type(exc).__name__}: {exc}'}))
+                return
+            self._send(200, body)
+
+        def _send(self, status: int, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if log_requests:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def make_server(service: AggregateService, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                log_requests: bool = False) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(service, log_requests))
+    server.daemon_threads = True
+    return server
+
+
+def serve(path: Optional[Union[str, Path]] = None, host: str = '127.0.0.1',
+          port: int = DEFAULT_PORT, cache_size: int = DEFAULT_CACHE_SIZE,
+          use_cache: bool = True, log_requests: bool = False) -> None:
+    """Load the dataset, then serve requests until interrupted."""
+    service = AggregateService(path, use_cache, cache_size)
+    service.question(SUMMARY)  # load and scan before the first request
+    server = make_server(service, host, port, log_requests)
+    print(f'Serving {service.path.name} on http://{host}:{server.server_port}/', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,316 @@
+"""Mergeable summaries for approximate aggregates in bounded memory.
+
+Every summary here can be built from one chunk or partition of the rows and
+combined with ``merge``, in any order, into the summary of all of them, so
+streaming and partitioned runs keep a fixed amount of state however many
+distinct values the history holds.
+
+:class:`HeavyHitters`
+    the most frequent values of a column with at most ``capacity``
+    counters; every count is underestimated by at most
+    ``total / (capacity + 1)``.
+:class:`HyperLogLog`
+    the number of distinct values of a column in ``2 ** precision`` one-byte
+    registers, with a relative standard error of about
+    ``1.04 / sqrt(2 ** precision)``; exact while it has seen only a few
+    values.
+:class:`KLL`
+    the distribution of a numeric column in about ``3 * k`` retained
+    values, answering quantiles to within about ``2 / k`` in rank, plus
+    the exact count, mean, standard deviation, minimum and maximum.
+
+:class:`Approximation` collects the error settings of an approximate run
+(``q1.py --approximate``).
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_EPSILON = 0.001
+DEFAULT_PRECISION = 14
+DEFAULT_QUANTILE_K = 200
+
+
+@dataclass(frozen=True)
+class Approximation:
+    """Error settings of the sketches that replace exact aggregates.
+
+    ``epsilon`` bounds the error of heavy-hitter counts as a fraction of
+    the number of values counted, ``precision`` sets the number of
+    HyperLogLog registers for distinct counts and ``quantile_k`` the size
+    of the KLL sketches behind describe-style statistics.
+    """
+
+    epsilon: float = DEFAULT_EPSILON
+    precision: int = DEFAULT_PRECISION
+    quantile_k: int = DEFAULT_QUANTILE_K
+
+    def __post_init__(self):
+        capacity_for(self.epsilon)
+        check_precision(self.precision)
+        if self.quantile_k < 8:
+            raise ValueError('quantile_k must be at least 8')
+
+    @property
+    def capacity(self) -> int:
+        return capacity_for(self.epsilon)
+
+
+def capacity_for(epsilon: float) -> int:
+    """Counters needed for an error of at most ``epsilon`` times the total."""
+    if not 0 < epsilon < 1:
+        raise ValueError('epsilon must be between 0 and 1')
+    return math.ceil(1 / epsilon)
+
+
+def check_precision(precision: int) -> int:
+    if not 4 <= precision <= 18:
+        raise ValueError('precision must be between 4 and 18')
+    return precision
+
+
+class HeavyHitters:
+    """Misra-Gries summary of the most frequent values, mergeable.
+
+    ``counts`` holds at most ``capacity`` values, in order of first
+    appearance, with a lower bound on how often each occurred; the true
+    count is at most ``error`` higher, and a value that is not tracked
+    occurred at most ``error`` times.  Two summaries merge as in Agarwal et
+    al., "Mergeable Summaries" (2012): add the counters, then subtract the
+    ``capacity + 1``-th largest from all of them and keep the positive ones,
+    which keeps ``error <= total / (capacity + 1)``.
+    """
+
+    def __init__(self, capacity: int, counts: Optional[pd.Series] = None,
+                 error: int = 0, total: int = 0):
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self.counts = counts if counts is not None else pd.Series(dtype='int64', name='count')
+        self.error = error
+        self.total = total
+
+    @classmethod
+    def from_counts(cls, counts: pd.Series, capacity: int) -> 'HeavyHitters':
+        """Summary of exact ``counts`` (e.g. one chunk's value counts)."""
+        counts = counts[counts > 0].astype('int64').rename('count')
+        return cls(capacity, total=int(counts.sum()))._shrink(counts, 0)
+
+    def _shrink(self, counts: pd.Series, error: int) -> 'HeavyHitters':
+        if len(counts) > self.capacity:
+            values = counts.to_numpy()
+            cut = int(np.partition(values, len(values) - self.capacity - 1)
+                      [len(values) - self.capacity - 1])
+            counts = (counts - cut)[values > cut]
+            error += cut
+        self.counts, self.error = counts.astype('int64'), error
+        return self
+
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        """Summary of the rows behind ``self`` and ``other`` together."""
+        labels = self.counts.index.append(
+            other.counts.index[~other.counts.index.isin(self.counts.index)])
+        counts = (self.counts.reindex(labels, fill_value=0)
+                  + other.counts.reindex(labels, fill_value=0)).rename('count')
+        merged = HeavyHitters(min(self.capacity, other.capacity), total=self.total + other.total)
+        return merged._shrink(counts, self.error + other.error)
+
+    def top(self, n: Optional[int] = None) -> pd.Series:
+        """Estimated counts of the ``n`` most frequent values, largest first."""
+        ordered = self.counts.sort_values(ascending=False, kind='stable')
+        return ordered if n is None else ordered.head(n)
+
+    def bounds(self, n: Optional[int] = None) -> pd.DataFrame:
+        """Lower and upper bounds on the counts of the ``n`` most frequent values."""
+        lower = self.top(n)
+        return pd.DataFrame({'lower': lower, 'upper': lower + self.error})
+
+
+def hash_values(values) -> np.ndarray:
+    """64-bit hashes of ``values`` that are the same in every process."""
+    return pd.util.hash_array(np.asarray(values, dtype=object), categorize=False)
+
+
+class HyperLogLog:
+    """Mergeable distinct count (Flajolet et al., 2007).
+
+    Until it has seen more than ``2 ** precision / 8`` distinct values
+    (as many bytes as the registers take) the summary keeps their sorted
+    hashes in ``hashes`` and counts exactly, so small columns such as
+    ``rating`` are never estimated.  Past that it keeps one register per
+    bucket of the hash space holding the longest run of leading zero bits
+    seen there, and merging is an element-wise maximum.
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION,
+                 hashes: Optional[np.ndarray] = None, registers: Optional[np.ndarray] = None):
+        self.precision = check_precision(precision)
+        if registers is None and hashes is None:
+            hashes = np.empty(0, dtype=np.uint64)
+        self.hashes = hashes
+        self.registers = registers
+
+    @property
+    def exact(self) -> bool:
+        return self.registers is None
+
+    @property
+    def _exact_limit(self) -> int:
+        return (1 << self.precision) // 8
+
+    @classmethod
+    def from_values(cls, values, precision: int = DEFAULT_PRECISION) -> 'HyperLogLog':
+        """Summary of the distinct non-missing ``values``."""
+        values = pd.Series(values, dtype=object).dropna().unique()
+        return cls(precision)._add(np.unique(hash_values(values)))
+
+    def _add(self, hashes: np.ndarray) -> 'HyperLogLog':
+        if self.exact:
+            hashes = np.union1d(self.hashes, hashes)
+            if len(hashes) <= self._exact_limit:
+                self.hashes = hashes
+                return self
+            self.hashes, self.registers = None, np.zeros(1 << self.precision, dtype=np.uint8)
+        self._update(hashes)
+        return self
+
+    def _update(self, hashes: np.ndarray) -> None:
+        # The low bits pick the register, the rest give the run of zeros
+        p = self.precision
+        buckets = (hashes & np.uint64((1 << p) - 1)).astype(np.intp)
+        rest = hashes >> np.uint64(p)
+        # Bit length of rest; float64 may round up to the next power of two
+        _, length = np.frexp(rest.astype(np.float64))
+        length = length.astype(np.int64)
+        over = (length > 0) & ((rest >> np.maximum(length - 1, 0).astype(np.uint64)) == 0)
+        length -= over
+        ranks = (64 - p - length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, buckets, ranks)
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Summary of the values seen by ``self`` or ``other``."""
+        if self.precision != other.precision:
+            raise ValueError('cannot merge HyperLogLogs of different precision')
+        merged = HyperLogLog(self.precision, self.hashes, self.registers)
+        if not merged.exact:
+            merged.registers = merged.registers.copy()
+        if other.exact:
+            return merged._add(other.hashes)
+        if merged.exact:
+            return HyperLogLog(self.precision, registers=other.registers.copy())._add(self.hashes)
+        np.maximum(merged.registers, other.registers, out=merged.registers)
+        return merged
+
+    def count(self) -> int:
+        """Number of distinct values (estimated once past the exact limit)."""
+        if self.exact:
+            return len(self.hashes)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+class KLL:
+    """Mergeable quantile sketch (Karnin, Lang and Liberty, 2016).
+
+    ``levels[h]`` holds values that each stand for ``2 ** h`` of the
+    values seen.  A level that outgrows its capacity (``k`` at the top,
+    shrinking by a factor 2/3 per level below it, at least 2) is sorted and
+    every other value is promoted to the level above, starting at the first
+    or the second as a hash of the level picks, so the choice is
+    deterministic but unbiased on average, also across merged partitions.
+    Count, mean, variance (Chan et al.'s pairwise update), minimum and
+    maximum are tracked exactly beside the levels.
+    """
+
+    def __init__(self, k: int = DEFAULT_QUANTILE_K):
+        if k < 8:
+            raise ValueError('k must be at least 8')
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    @classmethod
+    def from_values(cls, values, k: int = DEFAULT_QUANTILE_K) -> 'KLL':
+        """Summary of the non-missing ``values``."""
+        values = pd.Series(values).dropna().to_numpy(dtype=np.float64)
+        sketch = cls(k)
+        if len(values):
+            sketch.count, sketch.mean = len(values), float(values.mean())
+            sketch.m2 = float(((values - sketch.mean) ** 2).sum())
+            sketch.min, sketch.max = float(values.min()), float(values.max())
+            sketch.levels[0] = values
+            sketch._compress()
+        return sketch
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - 1 - level
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) <= self._capacity(level):
+                level += 1
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            items = np.sort(items)
+            # An odd value out stays behind so the total weight is unchanged
+            kept, items = items[len(items) - len(items) % 2:], items[:len(items) - len(items) % 2]
+            # Derive the half to promote from the values themselves: a fixed
+            # alternation makes the sketches of every partition lean the same way
+            offset = int(pd.util.hash_array(np.array([items.sum(), len(items), level],
+                                                     dtype=np.float64))[0] & 1)
+            self.levels[level] = kept
+            self.levels[level + 1] = np.concatenate([self.levels[level + 1], items[offset::2]])
+            # Capacities below shrink when a level is added; start over
+            level = 0
+
+    def merge(self, other: 'KLL') -> 'KLL':
+        """Summary of the values seen by ``self`` or ``other``."""
+        merged = KLL(min(self.k, other.k))
+        depth = max(len(self.levels), len(other.levels))
+        merged.levels = [np.concatenate([s.levels[h] for s in (self, other) if h < len(s.levels)])
+                         for h in range(depth)]
+        merged.count = self.count + other.count
+        if merged.count:
+            delta = other.mean - self.mean
+            merged.mean = self.mean + delta * other.count / merged.count
+            merged.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / merged.count
+        merged.min = float(np.fmin(self.min, other.min))
+        merged.max = float(np.fmax(self.max, other.max))
+        merged._compress()
+        return merged
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    def items(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Retained values in increasing order and the number each stands for."""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 1 << h, dtype=np.int64)
+                                  for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], weights[order]
+
+    def distribution(self) -> pd.Series:
+        """Estimated number of values equal to each retained value, by value."""
+        values, weights = self.items()
+        return pd.Series(weights, index=values).groupby(level=0).sum().rename('count')
@@ -0,0 +1,211 @@
+"""Prefix sums of daily additions for constant-time date-range counts.
+
+:func:`build_addition_index` counts the titles added on every day between
+the first and last ``date_added``, per value of a grouping column
+(``type`` by default, or e.g. ``rating`` or ``primary_country``), and keeps
+the running totals.  The number of titles added between any two dates is
+then the difference of two rows of :attr:`AdditionIndex.cumulative`, and a
+rolling window over every day is one vectorized subtraction, instead of a
+groupby over the rows per window.
+
+:func:`load_addition_index` keeps one index per grouping column in
+``.netflix_cache/<stem>.additions/`` keyed by the dataset's SHA-256, and in
+memory for the rest of the process.  From ``questions/``::
+
+    python -m netflix_analysis additions --start 2019-01-01 --end 2019-12-31 --by rating
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from . import derive, profiling
+from .cache import cache_dir_for, dataset_sha256
+from .loader import (
+    CSV_DTYPES,
+    PARSED_COLUMNS,
+    find_dataset_path,
+    load_dataset,
+    load_multivalue_index,
+)
+from .multivalue import MULTI_VALUED_COLUMNS
+
+# Bump when the saved layout or the counting rules change.
+INDEX_VERSION = 2
+
+MISSING_GROUP = '(missing)'
+ALL_TITLES = 'all'
+
+DateLike = Union[str, pd.Timestamp, np.datetime64]
+
+_LOADED: Dict[Tuple[str, int, int, Optional[str]], 'AdditionIndex'] = {}
+
+
+@dataclass
+class AdditionIndex:
+    """Running totals of titles added per day and group.
+
+    ``cumulative[i, g]`` is the number of titles of group ``groups[g]``
+    added before day ``first_day + i``, so it has one row more than there
+    are days and ``cumulative[0]`` is all zeros.  Titles without a
+    ``date_added`` are not counted.
+    """
+
+    first_day: np.datetime64
+    groups: pd.Index
+    cumulative: np.ndarray
+    by: Optional[str] = None
+
+    @property
+    def days(self) -> pd.DatetimeIndex:
+        return pd.date_range(pd.Timestamp(self.first_day), periods=len(self.cumulative) - 1,
+                             freq='D', name='date_added')
+
+    def _position(self, date: Optional[DateLike], default: int) -> int:
+        """Row of ``cumulative`` at the start of ``date``, clipped to the index."""
+        if date is None:
+            return default
+        offset = (np.datetime64(pd.Timestamp(date).normalize(), 'D') - self.first_day).astype(int)
+        return int(np.clip(offset, 0, len(self.cumulative) - 1))
+
+    def _label(self, row: np.ndarray, group: Optional[str]):
+        if group is not None:
+            try:
+                return int(row[self.groups.get_loc(group)])
+            except KeyError:
+                raise ValueError(f'unknown {self.by} {group!r}') from None
+        if self.by is None:
+            return int(row[0])
+        return pd.Series(row, index=self.groups, name='count')
+
+    def count(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+              group: Optional[str] = None):
+        """Titles added from ``start`` to ``end`` inclusive (open-ended when ``None``).
+
+        Returns an ``int`` for one ``group`` (or an ungrouped index) and a
+        Series per group otherwise.
+        """
+        lo = self._position(start, 0)
+        hi = self._position(None if end is None else pd.Timestamp(end) + pd.Timedelta(days=1),
+                            len(self.cumulative) - 1)
+        row = self.cumulative[hi] - self.cumulative[min(lo, hi)]
+        return self._label(row, group)
+
+    def daily(self) -> pd.DataFrame:
+        """Titles added on each day, one column per group."""
+        return pd.DataFrame(np.diff(self.cumulative, axis=0), index=self.days,
+                            columns=self.groups)
+
+    def rolling(self, days: int) -> pd.DataFrame:
+        """Titles added in the ``days`` days ending on each day (inclusive)."""
+        if days < 1:
+            raise ValueError('the window must be at least one day')
+        ends = np.arange(1, len(self.cumulative))
+        starts = np.maximum(ends - days, 0)
+        return pd.DataFrame(self.cumulative[ends] - self.cumulative[starts], index=self.days,
+                            columns=self.groups)
+
+    def save(self, path: Path, digest: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_name(f'{path.stem}.{os.getpid()}.tmp.npz')
+        try:
+            # The labels keep their dtype (release years stay integers)
+            groups = np.frombuffer(pickle.dumps(self.groups, protocol=pickle.HIGHEST_PROTOCOL),
+                                   dtype=np.uint8)
+            np.savez(staging, version=INDEX_VERSION, digest=digest, by=self.by or '',
+                     first_day=self.first_day, groups=groups, cumulative=self.cumulative)
+            os.replace(staging, path)
+        finally:
+            if staging.exists():
+                staging.unlink()
+
+    @classmethod
+    def open(cls, path: Path, digest: str, by: Optional[str]) -> Optional['AdditionIndex']:
+        try:
+            with np.load(path) as saved:
+                if (int(saved['version']) != INDEX_VERSION or str(saved['digest']) != digest
+                        or str(saved['by']) != (by or '')):
+                    return None
+                groups = pickle.loads(saved['groups'].tobytes())
+                return cls(saved['first_day'][()], groups, saved['cumulative'], by)
+        except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError,
+                AttributeError, ImportError):
+            return None
+
+
+def build_addition_index(dates: pd.Series, groups: Optional[pd.Series] = None) -> AdditionIndex:
+    """Prefix sums of titles added per day, per value of ``groups`` if given."""
+    by = None if groups is None else groups.name
+    with profiling.stage('derive', 'addition_index'):
+        present = dates.notna().to_numpy()
+        days = dates.to_numpy(dtype='datetime64[D]')[present]
+        if groups is None:
+            labels, codes = pd.Index([ALL_TITLES]), np.zeros(len(days), dtype=np.intp)
+        else:
+            values = groups[present]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype(object)
+            if values.isna().any():
+                # Numeric columns cannot hold the placeholder label
+                values = values.astype(object).where(values.notna(), MISSING_GROUP)
+            codes, labels = pd.factorize(values, sort=True)
+            labels = pd.Index(labels, name=groups.name)
+        if len(days) == 0:
+            return AdditionIndex(np.datetime64('NaT', 'D'), labels,
+                                 np.zeros((1, len(labels)), dtype=np.int64), by)
+        first = days.min()
+        offsets = (days - first).astype(np.intp)
+        span = int(offsets.max()) + 1
+        daily = np.bincount(offsets * len(labels) + codes,
+                            minlength=span * len(labels)).reshape(span, len(labels))
+        cumulative = np.zeros((span + 1, len(labels)), dtype=np.int64)
+        np.cumsum(daily, axis=0, out=cumulative[1:])
+    return AdditionIndex(first, labels, cumulative, by)
+
+
+def addition_index_path(source: Path, by: Optional[str]) -> Path:
+    return cache_dir_for(source) / f'{source.stem}.additions' / f'{by or ALL_TITLES}.npz'
+
+
+def load_addition_index(by: Optional[str] = 'type', path: Optional[Union[str, Path]] = None,
+                        use_cache: bool = True) -> AdditionIndex:
+    """The addition index of the dataset grouped by ``by`` (``None``: all titles).
+
+    ``by`` may be any dataset or derived column, e.g. ``type``, ``rating``
+    or ``primary_country``.  The index is built on first use per dataset
+    version and reused from disk afterwards.
+    """
+    source = find_dataset_path(path)
+    known = set(CSV_DTYPES) | set(PARSED_COLUMNS) | set(derive.DERIVED_COLUMNS)
+    if by is not None and (by not in known or by in MULTI_VALUED_COLUMNS or by == 'date_added'):
+        raise ValueError(f'cannot group additions by {by!r}; use a single-valued column '
+                         f'such as type, rating or primary_country')
+    stat = source.stat()
+    key = (str(source), stat.st_size, stat.st_mtime_ns, by)
+    index = _LOADED.get(key)
+    if index is not None:
+        return index
+
+    digest = dataset_sha256(source)
+    index_path = addition_index_path(source, by)
+    index = AdditionIndex.open(index_path, digest, by) if use_cache else None
+    if index is None:
+        columns = ['date_added'] + ([] if by is None else [by])
+        df = load_dataset(source, use_cache, columns=derive.source_columns(columns)).copy(deep=False)
+        derive.add_derived_columns(df, columns,
+                                   lambda column: load_multivalue_index(column, source, use_cache))
+        index = build_addition_index(df['date_added'], None if by is None else df[by])
+        if use_cache:
+            try:
+                index.save(index_path, digest)
+            except OSError:
+                pass
+    _LOADED[key] = index
+    return index
@@ -1,22 +1,91 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime
-import numpy as np
+import argparse
+import json
+
+from netflix_analysis import load_dataset, plots_enabled, profiling
+from netflix_analysis.incremental import refresh_plan
+from netflix_analysis.loader import DEFAULT_CHUNKSIZE
+from netflix_analysis.parallel import parallel_plan
+from netflix_analysis.resultcache import dataset_overview, format_overview, run_plan_cached
+from netflix_analysis.runner import (
+    parse_question_list,
+    plan_run,
+    run_plan,
+    stream_plan,
+    to_jsonable,
+)
+from netflix_analysis.sketches import (
+    DEFAULT_EPSILON,
+    DEFAULT_PRECISION,
+    DEFAULT_QUANTILE_K,
+    Approximation,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Netflix dataset analysis: all 15 questions.')
+    parser.add_argument('--batch', action='store_true',
+                        help='save every chart to --output-dir with a non-interactive '
+                             'backend instead of showing it')
+    parser.add_argument('--output-dir', default='figures',
+                        help='directory for --batch charts (default: figures)')
+    parser.add_argument('--format', dest='formats', default='png',
+                        help='comma-separated image formats for --batch, e.g. png,svg')
+    parser.add_argument('--rerender', action='store_true',
+                        help='redraw every --batch chart, even those whose data, code and style '
+                             'match the file already saved in --output-dir')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='processes used to render --batch charts and, with --parallel, '
+                             'to aggregate (default: one per CPU)')
+    parser.add_argument('--parallel', action='store_true',
+                        help='aggregate row partitions of the catalog in --workers processes '
+                             'and merge their partial results')
+    parser.add_argument('--partitions', type=int, default=None,
+                        help='row partitions for --parallel (default: one per worker)')
+    parser.add_argument('--questions', type=parse_question_list, default=None,
+                        help='only run these questions, e.g. 8,11,14 or 1-5 '
+                             '(skips the dataset overview and summary)')
+    parser.add_argument('--stream', action='store_true',
+                        help='read the CSV in chunks with bounded memory instead of loading it '
+                             '(skips the dataset overview)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='keep the aggregates in .netflix_cache and only read rows appended '
+                             'since the last run (skips the dataset overview)')
+    parser.add_argument('--approximate', action='store_true',
+                        help='estimate the top directors (Q10) with a mergeable heavy-hitter '
+                             'sketch, the summary\'s distinct counts with HyperLogLogs and the '
+                             'duration and year-gap statistics (Q6, Q14) with KLL quantile '
+                             'sketches, so --stream/--incremental state stays the same size '
+                             'however large the history grows')
+    parser.add_argument('--epsilon', type=float, default=DEFAULT_EPSILON,
+                        help=f'with --approximate, the largest count error as a fraction of '
+                             f'the names counted (default: {DEFAULT_EPSILON})')
+    parser.add_argument('--precision', type=int, default=DEFAULT_PRECISION,
+                        help=f'with --approximate, log2 of the HyperLogLog registers; distinct '
+                             f'counts are exact up to 2**PRECISION/8 values and within about '
+                             f'1.04/sqrt(2**PRECISION) beyond (default: {DEFAULT_PRECISION})')
+    parser.add_argument('--quantile-k', type=int, default=DEFAULT_QUANTILE_K,
+                        help=f'with --approximate, size of the quantile sketches; quantiles are '
+                             f'within about 2/K in rank (default: {DEFAULT_QUANTILE_K})')
+    parser.add_argument('--no-result-cache', action='store_true',
+                        help='recompute every aggregate instead of reusing the results saved '
+                             'in .netflix_cache for an unchanged dataset')
+    parser.add_argument('--no-plots', action='store_true',
+                        help='compute and print the tables only; matplotlib and seaborn are '
+                             'never imported (also NETFLIX_NO_PLOTS=1)')
+    parser.add_argument('--json', action='store_true',
+                        help='print the aggregate results as one JSON document instead of '
+                             'the text report (implies --no-plots)')
+    parser.add_argument('--profile-report', metavar='PATH', default=None,
+                        help='write per-stage wall/CPU timings of this run as JSON to PATH')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='with --profile-report, also capture cProfile data (PATH.prof) '
+                             'and list the hottest functions in the report')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f'rows per chunk with --stream/--incremental '
+                             f'(default: {DEFAULT_CHUNKSIZE})')
+    return parser.parse_args(argv)
 
-# Set style for better-looking plots
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (12, 6)
 
-# Step 1: Load the Netflix dataset
-# Replace 'netflix_data.csv' with your actual file path
-df = pd.read_csv('netflix_titles.CLEANED.csv')
-
-print("Dataset Shape:", df.shape)
-print("\nFirst few rows:")
-print(df.head())
-print("\nDataset Info:")
-print(df.info())
 
 # ============================================
 # QUESTION 1: Content Type Distribution (Pie Chart)
@@ -30,21 +99,15 @@ print(df.info())
 # 3. Percentages help stakeholders understand resource allocation and content balance
 # 4. This metric influences content acquisition decisions and user interface design
 # 5. Investors and analysts use this to assess Netflix's content diversification strategy
-print("\n" + "="*50)
-print("QUESTION 1: Content Type Distribution")
-print("="*50)
+def question_1(results):
+    print("\n" + "="*50)
+    print("QUESTION 1: Content Type Distribution")
+    print("="*50)
 
-type_counts = df['type'].value_counts()
-print("\nContent Type Counts:")
-print(type_counts)
+    type_counts = results['type_counts']
+    print("\nContent Type Counts:")
+    print(type_counts)
 
-plt.figure(figsize=(8, 8))
-colors = ['#E50914', '#B20710']
-plt.pie(type_counts.values, labels=type_counts.index, autopct='%1.1f%%', 
-        colors=colors, startangle=90, textprops={'fontsize': 14, 'weight': 'bold'})
-plt.title('Netflix Content Type Distribution', fontsize=16, weight='bold', pad=20)
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 2: Top 10 Countries by Content (Horizontal Bar Chart)
@@ -60,25 +123,15 @@ plt.show()
 # 5. Content localization teams can use this to prioritize dubbing and subtitle efforts
 # 6. It shows cultural diversity and international expansion patterns
 # 7. Regional licensing and production partnerships can be evaluated based on this data
-print("\n" + "="*50)
-print("QUESTION 2: Top Countries by Content")
-print("="*50)
-
-# Extract first country from countries column (some have multiple countries)
-df['primary_country'] = df['countries'].str.split(',').str[0].str.strip()
+def question_2(results):
+    print("\n" + "="*50)
+    print("QUESTION 2: Top Countries by Content")
+    print("="*50)
 
-country_counts = df['primary_country'].value_counts().head(10)
-print("\nTop 10 Countries:")
-print(country_counts)
+    country_counts = results['country_counts']
+    print("\nTop 10 Countries:")
+    print(country_counts)
 
-plt.figure(figsize=(12, 6))
-country_counts.plot(kind='barh', color='#E50914')
-plt.title('Top 10 Countries by Netflix Content', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Number of Titles', fontsize=12, weight='bold')
-plt.ylabel('Country', fontsize=12, weight='bold')
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 3: Content Rating Distribution (Bar Chart)
@@ -95,22 +148,15 @@ plt.show()
 # 6. This helps in understanding target audience demographics
 # 7. Family-friendly vs mature content balance is a key business metric
 # 8. Different markets have different rating preferences, affecting regional strategies
-print("\n" + "="*50)
-print("QUESTION 3: Content Rating Distribution")
-print("="*50)
+def question_3(results):
+    print("\n" + "="*50)
+    print("QUESTION 3: Content Rating Distribution")
+    print("="*50)
 
-rating_counts = df['rating'].value_counts()
-print("\nRating Distribution:")
-print(rating_counts)
+    rating_counts = results['rating_counts']
+    print("\nRating Distribution:")
+    print(rating_counts)
 
-plt.figure(figsize=(12, 6))
-rating_counts.plot(kind='bar', color='#B20710')
-plt.title('Netflix Content Rating Distribution', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Rating', fontsize=12, weight='bold')
-plt.ylabel('Count', fontsize=12, weight='bold')
-plt.xticks(rotation=45, ha='right')
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 4: Release Year Trend (Line Chart)
@@ -127,23 +173,15 @@ plt.show()
 # 6. This helps identify the "golden age" of content production for the platform
 # 7. Investors use this to assess whether Netflix is acquiring recent vs archival content
 # 8. Marketing teams can highlight "new releases" vs "classic collection" campaigns
-print("\n" + "="*50)
-print("QUESTION 4: Content Release Year Trend")
-print("="*50)
+def question_4(results):
+    print("\n" + "="*50)
+    print("QUESTION 4: Content Release Year Trend")
+    print("="*50)
 
-year_counts = df['release_year'].value_counts().sort_index()
-print("\nContent by Release Year:")
-print(year_counts.tail(10))
+    year_counts = results['year_counts']
+    print("\nContent by Release Year:")
+    print(year_counts.tail(10))
 
-plt.figure(figsize=(14, 6))
-plt.plot(year_counts.index, year_counts.values, marker='o', 
-         color='#E50914', linewidth=2, markersize=6)
-plt.title('Netflix Content by Release Year', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Release Year', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles', fontsize=12, weight='bold')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 5: Heatmap - Content Type by Rating
@@ -160,23 +198,16 @@ plt.show()
 # 6. Annotation with exact counts provides precise data alongside visual patterns
 # 7. Marketing can tailor campaigns based on rating-type combinations
 # 8. This validates whether content guidelines differ between movies and series
-print("\n" + "="*50)
-print("QUESTION 5: Content Type vs Rating Heatmap")
-print("="*50)
+def question_5(results):
+    print("\n" + "="*50)
+    print("QUESTION 5: Content Type vs Rating Heatmap")
+    print("="*50)
 
-# Create pivot table
-pivot_table = pd.crosstab(df['type'], df['rating'])
-print("\nPivot Table:")
-print(pivot_table)
+    # Pivot table of type x rating
+    pivot_table = results['pivot_table']
+    print("\nPivot Table:")
+    print(pivot_table)
 
-plt.figure(figsize=(12, 6))
-sns.heatmap(pivot_table, annot=True, fmt='d', cmap='Reds', 
-            cbar_kws={'label': 'Count'}, linewidths=0.5)
-plt.title('Content Type vs Rating Heatmap', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Rating', fontsize=12, weight='bold')
-plt.ylabel('Content Type', fontsize=12, weight='bold')
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 6: Movie Duration Distribution (Histogram)
@@ -193,25 +224,15 @@ plt.show()
 # 6. Production teams can benchmark their content against industry standards
 # 7. This identifies outliers (very short or very long movies) that may need special handling
 # 8. User session time and engagement metrics correlate strongly with content duration
-print("\n" + "="*50)
-print("QUESTION 6: Movie Duration Distribution")
-print("="*50)
-
-# Extract numeric duration for movies (e.g., "90 min" -> 90)
-movies_df = df[df['type'] == 'Movie'].copy()
-movies_df['duration_min'] = movies_df['duration'].str.extract('(\d+)').astype(float)
+def question_6(results):
+    print("\n" + "="*50)
+    print("QUESTION 6: Movie Duration Distribution")
+    print("="*50)
 
-print("\nMovie Duration Statistics:")
-print(movies_df['duration_min'].describe())
+    # Numeric movie duration (e.g., "90 min" -> 90) was derived in Step 2
+    print("\nMovie Duration Statistics:")
+    print(results['duration_stats'])
 
-plt.figure(figsize=(12, 6))
-plt.hist(movies_df['duration_min'].dropna(), bins=20, color='#E50914', edgecolor='black')
-plt.title('Distribution of Movie Durations', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Duration (minutes)', fontsize=12, weight='bold')
-plt.ylabel('Frequency', fontsize=12, weight='bold')
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 7: TV Show Seasons Distribution (Bar Chart)
@@ -229,26 +250,16 @@ plt.show()
 # 7. Longer shows provide more "stickiness" - users invest more time in multi-season series
 # 8. Production costs scale with season count, affecting budget allocation
 # 9. Recommendation algorithms treat single vs multi-season shows differently
-print("\n" + "="*50)
-print("QUESTION 7: TV Show Seasons Distribution")
-print("="*50)
+def question_7(results):
+    print("\n" + "="*50)
+    print("QUESTION 7: TV Show Seasons Distribution")
+    print("="*50)
 
-# Extract number of seasons for TV shows
-tv_shows_df = df[df['type'] == 'TV Show'].copy()
-tv_shows_df['num_seasons'] = tv_shows_df['duration'].str.extract('(\d+)').astype(float)
+    # Number of seasons for TV shows was derived in Step 2
+    season_counts = results['season_counts']
+    print("\nSeasons Distribution:")
+    print(season_counts)
 
-season_counts = tv_shows_df['num_seasons'].value_counts().sort_index()
-print("\nSeasons Distribution:")
-print(season_counts)
-
-plt.figure(figsize=(10, 6))
-season_counts.plot(kind='bar', color='#B20710')
-plt.title('TV Show Seasons Distribution', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Number of Seasons', fontsize=12, weight='bold')
-plt.ylabel('Number of Shows', fontsize=12, weight='bold')
-plt.xticks(rotation=0)
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 8: Content Added Over Time (Line Chart)
@@ -267,29 +278,17 @@ plt.show()
 # 8. Monthly/yearly patterns reveal content licensing cycles and renewal schedules
 # 9. Declining trends might indicate market saturation or strategic pivots
 # 10. This validates whether Netflix is maintaining its promised content refresh rate
-print("\n" + "="*50)
-print("QUESTION 8: Content Added to Netflix Over Time")
-print("="*50)
-
-# Convert date_added to datetime
-df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-df['year_added'] = df['date_added'].dt.year
-df['month_added'] = df['date_added'].dt.to_period('M')
+def question_8(results):
+    print("\n" + "="*50)
+    print("QUESTION 8: Content Added to Netflix Over Time")
+    print("="*50)
 
-# Group by month
-monthly_additions = df.groupby('month_added').size().sort_index()
+    # Titles added per month (month_added derived from date_added in Step 2)
+    monthly_additions = results['monthly_additions']
 
-print("\nMonthly Content Additions:")
-print(monthly_additions.tail(10))
+    print("\nMonthly Content Additions:")
+    print(monthly_additions.tail(10))
 
-plt.figure(figsize=(14, 6))
-monthly_additions.plot(color='#E50914', linewidth=2)
-plt.title('Content Added to Netflix Over Time', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Date', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 9: Movies vs TV Shows by Year (Stacked Area Chart)
@@ -305,25 +304,16 @@ plt.show()
 # 5. Different decades had different production norms (more movies in 90s, more series recently)
 # 6. Investment allocation between movie rights and TV show licenses can be evaluated
 # 7. This shows how streaming has influenced content production patterns
-print("\n" + "="*50)
-print("QUESTION 9: Movies vs TV Shows Over Release Years")
-print("="*50)
-
-# Group by year and type
-year_type = df.groupby(['release_year', 'type']).size().unstack(fill_value=0)
-print("\nContent Type by Year:")
-print(year_type.tail(10))
-
-plt.figure(figsize=(14, 6))
-plt.stackplot(year_type.index, year_type['Movie'], year_type['TV Show'], 
-              labels=['Movie', 'TV Show'], colors=['#E50914', '#B20710'], alpha=0.8)
-plt.title('Movies vs TV Shows by Release Year (Stacked)', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Release Year', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles', fontsize=12, weight='bold')
-plt.legend(loc='upper left')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
+def question_9(results):
+    print("\n" + "="*50)
+    print("QUESTION 9: Movies vs TV Shows Over Release Years")
+    print("="*50)
+
+    # Titles per release year and type
+    year_type = results['year_type'].reindex(columns=['Movie', 'TV Show'], fill_value=0)
+    print("\nContent Type by Year:")
+    print(year_type.tail(10))
+
 
 # ============================================
 # QUESTION 10: Top 10 Directors by Content Count (Bar Chart)
@@ -340,25 +330,17 @@ plt.show()
 # 6. Understanding director portfolios helps in content curation and collections
 # 7. Fans of specific directors can be targeted with personalized recommendations
 # 8. This reveals Netflix's investment in auteur-driven vs commercial content
-print("\n" + "="*50)
-print("QUESTION 10: Top 10 Directors by Content Count")
-print("="*50)
+def question_10(results):
+    print("\n" + "="*50)
+    print("QUESTION 10: Top 10 Directors by Content Count")
+    print("="*50)
 
-# Clean and split directors (some entries have multiple directors)
-directors_list = df['directors'].dropna().str.split(',').explode().str.strip()
-director_counts = directors_list.value_counts().head(10)
+    # Directors are pre-split and stripped (some entries have multiple directors)
+    director_counts = results['director_counts']
 
-print("\nTop 10 Directors:")
-print(director_counts)
+    print("\nTop 10 Directors:")
+    print(director_counts)
 
-plt.figure(figsize=(12, 6))
-director_counts.plot(kind='barh', color='#831010')
-plt.title('Top 10 Directors with Most Content on Netflix', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Number of Titles', fontsize=12, weight='bold')
-plt.ylabel('Director', fontsize=12, weight='bold')
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 11: Content Addition by Year (Bar Chart)
@@ -374,23 +356,15 @@ plt.show()
 # 5. Content budgets and licensing deals can be inferred from addition patterns
 # 6. Regulatory changes or competitive pressures show up as year-over-year changes
 # 7. This validates Netflix's "content is king" strategy execution over time
-print("\n" + "="*50)
-print("QUESTION 11: Content Added by Year")
-print("="*50)
+def question_11(results):
+    print("\n" + "="*50)
+    print("QUESTION 11: Content Added by Year")
+    print("="*50)
 
-yearly_additions = df['year_added'].value_counts().sort_index()
-print("\nContent Added per Year:")
-print(yearly_additions)
+    yearly_additions = results['yearly_additions']
+    print("\nContent Added per Year:")
+    print(yearly_additions)
 
-plt.figure(figsize=(12, 6))
-yearly_additions.plot(kind='bar', color='#E50914')
-plt.title('Content Added to Netflix by Year', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Year', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
-plt.xticks(rotation=45)
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 12: Average Movie Duration by Rating (Bar Chart)
@@ -406,24 +380,16 @@ plt.show()
 # 5. Children's content typically has shorter runtimes than adult content
 # 6. This validates whether Netflix's catalog aligns with typical rating-duration relationships
 # 7. User session planning differs for short family movies vs long adult dramas
-print("\n" + "="*50)
-print("QUESTION 12: Average Movie Duration by Rating")
-print("="*50)
-
-# Calculate average duration by rating for movies
-avg_duration_by_rating = movies_df.groupby('rating')['duration_min'].mean().sort_values(ascending=False)
-print("\nAverage Duration by Rating:")
-print(avg_duration_by_rating)
-
-plt.figure(figsize=(12, 6))
-avg_duration_by_rating.plot(kind='bar', color='#B20710')
-plt.title('Average Movie Duration by Content Rating', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Rating', fontsize=12, weight='bold')
-plt.ylabel('Average Duration (minutes)', fontsize=12, weight='bold')
-plt.xticks(rotation=45, ha='right')
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.show()
+def question_12(results):
+    print("\n" + "="*50)
+    print("QUESTION 12: Average Movie Duration by Rating")
+    print("="*50)
+
+    # Calculate average duration by rating for movies
+    avg_duration_by_rating = results['avg_duration_by_rating']
+    print("\nAverage Duration by Rating:")
+    print(avg_duration_by_rating)
+
 
 # ============================================
 # QUESTION 13: Content Addition by Month of Year (Bar Chart)
@@ -440,27 +406,17 @@ plt.show()
 # 6. Major entertainment events (awards season, summer blockbusters) influence timing
 # 7. This helps predict future content pipeline and manage subscriber expectations
 # 8. Resource allocation (QA, localization teams) can be planned based on seasonal peaks
-print("\n" + "="*50)
-print("QUESTION 13: Content Addition by Month")
-print("="*50)
+def question_13(results):
+    print("\n" + "="*50)
+    print("QUESTION 13: Content Addition by Month")
+    print("="*50)
 
-# Extract month from date_added
-df['month_number'] = df['date_added'].dt.month
-monthly_pattern = df['month_number'].value_counts().sort_index()
-month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+    # Titles added per calendar month
+    monthly_pattern = results['monthly_pattern']
 
-print("\nContent Added by Month:")
-print(monthly_pattern)
+    print("\nContent Added by Month:")
+    print(monthly_pattern)
 
-plt.figure(figsize=(12, 6))
-plt.bar(range(1, 13), [monthly_pattern.get(i, 0) for i in range(1, 13)], color='#E50914')
-plt.title('Seasonal Pattern: Content Added by Month', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Month', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
-plt.xticks(range(1, 13), month_names)
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # QUESTION 14: Release Year vs Date Added Gap (Scatter Plot)
@@ -477,34 +433,15 @@ plt.show()
 # 6. Windowing strategies (theatrical → streaming → TV) affect acquisition timing
 # 7. Competitive advantage: shorter gaps mean fresher content for subscribers
 # 8. Different gaps for movies vs TV shows indicate different content strategies
-print("\n" + "="*50)
-print("QUESTION 14: Release Year vs Addition Date Gap")
-print("="*50)
-
-# Calculate gap between release and addition
-df['year_gap'] = df['year_added'] - df['release_year']
-df_gap = df[df['year_gap'].notna() & (df['year_gap'] >= 0)].copy()
-
-print("\nYear Gap Statistics:")
-print(df_gap['year_gap'].describe())
-
-plt.figure(figsize=(14, 6))
-plt.scatter(df_gap['release_year'], df_gap['year_gap'], 
-            c=df_gap['type'].map({'Movie': '#E50914', 'TV Show': '#B20710'}), 
-            alpha=0.5, s=30)
-plt.title('Time Gap: Release Year to Netflix Addition', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Release Year', fontsize=12, weight='bold')
-plt.ylabel('Years Until Added to Netflix', fontsize=12, weight='bold')
-plt.grid(True, alpha=0.3)
-# Add legend
-from matplotlib.lines import Line2D
-legend_elements = [Line2D([0], [0], marker='o', color='w', markerfacecolor='#E50914', 
-                         markersize=10, label='Movie'),
-                  Line2D([0], [0], marker='o', color='w', markerfacecolor='#B20710', 
-                         markersize=10, label='TV Show')]
-plt.legend(handles=legend_elements, loc='upper left')
-plt.tight_layout()
-plt.show()
+def question_14(results):
+    print("\n" + "="*50)
+    print("QUESTION 14: Release Year vs Addition Date Gap")
+    print("="*50)
+
+    # Gap between release and addition (titles added before release are excluded)
+    print("\nYear Gap Statistics:")
+    print(results['year_gap_stats'])
+
 
 # ============================================
 # QUESTION 15: Top 5 Countries - Content Type Breakdown (Grouped Bar Chart)
@@ -521,30 +458,17 @@ plt.show()
 # 6. Market-specific content strategies can be developed based on regional strengths
 # 7. This validates whether Netflix's regional content mix matches local production trends
 # 8. Investment priorities can be adjusted per region based on content type strengths
-print("\n" + "="*50)
-print("QUESTION 15: Top 5 Countries - Content Type Breakdown")
-print("="*50)
-
-# Get top 5 countries
-top5_countries = df['primary_country'].value_counts().head(5).index
+def question_15(results):
+    print("\n" + "="*50)
+    print("QUESTION 15: Top 5 Countries - Content Type Breakdown")
+    print("="*50)
 
-# Filter and create pivot
-top5_df = df[df['primary_country'].isin(top5_countries)]
-country_type_pivot = pd.crosstab(top5_df['primary_country'], top5_df['type'])
+    # Crosstab of primary country x type, restricted to the top 5 countries
+    country_type_pivot = results['country_type_pivot']
 
-print("\nTop 5 Countries Content Breakdown:")
-print(country_type_pivot)
+    print("\nTop 5 Countries Content Breakdown:")
+    print(country_type_pivot)
 
-# Plot grouped bar chart
-country_type_pivot.plot(kind='bar', color=['#E50914', '#B20710'], figsize=(12, 6))
-plt.title('Top 5 Countries: Movies vs TV Shows', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Country', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles', fontsize=12, weight='bold')
-plt.legend(title='Content Type', fontsize=10)
-plt.xticks(rotation=45, ha='right')
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.show()
 
 # ============================================
 # SUMMARY STATISTICS
@@ -558,19 +482,121 @@ plt.show()
 # 3. Key performance indicators (KPIs) in a concise format
 # 4. Baseline numbers for year-over-year comparisons
 # 5. Executive summary data for reports and presentations
-print("\n" + "="*50)
-print("SUMMARY STATISTICS")
-print("="*50)
-print(f"\nTotal Content: {len(df)}")
-print(f"Movies: {len(df[df['type'] == 'Movie'])}")
-print(f"TV Shows: {len(df[df['type'] == 'TV Show'])}")
-print(f"Unique Countries: {df['primary_country'].nunique()}")
-print(f"Unique Ratings: {df['rating'].nunique()}")
-print(f"Unique Directors: {df['directors'].dropna().str.split(',').explode().nunique()}")
-print(f"Year Range: {df['release_year'].min()} - {df['release_year'].max()}")
-print(f"Average Movie Duration: {movies_df['duration_min'].mean():.1f} minutes")
-print(f"Average TV Show Seasons: {tv_shows_df['num_seasons'].mean():.1f}")
-
-print("\n" + "="*50)
-print("Analysis Complete! All 15 Visualizations Generated.")
-print("="*50)
\ No newline at end of file
+def summary(results):
+    print("\n" + "="*50)
+    print("SUMMARY STATISTICS")
+    print("="*50)
+    print(f"\nTotal Content: {results['total']}")
+    print(f"Movies: {results['movies']}")
+    print(f"TV Shows: {results['tv_shows']}")
+    print(f"Unique Countries: {results['unique_countries']}")
+    print(f"Unique Ratings: {results['unique_ratings']}")
+    print(f"Unique Directors: {results['unique_directors']}")
+    print(f"Unique Cast Members: {results['unique_cast']}")
+    print(f"Unique Genres: {results['unique_genres']}")
+    print(f"Year Range: {results['year_range'][0]} - {results['year_range'][1]}")
+    print(f"Average Movie Duration: {results['avg_movie_duration']:.1f} minutes")
+    print(f"Average TV Show Seasons: {results['avg_tv_seasons']:.1f}")
+
+
+QUESTIONS = {
+    1: question_1, 2: question_2, 3: question_3, 4: question_4, 5: question_5,
+    6: question_6, 7: question_7, 8: question_8, 9: question_9, 10: question_10,
+    11: question_11, 12: question_12, 13: question_13, 14: question_14, 15: question_15,
+}
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.profile_report:
+        profiling.start(cprofile=args.cprofile)
+    # Plotting libraries are only imported when a chart will be drawn
+    plots = not (args.no_plots or args.json) and plots_enabled([])
+    if plots:
+        if args.batch:
+            # Non-interactive backend: no display needed and nothing blocks
+            import matplotlib
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from netflix_analysis.charts import apply_style, draw_chart, render_all
+
+        # Set style for better-looking plots
+        apply_style()
+
+    full_run = args.questions is None
+    approximation = None
+    if args.approximate:
+        approximation = Approximation(args.epsilon, args.precision, args.quantile_k)
+    plan = plan_run(args.questions, summary=full_run, approximation=approximation)
+
+    # Step 1: Load the Netflix dataset
+    # The shared loader finds netflix_titles_CLEANED.csv (or NETFLIX_DATASET),
+    # applies explicit dtypes and parses date_added once.  The overview text
+    # is saved with the cached results, so a rerun on unchanged data does
+    # not load the whole frame
+    if full_run and not (args.stream or args.incremental or args.json):
+        if args.no_result_cache:
+            print(format_overview(load_dataset()), end='')
+        else:
+            print(dataset_overview(), end='')
+
+    # Step 2: Load only the columns the selected questions use, derive each
+    # shared column (month_added, duration_min, primary_country, ...) once,
+    # and compute all of their aggregates in one scan.  With --stream the
+    # same aggregates are accumulated chunk by chunk instead, with
+    # --incremental only the rows appended since the last run are read, and
+    # with --parallel row partitions are scanned in worker processes.
+    # Otherwise results saved by an earlier run on the same data are reused
+    if args.incremental:
+        results, info = refresh_plan(plan, chunksize=args.chunksize)
+        if not args.json:
+            print(f"Incremental refresh: {info.new_rows} new rows, {info.total_rows} in total"
+                  + (" (state rebuilt)" if info.rebuilt else ""))
+    elif args.stream:
+        results = stream_plan(plan, chunksize=args.chunksize)
+    elif args.parallel:
+        results = parallel_plan(plan, workers=args.workers, partitions=args.partitions)
+    elif args.no_result_cache:
+        results = run_plan(plan)
+    else:
+        results, _ = run_plan_cached(plan)
+
+    if args.json:
+        print(json.dumps({name: to_jsonable(value) for name, value in results.items()}))
+        if args.profile_report:
+            profiling.stop().write(args.profile_report)
+        return
+
+    # Step 3: Report each question, showing its chart unless running in batch
+    for number in plan.questions:
+        QUESTIONS[number](results)
+        if plots and not args.batch:
+            draw_chart(number, results)
+            plt.show()
+
+    if full_run:
+        summary(results)
+
+    if plots and args.batch:
+        formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+        written = render_all(results, args.output_dir, formats=formats, workers=args.workers,
+                             questions=plan.questions, reuse=not args.rerender)
+        print(f"\nSaved {sum(len(paths) for paths in written.values())} chart files "
+              f"to {args.output_dir}")
+
+    print("\n" + "="*50)
+    if not plots:
+        print(f"Analysis Complete! {len(plan.questions)} Questions Computed (charts skipped).")
+    elif full_run:
+        print("Analysis Complete! All 15 Visualizations Generated.")
+    else:
+        print(f"Analysis Complete! {len(plan.questions)} Visualizations Generated.")
+    print("="*50)
+
+    if args.profile_report:
+        profiling.stop().write(args.profile_report)
+        print(f"Profile report written to {args.profile_report}")
+
+
+if __name__ == '__main__':
+    main()
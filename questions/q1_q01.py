@@ -10,32 +10,9 @@
 # 4. This metric influences content acquisition decisions and user interface design
 # 5. Investors and analysts use this to assess Netflix's content diversification strategy
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from netflix_analysis import load_dataset, plots_enabled
 
-# Set style for better-looking plots
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (12, 6)
-
-# Step 1: Load the Netflix dataset (robust path handling)
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+df = load_dataset(columns=['type'])
 
 print("\n" + "="*50)
 print("QUESTION 1: Content Type Distribution")
@@ -45,12 +22,18 @@ type_counts = df['type'].value_counts()
 print("\nContent Type Counts:")
 print(type_counts)
 
-plt.figure(figsize=(8, 8))
-colors = ['#E50914', '#B20710']
-plt.pie(type_counts.values, labels=type_counts.index, autopct='%1.1f%%', 
-        colors=colors, startangle=90, textprops={'fontsize': 14, 'weight': 'bold'})
-plt.title('Netflix Content Type Distribution', fontsize=16, weight='bold', pad=20)
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Set style for better-looking plots
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+
+    plt.figure(figsize=(8, 8))
+    colors = ['#E50914', '#B20710']
+    plt.pie(type_counts.values, labels=type_counts.index, autopct='%1.1f%%', 
+            colors=colors, startangle=90, textprops={'fontsize': 14, 'weight': 'bold'})
+    plt.title('Netflix Content Type Distribution', fontsize=16, weight='bold', pad=20)
+    plt.tight_layout()
+    plt.show()
@@ -13,49 +13,33 @@
 # 6. It shows cultural diversity and international expansion patterns
 # 7. Regional licensing and production partnerships can be evaluated based on this data
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (12, 6)
-
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+from netflix_analysis import load_multivalue_index, plots_enabled
+
+countries = load_multivalue_index('countries')
 
 print("\n" + "="*50)
 print("QUESTION 2: Top Countries by Content")
 print("="*50)
 
-# Extract first country from countries column (some have multiple countries)
-df['primary_country'] = df['countries'].fillna('Unknown').str.split(',').str[0].str.strip()
+# First listed country per title, from the prebuilt split of the countries column
+primary_country = countries.first().fillna('Unknown').rename('primary_country')
 
-country_counts = df['primary_country'].value_counts().head(10)
+country_counts = primary_country.value_counts().head(10)
 print("\nTop 10 Countries:")
 print(country_counts)
 
-plt.figure(figsize=(12, 6))
-country_counts.plot(kind='barh', color='#E50914')
-plt.title('Top 10 Countries by Netflix Content', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Number of Titles', fontsize=12, weight='bold')
-plt.ylabel('Country', fontsize=12, weight='bold')
-plt.gca().invert_yaxis()
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+
+    plt.figure(figsize=(12, 6))
+    country_counts.plot(kind='barh', color='#E50914')
+    plt.title('Top 10 Countries by Netflix Content', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Number of Titles', fontsize=12, weight='bold')
+    plt.ylabel('Country', fontsize=12, weight='bold')
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+    plt.show()
@@ -14,46 +14,32 @@
 # 7. Family-friendly vs mature content balance is a key business metric
 # 8. Different markets have different rating preferences, affecting regional strategies
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from netflix_analysis import load_dataset, plots_enabled
 
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (12, 6)
-
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+df = load_dataset(columns=['rating'])
 
 print("\n" + "="*50)
 print("QUESTION 3: Content Rating Distribution")
 print("="*50)
 
-rating_counts = df['rating'].value_counts()
+# Counted as plain values so ties keep their order of first appearance
+# (a categorical orders them by category)
+rating_counts = df['rating'].astype(object).value_counts()
 print("\nRating Distribution:")
 print(rating_counts)
 
-plt.figure(figsize=(12, 6))
-rating_counts.plot(kind='bar', color='#B20710')
-plt.title('Netflix Content Rating Distribution', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Rating', fontsize=12, weight='bold')
-plt.ylabel('Count', fontsize=12, weight='bold')
-plt.xticks(rotation=45, ha='right')
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+
+    plt.figure(figsize=(12, 6))
+    rating_counts.plot(kind='bar', color='#B20710')
+    plt.title('Netflix Content Rating Distribution', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Rating', fontsize=12, weight='bold')
+    plt.ylabel('Count', fontsize=12, weight='bold')
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    plt.show()
@@ -14,30 +14,9 @@
 # 7. Investors use this to assess whether Netflix is acquiring recent vs archival content
 # 8. Marketing teams can highlight "new releases" vs "classic collection" campaigns
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from netflix_analysis import load_dataset, plots_enabled
 
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (14, 6)
-
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+df = load_dataset(columns=['release_year'])
 
 print("\n" + "="*50)
 print("QUESTION 4: Content Release Year Trend")
@@ -47,14 +26,19 @@ year_counts = df['release_year'].value_counts().sort_index()
 print("\nContent by Release Year:")
 print(year_counts.tail(10))
 
-plt.figure(figsize=(14, 6))
-plt.plot(year_counts.index, year_counts.values, marker='o', 
-         color='#E50914', linewidth=2, markersize=6)
-plt.title('Netflix Content by Release Year', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Release Year', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles', fontsize=12, weight='bold')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (14, 6)
+
+    plt.figure(figsize=(14, 6))
+    plt.plot(year_counts.index, year_counts.values, marker='o', 
+             color='#E50914', linewidth=2, markersize=6)
+    plt.title('Netflix Content by Release Year', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Release Year', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles', fontsize=12, weight='bold')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
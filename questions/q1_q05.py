@@ -15,29 +15,10 @@
 # 8. This validates whether content guidelines differ between movies and series
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (12, 6)
-
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+
+from netflix_analysis import load_dataset, plots_enabled
+
+df = load_dataset(columns=['type', 'rating'])
 
 print("\n" + "="*50)
 print("QUESTION 5: Content Type vs Rating Heatmap")
@@ -47,13 +28,18 @@ pivot_table = pd.crosstab(df['type'], df['rating'])
 print("\nPivot Table:")
 print(pivot_table)
 
-plt.figure(figsize=(12, 6))
-sns.heatmap(pivot_table, annot=True, fmt='d', cmap='Reds', 
-            cbar_kws={'label': 'Count'}, linewidths=0.5)
-plt.title('Content Type vs Rating Heatmap', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Rating', fontsize=12, weight='bold')
-plt.ylabel('Content Type', fontsize=12, weight='bold')
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+
+    plt.figure(figsize=(12, 6))
+    sns.heatmap(pivot_table, annot=True, fmt='d', cmap='Reds', 
+                cbar_kws={'label': 'Count'}, linewidths=0.5)
+    plt.title('Content Type vs Rating Heatmap', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Rating', fontsize=12, weight='bold')
+    plt.ylabel('Content Type', fontsize=12, weight='bold')
+    plt.tight_layout()
+    plt.show()
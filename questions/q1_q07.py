@@ -15,49 +15,33 @@
 # 8. Production costs scale with season count, affecting budget allocation
 # 9. Recommendation algorithms treat single vs multi-season shows differently
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (10, 6)
-
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+from netflix_analysis import load_dataset, plots_enabled
+
+df = load_dataset(columns=['type', 'num_seasons'])
 
 print("\n" + "="*50)
 print("QUESTION 7: TV Show Seasons Distribution")
 print("="*50)
 
-tv_shows_df = df[df['type'] == 'TV Show'].copy()
-tv_shows_df['num_seasons'] = tv_shows_df['duration'].str.extract(r'(\d+)').astype(float)
+tv_shows_df = df[df['type'] == 'TV Show']
 
-season_counts = tv_shows_df['num_seasons'].value_counts().sort_index()
+# Float seasons, as the script printed when it parsed the strings itself
+season_counts = tv_shows_df['num_seasons'].astype(float).value_counts().sort_index()
 print("\nSeasons Distribution:")
 print(season_counts)
 
-plt.figure(figsize=(10, 6))
-season_counts.plot(kind='bar', color='#B20710')
-plt.title('TV Show Seasons Distribution', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Number of Seasons', fontsize=12, weight='bold')
-plt.ylabel('Number of Shows', fontsize=12, weight='bold')
-plt.xticks(rotation=0)
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (10, 6)
+
+    plt.figure(figsize=(10, 6))
+    season_counts.plot(kind='bar', color='#B20710')
+    plt.title('TV Show Seasons Distribution', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Number of Seasons', fontsize=12, weight='bold')
+    plt.ylabel('Number of Shows', fontsize=12, weight='bold')
+    plt.xticks(rotation=0)
+    plt.tight_layout()
+    plt.show()
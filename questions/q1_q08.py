@@ -16,50 +16,34 @@
 # 9. Declining trends might indicate market saturation or strategic pivots
 # 10. This validates whether Netflix is maintaining its promised content refresh rate
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from netflix_analysis import load_dataset, plots_enabled
+from netflix_analysis.derive import add_derived_columns
 
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (14, 6)
-
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+df = load_dataset(columns=['date_added'])
 
 print("\n" + "="*50)
 print("QUESTION 8: Content Added to Netflix Over Time")
 print("="*50)
 
-df['date_added'] = pd.to_datetime(df['date_added'], errors='coerce')
-df['month_added'] = df['date_added'].dt.to_period('M')
+add_derived_columns(df, ['month_added'])
 
 monthly_additions = df.groupby('month_added').size().sort_index()
 
 print("\nMonthly Content Additions:")
 print(monthly_additions.tail(10))
 
-plt.figure(figsize=(14, 6))
-monthly_additions.plot(color='#E50914', linewidth=2)
-plt.title('Content Added to Netflix Over Time', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Date', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (14, 6)
+
+    plt.figure(figsize=(14, 6))
+    monthly_additions.plot(color='#E50914', linewidth=2)
+    plt.title('Content Added to Netflix Over Time', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Date', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles Added', fontsize=12, weight='bold')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
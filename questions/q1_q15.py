@@ -15,32 +15,13 @@
 # 8. Investment priorities can be adjusted per region based on content type strengths
 
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-sns.set_style("darkgrid")
-plt.rcParams['figure.figsize'] = (12, 6)
+from netflix_analysis import load_dataset, load_multivalue_index, plots_enabled
 
-def load_netflix_dataset() -> pd.DataFrame:
-    candidate_paths = (
-        '../netflix_titles_CLEANED.csv',
-        '../netflix_titles.CLEANED.csv',
-        'netflix_titles_CLEANED.csv',
-        'netflix_titles.CLEANED.csv',
-    )
-    last_err = None
-    for p in candidate_paths:
-        try:
-            return pd.read_csv(p)
-        except FileNotFoundError as e:
-            last_err = e
-            continue
-    raise last_err
-
-df = load_netflix_dataset()
+df = load_dataset(columns=['type'])
 
 # Precompute primary country for this analysis
-df['primary_country'] = df['countries'].fillna('Unknown').str.split(',').str[0].str.strip()
+df['primary_country'] = load_multivalue_index('countries').first().fillna('Unknown')
 
 print("\n" + "="*50)
 print("QUESTION 15: Top 5 Countries - Content Type Breakdown")
@@ -53,14 +34,19 @@ country_type_pivot = pd.crosstab(top5_df['primary_country'], top5_df['type'])
 print("\nTop 5 Countries Content Breakdown:")
 print(country_type_pivot)
 
-ax = country_type_pivot.plot(kind='bar', color=['#E50914', '#B20710'], figsize=(12, 6))
-plt.title('Top 5 Countries: Movies vs TV Shows', fontsize=16, weight='bold', pad=20)
-plt.xlabel('Country', fontsize=12, weight='bold')
-plt.ylabel('Number of Titles', fontsize=12, weight='bold')
-plt.legend(title='Content Type', fontsize=10)
-plt.xticks(rotation=45, ha='right')
-plt.grid(True, alpha=0.3, axis='y')
-plt.tight_layout()
-plt.show()
-
-
+if plots_enabled():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    sns.set_style("darkgrid")
+    plt.rcParams['figure.figsize'] = (12, 6)
+
+    ax = country_type_pivot.plot(kind='bar', color=['#E50914', '#B20710'], figsize=(12, 6))
+    plt.title('Top 5 Countries: Movies vs TV Shows', fontsize=16, weight='bold', pad=20)
+    plt.xlabel('Country', fontsize=12, weight='bold')
+    plt.ylabel('Number of Titles', fontsize=12, weight='bold')
+    plt.legend(title='Content Type', fontsize=10)
+    plt.xticks(rotation=45, ha='right')
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+    plt.show()
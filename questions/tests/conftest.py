@@ -0,0 +1,56 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+QUESTIONS_DIR = Path(__file__).resolve().parents[1]
+DATASET = QUESTIONS_DIR / 'netflix_titles_CLEANED.csv'
+
+sys.path.insert(0, str(QUESTIONS_DIR))
+os.environ['NETFLIX_NO_PLOTS'] = '1'
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch):
+    """Keep every test's caches out of the checkout (shared within the session)."""
+    directory = tmp_path_factory.getbasetemp() / 'netflix_cache'
+    monkeypatch.setenv('NETFLIX_CACHE_DIR', str(directory))
+    return directory
+
+
+@pytest.fixture
+def dataset_copy(tmp_path):
+    """A private copy of the catalog, ending with a newline, that tests may append to."""
+    path = tmp_path / DATASET.name
+    shutil.copyfile(DATASET, path)
+    with open(path, 'rb+') as fh:
+        fh.seek(-1, os.SEEK_END)
+        if fh.read(1) != b'\n':
+            fh.write(b'\n')
+    return path
+
+
+def _assert_close(left, right, where):
+    if isinstance(right, dict):
+        assert isinstance(left, dict) and left.keys() == right.keys(), where
+        for key in right:
+            _assert_close(left[key], right[key], f'{where}.{key}')
+    elif isinstance(right, list):
+        assert isinstance(left, list) and len(left) == len(right), where
+        for i, (a, b) in enumerate(zip(left, right)):
+            _assert_close(a, b, f'{where}[{i}]')
+    elif isinstance(right, float):
+        assert left == pytest.approx(right, rel=1e-12), where
+    else:
+        assert left == right, where
+
+
+def assert_same_results(results, expected):
+    """Aggregate results equal, values and order, up to float rounding."""
+    from netflix_analysis.runner import to_jsonable
+
+    assert results.keys() == expected.keys()
+    for name in expected:
+        _assert_close(to_jsonable(results[name]), to_jsonable(expected[name]), name)
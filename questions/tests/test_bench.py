@@ -0,0 +1,17 @@
+import os
+
+from netflix_analysis.bench import benchmark_catalog
+
+
+def test_benchmark_leaves_the_environment_cache_alone(dataset_copy, cache_dir, tmp_path):
+    marker = cache_dir / 'keep.txt'
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.write_text('user cache')
+
+    report = benchmark_catalog(dataset_copy, tmp_path / 'bench_cache', repeat=1, render=False,
+                               questions=[2])
+
+    assert marker.read_text() == 'user cache'
+    assert os.environ['NETFLIX_CACHE_DIR'] == str(cache_dir)
+    assert 'cache_build' in report['timings']
+    assert (tmp_path / 'bench_cache').is_dir()
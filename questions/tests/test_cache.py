@@ -0,0 +1,51 @@
+import os
+
+from netflix_analysis import cache, resultcache
+from netflix_analysis.cache import dataset_sha256, open_cached_store
+from netflix_analysis.loader import read_dataset_csv
+
+
+def _touch(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def _count_hashes(monkeypatch):
+    calls = []
+    hash_file = cache.file_sha256
+    monkeypatch.setattr(cache, 'file_sha256', lambda path: calls.append(path) or hash_file(path))
+    return calls
+
+
+def test_touched_source_is_hashed_once(dataset_copy, tmp_path, monkeypatch):
+    monkeypatch.setenv('NETFLIX_CACHE_DIR', str(tmp_path / 'cache'))
+    built = open_cached_store(dataset_copy, read_dataset_csv)
+    _touch(dataset_copy)
+    calls = _count_hashes(monkeypatch)
+
+    store = open_cached_store(dataset_copy, lambda path: None)
+    assert store.meta['mtime_ns'] == dataset_copy.stat().st_mtime_ns
+    assert store.meta['sha256'] == built.meta['sha256']
+    open_cached_store(dataset_copy, lambda path: None)
+    assert dataset_sha256(dataset_copy) == built.meta['sha256']
+    assert len(calls) == 1
+
+
+def test_dataset_sha256_records_a_touched_source(dataset_copy, tmp_path, monkeypatch):
+    monkeypatch.setenv('NETFLIX_CACHE_DIR', str(tmp_path / 'cache'))
+    digest = open_cached_store(dataset_copy, read_dataset_csv).meta['sha256']
+    _touch(dataset_copy)
+    calls = _count_hashes(monkeypatch)
+
+    assert dataset_sha256(dataset_copy) == digest
+    assert dataset_sha256(dataset_copy) == digest
+    assert len(calls) == 1
+
+
+def test_overview_is_reused_without_loading(dataset_copy, tmp_path, monkeypatch):
+    monkeypatch.setenv('NETFLIX_CACHE_DIR', str(tmp_path / 'cache'))
+    text = resultcache.dataset_overview(dataset_copy)
+    assert text.startswith('Dataset Shape: (8807, ')
+
+    monkeypatch.setattr(resultcache, 'load_dataset', None)
+    assert resultcache.dataset_overview(dataset_copy) == text
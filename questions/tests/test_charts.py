@@ -0,0 +1,21 @@
+import inspect
+
+import pytest
+
+pytest.importorskip('matplotlib')
+
+from netflix_analysis import charts  # noqa: E402
+
+
+def test_fingerprint_covers_the_helpers_a_chart_calls(monkeypatch):
+    inputs = {'year_gap_points': None}
+    gap_chart = charts.chart_fingerprint(14, inputs, 'png')
+    type_chart = charts.chart_fingerprint(1, inputs, 'png')
+
+    def edited(function, getsource=inspect.getsource):
+        source = getsource(function)
+        return source + '# edited\n' if function is charts.gap_density else source
+
+    monkeypatch.setattr(charts.inspect, 'getsource', edited)
+    assert charts.chart_fingerprint(14, inputs, 'png') != gap_chart
+    assert charts.chart_fingerprint(1, inputs, 'png') == type_chart
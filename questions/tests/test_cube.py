@@ -0,0 +1,31 @@
+import pandas as pd
+
+from netflix_analysis import runner
+from netflix_analysis.cube import load_cube
+from netflix_analysis.runner import plan_run, run_plan
+
+
+def test_cube_answers_equal_a_row_scan():
+    plan = plan_run()
+    results = run_plan(plan)
+    expected = run_plan(plan, use_cache=False)
+
+    assert results.keys() == expected.keys()
+    for name, value in expected.items():
+        if isinstance(value, pd.DataFrame):
+            pd.testing.assert_frame_equal(results[name], value)
+        elif isinstance(value, pd.Series):
+            pd.testing.assert_series_equal(results[name], value)
+        else:
+            assert results[name] == value, name
+
+
+def test_categorical_questions_load_no_rows(monkeypatch):
+    load_cube()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('rows were loaded')
+
+    monkeypatch.setattr(runner, 'load_dataset', fail)
+    results = run_plan(plan_run([3, 5, 9, 11, 13, 15], summary=False))
+    assert results['rating_counts'].sum() == results['pivot_table'].to_numpy().sum()
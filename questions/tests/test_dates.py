@@ -0,0 +1,52 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from netflix_analysis import dates
+from netflix_analysis.dates import UnparseableDatesWarning, parse_date_added, parse_dates
+
+
+@pytest.mark.parametrize('dtype', [object, 'category'])
+def test_stray_whitespace_is_normalized(dtype):
+    values = pd.Series(['September 25, 2021', ' September 25, 2021 ', 'September  25 , 2021',
+                        '\tAugust 4,  2020'], dtype=dtype)
+    result = parse_dates(values)
+
+    assert result.dates.tolist() == [pd.Timestamp('2021-09-25')] * 3 + [pd.Timestamp('2020-08-04')]
+    assert result.unparseable.empty
+
+
+def test_each_distinct_string_is_parsed_once(monkeypatch):
+    parsed = []
+    to_datetime = pd.to_datetime
+    monkeypatch.setattr(dates.pd, 'to_datetime',
+                        lambda texts, **kwargs: parsed.append(len(texts)) or
+                        to_datetime(texts, **kwargs))
+    values = pd.Series(['January 1, 2020', 'March 3, 2021'] * 500 + [None], dtype='category')
+    result = parse_dates(values)
+
+    assert parsed == [2]
+    assert result.dates.value_counts().to_dict() == {pd.Timestamp('2020-01-01'): 500,
+                                                    pd.Timestamp('2021-03-03'): 500}
+    assert result.dates.isna().sum() == 1
+
+
+def test_unparseable_strings_are_reported_with_counts():
+    values = pd.Series(['2021-09-25', 'May 5, 2019', '2021-09-25', 'soon', '', None])
+    result = parse_dates(values)
+
+    assert result.dates.isna().tolist() == [True, False, True, True, True, True]
+    assert result.unparseable.to_dict() == {'2021-09-25': 2, 'soon': 1}
+
+
+def test_parse_date_added_warns_about_unparseable_strings():
+    with pytest.warns(UnparseableDatesWarning, match=r"3 date_added values .*'2021-09-25'"):
+        parsed = parse_date_added(pd.Series(['2021-09-25', 'soon', '2021-09-25', 'May 5, 2019']))
+    assert parsed.iloc[3] == pd.Timestamp('2019-05-05')
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        parsed = parse_date_added(pd.Series(['May 5, 2019', np.nan]))
+    assert parsed.isna().tolist() == [False, True]
@@ -0,0 +1,50 @@
+import warnings
+
+import pandas as pd
+import pytest
+
+from netflix_analysis.durations import (
+    InvalidDurationsWarning,
+    add_duration_columns,
+    parse_durations,
+)
+
+
+def _frame(rows, dtype=object):
+    return pd.DataFrame(rows, columns=['type', 'duration']).astype({'duration': dtype})
+
+
+@pytest.mark.parametrize('dtype', [object, 'category'])
+def test_units_follow_the_type(dtype):
+    df = _frame([('Movie', '90 min'), ('TV Show', '1 Season'), ('TV Show', ' 3 Seasons '),
+                 ('Movie', None)], dtype)
+    result = parse_durations(df['duration'], df['type'])
+
+    assert result.minutes.tolist() == [90, pd.NA, pd.NA, pd.NA]
+    assert result.seasons.tolist() == [pd.NA, 1, 3, pd.NA]
+    assert str(result.minutes.dtype) == str(result.seasons.dtype) == 'Int16'
+    assert result.invalid.empty
+
+
+def test_movie_with_a_season_unit_is_rejected():
+    df = _frame([('Movie', '2 Seasons'), ('TV Show', '45 min'), ('Movie', '2 Seasons')])
+    result = parse_durations(df['duration'], df['type'])
+
+    assert result.minutes.isna().all() and result.seasons.isna().all()
+    assert result.invalid.to_dict() == {('Movie', '2 Seasons'): 2, ('TV Show', '45 min'): 1}
+
+
+def test_malformed_duration_warns_and_is_missing():
+    df = _frame([('Movie', 'ninety min'), ('Movie', '100 min')])
+    with pytest.warns(InvalidDurationsWarning, match=r"1 durations .*Movie 'ninety min'"):
+        add_duration_columns(df)
+
+    assert df['duration_min'].tolist() == [pd.NA, 100]
+
+
+def test_valid_durations_do_not_warn():
+    df = _frame([('Movie', '100 min'), ('TV Show', '2 Seasons'), ('TV Show', None)])
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        add_duration_columns(df)
+    assert df['num_seasons'].tolist() == [pd.NA, 2, pd.NA]
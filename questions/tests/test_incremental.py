@@ -0,0 +1,45 @@
+import csv
+
+from conftest import assert_same_results
+from netflix_analysis.incremental import refresh_plan
+from netflix_analysis.runner import plan_run, run_plan
+
+
+def _append(path, **values):
+    row = {'show_id': 's99999', 'type': 'Movie', 'title': 'Appended', 'directors': '',
+           'cast': '', 'countries': 'India', 'date_added': 'January 5, 2022',
+           'release_year': '2021', 'rating': 'TV-14', 'duration': '95 min',
+           'listed_in': 'Dramas', 'description': 'One more title.'}
+    row.update(values)
+    with open(path, newline='') as fh:
+        header = next(csv.reader(fh))
+    with open(path, 'a', newline='') as fh:
+        csv.writer(fh, lineterminator='\n').writerow([row[name] for name in header])
+
+
+def test_refresh_after_appending_a_title_without_directors(dataset_copy, tmp_path, monkeypatch):
+    monkeypatch.setenv('NETFLIX_CACHE_DIR', str(tmp_path / 'cache'))
+    plan = plan_run()
+    refresh_plan(plan, dataset_copy)
+
+    _append(dataset_copy, directors='', cast='')
+    results, info = refresh_plan(plan, dataset_copy)
+
+    assert info.new_rows == 1 and not info.rebuilt
+    assert_same_results(results, run_plan(plan, dataset_copy, use_cache=False))
+
+
+def test_refresh_starts_over_after_an_edit_that_keeps_the_size(dataset_copy, tmp_path,
+                                                               monkeypatch):
+    monkeypatch.setenv('NETFLIX_CACHE_DIR', str(tmp_path / 'cache'))
+    plan = plan_run([3], summary=False)
+    refresh_plan(plan, dataset_copy)
+
+    data = dataset_copy.read_bytes()
+    middle = data.index(b',TV-MA,', len(data) // 2)
+    dataset_copy.write_bytes(data[:middle] + b',TV-14,' + data[middle + len(b',TV-MA,'):])
+    _append(dataset_copy)
+    results, info = refresh_plan(plan, dataset_copy)
+
+    assert info.rebuilt
+    assert_same_results(results, run_plan(plan, dataset_copy, use_cache=False))
@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from netflix_analysis.multivalue import MultiValueIndex
+
+
+@pytest.mark.parametrize('dtype', [object, 'str', 'category'])
+def test_missing_values_are_not_labels(dtype):
+    values = pd.Series(['A, B', np.nan, 'B', None, ' C ,A'], dtype=dtype, name='directors')
+    index = MultiValueIndex.from_series(values)
+
+    assert list(index.labels) == ['A', 'B', 'C']
+    assert index.row_lengths().tolist() == [2, 0, 1, 0, 2]
+    assert index.counts().to_dict() == {'A': 2, 'B': 2, 'C': 1}
+
+
+def test_a_column_without_values_has_no_labels():
+    index = MultiValueIndex.from_series(pd.Series([np.nan, np.nan], name='cast'))
+
+    assert len(index.labels) == 0 and index.row_lengths().tolist() == [0, 0]
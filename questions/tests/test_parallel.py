@@ -0,0 +1,18 @@
+import pytest
+
+from conftest import assert_same_results
+from netflix_analysis.parallel import parallel_plan, partition_bounds
+from netflix_analysis.runner import plan_run, run_plan
+
+
+def test_partition_bounds_cover_every_row():
+    assert partition_bounds(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert partition_bounds(2, 7) == [(0, 1), (1, 2)]
+
+
+@pytest.mark.parametrize('partitions,workers', [(1, 1), (3, 1), (7, 1), (3, 2)])
+def test_partitions_match_a_single_scan(partitions, workers):
+    plan = plan_run()
+    results = parallel_plan(plan, workers=workers, partitions=partitions)
+    assert_same_results(results, run_plan(plan, use_cache=False))
+
@@ -0,0 +1,25 @@
+import pytest
+
+from conftest import DATASET
+from netflix_analysis.loader import load_dataset, load_multivalue_index
+from netflix_analysis.query import MISSING, parse_query, run_query
+
+
+@pytest.mark.parametrize('column', ['year_added', 'month_number', 'year_gap', 'rating'])
+def test_keep_missing_counts_every_title(column):
+    result = run_query(parse_query(group_by=column, dropna=False), DATASET)
+    assert result.sum() == len(load_dataset(DATASET))
+    assert MISSING in result.index
+
+
+def test_keep_missing_on_a_multi_valued_column():
+    index = load_multivalue_index('directors', DATASET)
+    result = run_query(parse_query(group_by='directors', dropna=False), DATASET)
+    assert result[MISSING] == int((index.row_lengths() == 0).sum())
+    assert result.drop(MISSING).sum() == len(index.codes)
+
+
+def test_dropna_matches_keep_missing_without_the_missing_group():
+    kept = run_query(parse_query(group_by='year_added', dropna=False, sort='index'), DATASET)
+    dropped = run_query(parse_query(group_by='year_added', sort='index'), DATASET)
+    assert kept.drop(MISSING).tolist() == dropped.tolist()
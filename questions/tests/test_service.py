@@ -0,0 +1,52 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from conftest import DATASET
+from netflix_analysis.service import AggregateService, make_server
+
+
+@pytest.fixture
+def server():
+    service = AggregateService(DATASET)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield service, f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+def test_query_with_missing_groups(server):
+    _, base = server
+    status, body = _get(f'{base}/query?group_by=year_added&keep_missing=1')
+    assert status == 200
+    assert '(missing)' in body['result']['index']
+
+
+def test_bad_request_is_a_json_400(server):
+    _, base = server
+    status, body = _get(f'{base}/questions/99')
+    assert status == 400 and 'unknown question' in body['error']
+
+
+def test_unexpected_errors_are_a_json_500(server, monkeypatch):
+    service, base = server
+
+    def fail(*args, **kwargs):
+        raise KeyError('boom')
+
+    monkeypatch.setattr(service, 'query', fail)
+    status, body = _get(f'{base}/query?group_by=rating')
+    assert status == 500 and 'KeyError' in body['error']
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from netflix_analysis.loader import load_multivalue_index
+from netflix_analysis.parallel import partition_bounds
+from netflix_analysis.runner import plan_run, run_plan
+from netflix_analysis.sketches import KLL, Approximation, HeavyHitters, HyperLogLog
+
+
+def _zipf_values(size, seed=0):
+    return pd.Series(np.random.default_rng(seed).zipf(1.3, size)).astype(str)
+
+
+def _assert_heavy_hitter_bounds(sketch, exact):
+    assert sketch.total == exact.sum()
+    assert sketch.error <= sketch.total / (sketch.capacity + 1)
+    bounds = sketch.bounds()
+    truth = exact.reindex(bounds.index).to_numpy()
+    assert (bounds['lower'].to_numpy() <= truth).all()
+    assert (truth <= bounds['upper'].to_numpy()).all()
+    assert (exact.drop(bounds.index) <= sketch.error).all()
+
+
+def test_heavy_hitters_bound_the_exact_counts():
+    values = _zipf_values(50_000)
+    exact = values.value_counts()
+    sketch = HeavyHitters.from_counts(values.value_counts(sort=False), capacity=100)
+
+    assert len(exact) > 100 and len(sketch.counts) <= 100
+    _assert_heavy_hitter_bounds(sketch, exact)
+
+
+def test_merged_heavy_hitters_bound_the_exact_counts():
+    values = _zipf_values(50_000, seed=1)
+    sketch = HeavyHitters(100)
+    for start, stop in partition_bounds(len(values), 7):
+        part = values.iloc[start:stop].value_counts(sort=False)
+        sketch = sketch.merge(HeavyHitters.from_counts(part, capacity=100))
+    _assert_heavy_hitter_bounds(sketch, values.value_counts())
+
+
+def test_approximate_directors_stay_within_the_error():
+    approximation = Approximation(epsilon=0.01)
+    results = run_plan(plan_run([10], summary=False, approximation=approximation))
+    index = load_multivalue_index('directors')
+    exact = index.counts()
+
+    assert len(exact) > approximation.capacity
+    counts = results['director_counts']
+    truth = exact.reindex(counts.index).to_numpy()
+    assert (counts.to_numpy() <= truth).all()
+    assert (truth - counts.to_numpy() <= len(index.codes) / (approximation.capacity + 1)).all()
+
+
+def test_hyperloglog_counts_exactly_below_its_limit():
+    values = pd.Series(np.arange(1_000)).astype(str)
+    sketch = HyperLogLog.from_values(pd.concat([values, values, pd.Series([None])]), precision=14)
+
+    assert sketch.exact and sketch.count() == 1_000
+
+
+def test_hyperloglog_estimates_within_a_few_percent():
+    values = pd.Series(np.arange(200_000)).astype(str)
+    whole = HyperLogLog.from_values(values, precision=14)
+    merged = HyperLogLog(14)
+    for start, stop in partition_bounds(len(values), 7):
+        merged = merged.merge(HyperLogLog.from_values(values.iloc[start:stop], precision=14))
+
+    assert not whole.exact
+    assert abs(whole.count() - len(values)) <= 0.03 * len(values)
+    assert merged.count() == whole.count()
+
+
+def test_approximate_distinct_counts_bound_the_exact_ones():
+    plan = plan_run([], approximation=Approximation(precision=10))
+    results = run_plan(plan)
+    exact = run_plan(plan_run([]), use_cache=False)
+
+    for name in ('unique_countries', 'unique_ratings', 'unique_directors', 'unique_cast',
+                 'unique_genres'):
+        assert abs(results[name] - exact[name]) <= 0.1 * exact[name], name
+    assert results['unique_ratings'] == exact['unique_ratings']
+
+
+def _rank_error(sketch, values):
+    """Largest gap between the sketch's and the exact fraction of values <= x."""
+    retained, weights = sketch.items()
+    estimated = np.cumsum(weights) / weights.sum()
+    points = np.unique(retained)
+    estimated = estimated[np.searchsorted(retained, points, side='right') - 1]
+    exact = np.searchsorted(np.sort(values), points, side='right') / len(values)
+    return np.abs(estimated - exact).max()
+
+
+def _assert_exact_moments(sketch, values):
+    assert sketch.count == len(values)
+    assert sketch.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert sketch.std == pytest.approx(values.std(ddof=1), rel=1e-9)
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+
+
+@pytest.mark.parametrize('rounded', [False, True])
+def test_kll_ranks_stay_within_the_error(rounded):
+    values = np.random.default_rng(2).normal(100, 15, 100_000)
+    if rounded:
+        values = np.round(values)
+    whole = KLL.from_values(values, k=200)
+    merged = KLL(200)
+    for start, stop in partition_bounds(len(values), 7):
+        merged = merged.merge(KLL.from_values(values[start:stop], k=200))
+
+    for sketch in (whole, merged):
+        _assert_exact_moments(sketch, values)
+        assert sum(len(level) for level in sketch.levels) < 4 * 200
+        assert _rank_error(sketch, values) <= 2 / 200
+
+
+def test_approximate_duration_stats_bound_the_exact_ones():
+    results = run_plan(plan_run([6], summary=False, approximation=Approximation(quantile_k=64)))
+    exact = run_plan(plan_run([6], summary=False), use_cache=False)
+    stats, expected = results['duration_stats'], exact['duration_stats']
+    durations = np.repeat(exact['duration_distribution'].index.to_numpy(dtype=np.float64),
+                          exact['duration_distribution'].to_numpy())
+
+    for name in ('count', 'mean', 'std', 'min', 'max'):
+        assert stats[name] == pytest.approx(expected[name], rel=1e-9), name
+    for name, q in (('25%', 0.25), ('50%', 0.5), ('75%', 0.75)):
+        below = np.mean(durations < stats[name])
+        at_most = np.mean(durations <= stats[name])
+        assert below - 2 / 64 <= q <= at_most + 2 / 64, name
+    assert results['duration_distribution'].sum() == len(durations)
@@ -0,0 +1,14 @@
+import pytest
+
+from conftest import DATASET, assert_same_results
+from netflix_analysis.runner import plan_run, run_plan, run_questions
+
+
+@pytest.mark.parametrize('numbers, summary, chunksize', [
+    # Chunks of 7 rows include some without any director or country
+    ([2, 10, 15], False, 7),
+    (None, True, 1000),
+])
+def test_streaming_does_not_depend_on_chunk_boundaries(numbers, summary, chunksize):
+    expected = run_plan(plan_run(numbers, summary), DATASET)
+    assert_same_results(run_questions(numbers, summary, DATASET, chunksize=chunksize), expected)
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+from netflix_analysis import timeindex
+from netflix_analysis.loader import load_dataset
+from netflix_analysis.timeindex import load_addition_index
+
+
+@pytest.fixture
+def fresh_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('NETFLIX_CACHE_DIR', str(tmp_path / 'cache'))
+    monkeypatch.setattr(timeindex, '_LOADED', {})
+
+
+def _reload(by):
+    """The index as the next process would see it: from disk, not memory."""
+    timeindex._LOADED.clear()
+    return load_addition_index(by)
+
+
+@pytest.mark.parametrize('by,group', [('type', 'Movie'), ('release_year', 2019),
+                                      ('num_seasons', 1), ('month_added', None), (None, None)])
+def test_warm_index_answers_like_a_cold_one(fresh_cache, by, group):
+    cold = load_addition_index(by)
+    warm = _reload(by)
+
+    assert warm.groups.equals(cold.groups) and warm.groups.dtype == cold.groups.dtype
+    for start, end in (('2019-01-01', '2019-12-31'), (None, None)):
+        expected = cold.count(start, end, group=group)
+        result = warm.count(start, end, group=group)
+        if isinstance(expected, pd.Series):
+            pd.testing.assert_series_equal(result, expected)
+        else:
+            assert result == expected
+
+def test_release_year_counts_match_the_rows(fresh_cache):
+    df = load_dataset(columns=['date_added', 'release_year'])
+    added = df['date_added'].between('2019-01-01', '2019-12-31')
+    expected = int((added & (df['release_year'] == 2019)).sum())
+
+    assert load_addition_index('release_year').count('2019-01-01', '2019-12-31',
+                                                     group=2019) == expected
+    assert _reload('release_year').count('2019-01-01', '2019-12-31', group=2019) == expected